@@ -0,0 +1,5 @@
+"""
+Standalone benchmarks for the seniority calculations.
+
+Run from the project root, e.g. ``python -m benchmarks.bench_pilot_entity``.
+"""
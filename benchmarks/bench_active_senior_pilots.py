@@ -0,0 +1,72 @@
+"""
+Compare `calculate_number_of_active_senior_pilots_for_dates` against the previous
+per-date boolean mask implementation on tests/sample.csv and a synthetic list.
+
+Usage: ``python -m benchmarks.bench_active_senior_pilots [--rows N]``
+"""
+import argparse
+
+import pandas as pd
+
+from seniority_visualizer_app.seniority import statistics as stat
+from seniority_visualizer_app.seniority.dataframe import STANDARD_FIELDS as F
+
+from .common import best_time, load_sample_df, make_synthetic_df, report
+
+
+def legacy_active_senior_pilots(df: pd.DataFrame, date_series, employee_id: str):
+    """The per-date mask implementation, kept for comparison"""
+    target_record = df[df[F.EMPLOYEE_ID] == employee_id].iloc[0]
+    target_sen_num = target_record[F.SENIORITY_NUMBER]
+
+    data = pd.DataFrame(index=date_series)
+
+    data["seniority_on_date"] = data.index.map(
+        lambda d: df[
+            (df[F.SENIORITY_NUMBER] < target_sen_num) & (df[F.RETIRE_DATE] > d)
+        ].shape[0]
+    )
+
+    data[data.index > target_record[F.RETIRE_DATE]] = float("nan")
+
+    return data["seniority_on_date"].to_list()
+
+
+def run_case(df: pd.DataFrame):
+    dates = pd.date_range("2020-01-01", df[F.RETIRE_DATE].max(), freq="MS")
+    employee_id = df.sort_values(F.SENIORITY_NUMBER)[F.EMPLOYEE_ID].iloc[len(df) // 2]
+
+    before = legacy_active_senior_pilots(df, dates, employee_id)
+    after = stat.calculate_number_of_active_senior_pilots_for_dates(
+        df, dates, employee_id
+    )
+    pd.testing.assert_series_equal(pd.Series(before), pd.Series(after))
+
+    return (
+        best_time(lambda: legacy_active_senior_pilots(df, dates, employee_id)),
+        best_time(
+            lambda: stat.calculate_number_of_active_senior_pilots_for_dates(
+                df, dates, employee_id
+            )
+        ),
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=50_000)
+    opts = parser.parse_args()
+
+    cases = [
+        ("sample.csv", load_sample_df()),
+        (f"synthetic {opts.rows}", make_synthetic_df(opts.rows)),
+    ]
+
+    report(
+        "calculate_number_of_active_senior_pilots_for_dates, monthly dates",
+        [(name, *run_case(df)) for name, df in cases],
+    )
+
+
+if __name__ == "__main__":
+    main()
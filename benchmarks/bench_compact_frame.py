@@ -0,0 +1,42 @@
+"""
+Compare the memory held by the standardized DataFrame of a list with its compact
+form, as kept per published list in every worker, on tests/sample.csv and a
+synthetic list.
+
+Usage: ``python -m benchmarks.bench_compact_frame [--rows N]``
+"""
+import argparse
+
+from seniority_visualizer_app.seniority.dataframe import memory_usage
+from seniority_visualizer_app.seniority.views import make_df_from_record
+
+from .common import load_sample_record, make_synthetic_record
+
+
+def run_case(record):
+    return (
+        memory_usage(make_df_from_record(record)),
+        memory_usage(make_df_from_record(record, compact=True)),
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=100_000)
+    opts = parser.parse_args()
+
+    cases = [
+        ("sample.csv", load_sample_record()),
+        (f"synthetic {opts.rows}", make_synthetic_record(opts.rows)),
+    ]
+
+    print("\nmemory_usage(deep=True) of the standardized DataFrame")
+    print(f"{'case':<24}{'before (KiB)':>14}{'after (KiB)':>14}{'ratio':>10}")
+    for name, record in cases:
+        before, after = run_case(record)
+        ratio = before / after
+        print(f"{name:<24}{before / 1024:>14.0f}{after / 1024:>14.0f}{ratio:>9.1f}x")
+
+
+if __name__ == "__main__":
+    main()
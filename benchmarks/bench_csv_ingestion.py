@@ -0,0 +1,66 @@
+"""
+Compare `SeniorityListLoader.load_fast_from_stream` against the tablib and
+per-row `Pilot` path of `load_from_stream` on tests/sample.csv, as is and scaled
+to a larger list by repeating its rows under new employee ids.
+
+Usage: ``python -m benchmarks.bench_csv_ingestion [--rows N]``
+"""
+import argparse
+import io
+
+import pandas as pd
+
+from seniority_visualizer_app.seniority.loader import SeniorityListLoader
+
+from .common import SAMPLE_CSV, best_time, report
+
+HEADERS = {"seniority_number": "literal_seniority_number", "cmid": "employee_id"}
+
+
+def make_scaled_sample_text(rows: int) -> str:
+    """Return tests/sample.csv repeated to `rows` rows, with unique cmids"""
+    sample = pd.read_csv(SAMPLE_CSV, dtype=str, keep_default_na=False)
+
+    repeats = -(-rows // len(sample))
+    scaled = pd.concat([sample] * repeats, ignore_index=True).iloc[:rows]
+    scaled["cmid"] = (scaled.index + 100_000).astype(str)
+    scaled["seniority_number"] = (scaled.index + 1).astype(str)
+
+    return scaled.to_csv(index=False)
+
+
+def run_case(text: str):
+    loader = SeniorityListLoader(headers=HEADERS)
+
+    before = loader.load_from_stream(io.StringIO(text))
+    after = loader.load_fast_from_stream(io.StringIO(text))
+
+    assert after.pilot_data == before.pilot_data
+    assert [p.literal_seniority_number for p in after.pilot_data] == [
+        int(p.literal_seniority_number) for p in before.pilot_data
+    ]
+
+    return (
+        best_time(lambda: loader.load_from_stream(io.StringIO(text)), repeat=1),
+        best_time(lambda: loader.load_fast_from_stream(io.StringIO(text))),
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=100_000)
+    opts = parser.parse_args()
+
+    cases = [
+        ("sample.csv", SAMPLE_CSV.read_text()),
+        (f"sample.csv x {opts.rows}", make_scaled_sample_text(opts.rows)),
+    ]
+
+    report(
+        "load_from_stream vs load_fast_from_stream",
+        [(name, *run_case(text)) for name, text in cases],
+    )
+
+
+if __name__ == "__main__":
+    main()
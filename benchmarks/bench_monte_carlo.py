@@ -0,0 +1,48 @@
+"""
+Time `simulate_attrition` for every pilot of tests/sample.csv over a yearly grid,
+in this process and across a process pool.
+
+Usage: ``python -m benchmarks.bench_monte_carlo [--trials N] [--workers N]``
+"""
+import argparse
+import os
+
+import pandas as pd
+
+from seniority_visualizer_app.seniority import statistics as stat
+from seniority_visualizer_app.seniority.dataframe import STANDARD_FIELDS as F
+from seniority_visualizer_app.seniority.monte_carlo import simulate_attrition
+
+from .common import best_time, load_sample_df, report
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--trials", type=int, default=1000)
+    parser.add_argument("--workers", type=int, default=os.cpu_count())
+    opts = parser.parse_args()
+
+    df = load_sample_df()
+    dates = stat.make_date_grid(
+        pd.Timestamp("2020-02-01"), df[F.RETIRE_DATE].max(), freq="Y"
+    )
+
+    def run(workers):
+        return simulate_attrition(
+            df, dates, trials=opts.trials, max_workers=workers, seed=0
+        )
+
+    report(
+        f"simulate_attrition, {opts.trials} trials, 1 vs {opts.workers} workers",
+        [
+            (
+                "sample.csv",
+                best_time(lambda: run(1)),
+                best_time(lambda: run(opts.workers)),
+            )
+        ],
+    )
+
+
+if __name__ == "__main__":
+    main()
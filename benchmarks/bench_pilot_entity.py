@@ -0,0 +1,111 @@
+"""
+Compare the slotted, hash caching `Pilot` against the previous dict based class.
+
+Reports the memory allocated per instance and the cost of equality checks and of
+`list.index` lookups, the pattern `iter_seniority_over_time` relies on.
+
+Usage: ``python -m benchmarks.bench_pilot_entity [--pilots N]``
+"""
+import argparse
+from datetime import date, datetime, timedelta
+import timeit
+import tracemalloc
+
+from seniority_visualizer_app.seniority.entities import Pilot
+from seniority_visualizer_app.utils import cast_date
+
+
+class LegacyPilot:
+    """`Pilot` as it was before slots and hash caching, kept for comparison"""
+
+    def __init__(
+        self, employee_id, hire_date, retire_date, literal_seniority_number=None
+    ):
+        self.employee_id = employee_id
+        self.hire_date = hire_date
+        self.retire_date = retire_date
+        self.literal_seniority_number = literal_seniority_number
+
+    @property
+    def hire_date(self):
+        return self._hire_date
+
+    @hire_date.setter
+    def hire_date(self, val):
+        self._hire_date = cast_date(val)
+
+    @property
+    def retire_date(self):
+        if isinstance(self._retire_date, datetime):
+            return self._retire_date.date()
+        return self._retire_date
+
+    @retire_date.setter
+    def retire_date(self, val):
+        self._retire_date = cast_date(val)
+
+    def __eq__(self, other):
+        return hash(self) == hash(other)
+
+    def __hash__(self):
+        return hash((self.employee_id, self.hire_date, self.retire_date))
+
+
+def make_args(n: int):
+    start = date(1990, 1, 1)
+    return [
+        (
+            str(i).zfill(5),
+            start + timedelta(days=i),
+            start + timedelta(days=12000 + i),
+            i,
+        )
+        for i in range(n)
+    ]
+
+
+def measure_memory(cls, args) -> float:
+    """Return bytes allocated per instance, excluding the shared date objects"""
+    tracemalloc.start()
+    before, _ = tracemalloc.get_traced_memory()
+    instances = [cls(*a) for a in args]
+    after, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    list_overhead = 8 * len(instances)
+    return (after - before - list_overhead) / len(instances)
+
+
+def measure_time(cls, args, number: int):
+    pilots = [cls(*a) for a in args]
+    copies = [cls(*a) for a in args]
+    target = copies[-1]
+
+    equality = timeit.timeit(
+        lambda: [a == b for a, b in zip(pilots, copies)], number=number
+    )
+    index = timeit.timeit(lambda: pilots.index(target), number=number)
+
+    return equality / number, index / number
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--pilots", type=int, default=5000)
+    parser.add_argument("--number", type=int, default=20)
+    opts = parser.parse_args()
+
+    args = make_args(opts.pilots)
+
+    print(f"{opts.pilots} pilots, mean of {opts.number} runs\n")
+    header = ["bytes/pilot", "n x __eq__ (ms)", "list.index (ms)"]
+    print(f"{'class':<14}" + "".join(f"{h:>18}" for h in header))
+
+    for name, cls in [("LegacyPilot", LegacyPilot), ("Pilot", Pilot)]:
+        memory = measure_memory(cls, args)
+        equality, index = measure_time(cls, args, opts.number)
+        print(f"{name:<14}{memory:>18.0f}{equality * 1e3:>18.2f}{index * 1e3:>18.2f}")
+
+
+if __name__ == "__main__":
+    main()
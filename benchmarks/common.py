@@ -0,0 +1,80 @@
+"""
+Data and timing helpers shared by the benchmarks.
+"""
+from pathlib import Path
+import timeit
+import typing as t
+import uuid
+import datetime as dt
+
+import numpy as np
+import pandas as pd
+
+from seniority_visualizer_app.seniority.entities import CsvRecord
+from seniority_visualizer_app.seniority.views import make_df_from_record
+
+SAMPLE_CSV = Path(__file__).resolve().parent.parent.joinpath("tests", "sample.csv")
+
+
+def load_sample_record() -> CsvRecord:
+    """Return a CsvRecord holding tests/sample.csv"""
+    return CsvRecord(uuid.uuid4(), dt.datetime(2020, 1, 1), SAMPLE_CSV.read_text())
+
+
+def load_sample_df() -> pd.DataFrame:
+    """Return the standardized DataFrame of tests/sample.csv"""
+    return make_df_from_record(load_sample_record())
+
+
+def make_synthetic_csv_text(rows: int, seed: int = 0) -> str:
+    """
+    Return csv text shaped like tests/sample.csv with `rows` pilots. Hire dates
+    grow with seniority number and retirements are spread over forty years.
+    """
+    rng = np.random.default_rng(seed)
+
+    hire = np.datetime64("1985-01-01") + np.sort(rng.integers(0, 35 * 365, rows))
+    retire = np.datetime64("2020-01-01") + rng.integers(0, 40 * 365, rows)
+    retire = np.maximum(retire, hire + 365)
+
+    df = pd.DataFrame(
+        {
+            "seniority_number": np.arange(1, rows + 1),
+            "last_name": "Last",
+            "first_name": "First",
+            "cmid": rng.permutation(rows) + 10000,
+            "base": rng.choice(["BOS", "JFK", "MCO", "FLL", "LGB"], rows),
+            "fleet": rng.choice(["320", "190"], rows),
+            "seat": rng.choice(["CA", "FO"], rows),
+            "hire_date": hire.astype("datetime64[D]").astype(str),
+            "retire_date": retire.astype("datetime64[D]").astype(str),
+        }
+    )
+
+    return df.to_csv(index=False)
+
+
+def make_synthetic_record(rows: int, seed: int = 0) -> CsvRecord:
+    """Return a CsvRecord holding a synthetic list of `rows` pilots"""
+    return CsvRecord(
+        uuid.uuid4(), dt.datetime(2020, 1, 1), make_synthetic_csv_text(rows, seed)
+    )
+
+
+def make_synthetic_df(rows: int, seed: int = 0) -> pd.DataFrame:
+    """Return a standardized DataFrame of a synthetic list of `rows` pilots"""
+    return make_df_from_record(make_synthetic_record(rows, seed))
+
+
+def best_time(func: t.Callable[[], t.Any], repeat: int = 3, number: int = 1) -> float:
+    """Return the best mean seconds per call of `func` over `repeat` runs"""
+    return min(timeit.repeat(func, repeat=repeat, number=number)) / number
+
+
+def report(title: str, rows: t.Iterable[t.Tuple[str, float, float]]) -> None:
+    """Print (case, baseline seconds, new seconds) rows as a table"""
+    print(f"\n{title}")
+    print(f"{'case':<24}{'before (ms)':>14}{'after (ms)':>14}{'speedup':>10}")
+    for case, before, after in rows:
+        speedup = before / after
+        print(f"{case:<24}{before * 1e3:>14.2f}{after * 1e3:>14.2f}{speedup:>9.1f}x")
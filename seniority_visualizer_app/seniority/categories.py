@@ -0,0 +1,316 @@
+"""
+Module containing seniority projections within a category of the list, a
+combination of BASE, SEAT and FLEET such as "JFK 320 CA".
+
+Pilots are held grouped by category and in seniority order within each group, so
+every category is a contiguous block of rows. The trajectory sweep of
+:mod:`.trajectory` then runs once over all categories, restarting its running
+count at each block, rather than once per category.
+
+The junior-most holder of every category, the line crews watch, is answered for
+all categories and dates at once by :func:`calculate_junior_most_holders`.
+"""
+from __future__ import annotations
+import typing as t
+
+import numpy as np
+import pandas as pd
+
+from . import statistics as stat
+from .dataframe import STANDARD_FIELDS as FIELDS, _cached_for_frame, require_fields
+from .trajectory import RETIRED, _build_matrix
+
+CATEGORY_FIELDS = (FIELDS.BASE, FIELDS.SEAT, FIELDS.FLEET)
+
+
+class CategoryTrajectory:
+    """
+    Seniority numbers of every pilot within their category on every date of a grid.
+
+    Numbers follow the rules of :class:`.trajectory.SeniorityTrajectory`, counting
+    only the seniors of the same category.
+
+    :param df: standard seniority dataframe
+    :param dates: the date grid, sorted ascending
+    :param fields: the fields making up a category, any of `CATEGORY_FIELDS`
+    """
+
+    def __init__(
+        self,
+        df: pd.DataFrame,
+        dates: stat.DateSeries,
+        fields: t.Sequence[str] = CATEGORY_FIELDS,
+    ):
+        fields = tuple(fields)
+
+        if not fields or not set(fields) <= set(CATEGORY_FIELDS):
+            raise ValueError(f"category fields must be some of {CATEGORY_FIELDS}")
+
+        grid = pd.DatetimeIndex(dates)
+
+        if not grid.is_monotonic_increasing:
+            raise ValueError("dates must be sorted ascending")
+
+        codes, categories = _category_codes(df, fields)
+        order = np.lexsort((df[FIELDS.SENIORITY_NUMBER].to_numpy(), codes))
+        codes = codes[order]
+
+        retire = pd.to_datetime(df[FIELDS.RETIRE_DATE]).to_numpy(
+            dtype="datetime64[ns]"
+        )[order]
+
+        # first row of every category, and the first row of each pilot's category
+        starts = np.searchsorted(codes, np.arange(len(categories)), side="left")
+
+        self.fields: t.Tuple[str, ...] = fields
+        self.dates: pd.DatetimeIndex = grid
+        self.employee_ids: np.ndarray = (
+            df[FIELDS.EMPLOYEE_ID].astype(str).to_numpy()[order]
+        )
+        self.categories: pd.DataFrame = categories
+        self.codes: np.ndarray = codes
+        self.bounds: np.ndarray = np.append(starts, len(codes))
+        self.matrix: np.ndarray = _build_matrix(retire, grid.to_numpy(), starts[codes])
+        self.active_counts: np.ndarray = _category_active_counts(
+            retire, codes, len(categories), grid.to_numpy()
+        )
+        self._rows: t.Dict[str, int] = {e: i for i, e in enumerate(self.employee_ids)}
+
+        for arr in (self.employee_ids, self.codes, self.matrix, self.active_counts):
+            arr.flags.writeable = False
+
+    def __repr__(self):
+        s = (
+            f"<{type(self).__name__}(fields: {self.fields}, "
+            f"categories: {len(self.categories)}, pilots: {len(self)})>"
+        )
+        return s
+
+    def __len__(self):
+        return self.matrix.shape[0]
+
+    def row_for(self, employee_id: t.Any) -> int:
+        """
+        Return the row of `employee_id`
+
+        :raise ValueError: if `employee_id` is not on the list
+        """
+        try:
+            return self._rows[str(employee_id)]
+        except KeyError:
+            raise ValueError(f"no record with {FIELDS.EMPLOYEE_ID} == {employee_id}")
+
+    def category_of(self, employee_id: t.Any) -> t.Dict[str, t.Any]:
+        """Return the category of a pilot as a field: value dict"""
+        code = self.codes[self.row_for(employee_id)]
+        return self.categories.iloc[code].to_dict()
+
+    def code_for(self, **category: t.Any) -> int:
+        """
+        Return the code of a category given as field=value keywords, e.g.
+        ``code_for(BASE="JFK", FLEET="320", SEAT="CA")``
+
+        :raise ValueError: if there is no such category
+        """
+        if not set(category) == set(self.fields):
+            raise ValueError(f"a category is given by all of {self.fields}")
+
+        match = np.ones(len(self.categories), dtype=bool)
+        for field, value in category.items():
+            match &= (self.categories[field] == value).to_numpy()
+
+        if not match.any():
+            raise ValueError(f"no category {category}")
+
+        return int(np.flatnonzero(match)[0])
+
+    def rows_in(self, code: int) -> slice:
+        """Return the rows of a category, in seniority order"""
+        return slice(self.bounds[code], self.bounds[code + 1])
+
+    def seniority_series(self, employee_id: t.Any) -> pd.Series:
+        """
+        Return a pilot's seniority numbers within their category indexed by date,
+        NaN once retired
+        """
+        numbers = self.matrix[self.row_for(employee_id)].astype(float)
+        numbers[numbers == RETIRED] = np.nan
+        return pd.Series(numbers, index=self.dates, name=str(employee_id))
+
+    def category_size_series(self, employee_id: t.Any) -> pd.Series:
+        """Return the number of active pilots in a pilot's category indexed by date"""
+        code = self.codes[self.row_for(employee_id)]
+        return pd.Series(self.active_counts[code], index=self.dates, name="active")
+
+
+def _category_codes(
+    df: pd.DataFrame, fields: t.Sequence[str]
+) -> t.Tuple[np.ndarray, pd.DataFrame]:
+    """
+    Return the category code of every row, numbering the categories of `fields` in
+    sorted order with missing values last, and the categories by code. Categorical
+    fields of a compact dataframe are numbered from their codes rather than values.
+    """
+    key = np.zeros(len(df), dtype=np.int64)
+
+    for field in fields:
+        column = df[field]
+
+        if isinstance(column.dtype, pd.CategoricalDtype):
+            # the categories of a column may be in any order
+            labels = column.cat.categories
+            rank = np.empty(len(labels) + 1, dtype=np.int64)
+            rank[labels.argsort()] = np.arange(len(labels))
+            rank[-1] = len(labels)
+            codes = rank[column.cat.codes.to_numpy()]
+            size = len(labels) + 1
+        else:
+            codes, labels = pd.factorize(column, sort=True)
+            size = len(labels) + 1
+            codes = np.where(codes < 0, len(labels), codes)
+
+        key = key * size + codes
+
+    _, first, codes = np.unique(key, return_index=True, return_inverse=True)
+    categories = df[list(fields)].iloc[first].reset_index(drop=True)
+
+    return codes, categories
+
+
+def _category_active_counts(
+    retire: np.ndarray, codes: np.ndarray, n_categories: int, grid: np.ndarray
+) -> np.ndarray:
+    """
+    Return the (categories, dates) number of pilots with `retire_date > date`, from
+    one histogram of the column each pilot leaves at
+    """
+    periods = grid.size
+
+    never = np.isnat(retire)
+    leaves = np.where(never, periods, np.searchsorted(grid, retire, side="left"))
+
+    left = np.bincount(
+        codes * (periods + 1) + leaves, minlength=n_categories * (periods + 1)
+    ).reshape(n_categories, periods + 1)
+
+    sizes = left.sum(axis=1)
+
+    return sizes[:, None] - np.cumsum(left, axis=1)[:, :periods]
+
+
+@require_fields(
+    FIELDS.RETIRE_DATE, FIELDS.SENIORITY_NUMBER, FIELDS.EMPLOYEE_ID, *CATEGORY_FIELDS
+)
+def get_category_trajectory(
+    df: pd.DataFrame,
+    dates: pd.DatetimeIndex,
+    fields: t.Sequence[str] = CATEGORY_FIELDS,
+) -> CategoryTrajectory:
+    """
+    Return the cached `CategoryTrajectory` of `df`, built once per SeniorityFrame,
+    date grid and category fields
+    """
+    dates = pd.DatetimeIndex(dates)
+    name = ("category", tuple(fields), tuple(dates.asi8))
+    return _cached_for_frame(
+        df, name, lambda frame: CategoryTrajectory(frame, dates, fields)
+    )
+
+
+@require_fields(
+    FIELDS.RETIRE_DATE, FIELDS.SENIORITY_NUMBER, FIELDS.EMPLOYEE_ID, *CATEGORY_FIELDS
+)
+def calculate_junior_most_holders(
+    df: pd.DataFrame,
+    dates: stat.DateSeries,
+    fields: t.Sequence[str] = CATEGORY_FIELDS,
+) -> pd.DataFrame:
+    """
+    Return the seniority number of the junior-most holder of every category on
+    every date, indexed by date with a column per category.
+
+    Each category keeps its size on the first date. Its slots are held by its own
+    pilots until they retire, and every open slot goes to the next pilot junior to
+    the category's junior-most pilot on the list, in seniority order. So the
+    junior-most holder on a date is the pilot that many active pilots after the
+    category's junior-most pilot active on the first date. NaN where the category
+    is empty or no pilot is left to fill it.
+
+    :param df: standard seniority dataframe
+    :param dates: the date grid, sorted ascending
+    :param fields: the fields making up a category, any of `CATEGORY_FIELDS`
+    """
+    fields = list(fields)
+
+    if not fields or not set(fields) <= set(CATEGORY_FIELDS):
+        raise ValueError(f"category fields must be some of {CATEGORY_FIELDS}")
+
+    grid = pd.DatetimeIndex(dates).to_numpy()
+    periods = grid.size
+
+    codes, categories = _category_codes(df, fields)
+    n_categories = len(categories)
+
+    order = np.argsort(df[FIELDS.SENIORITY_NUMBER].to_numpy(), kind="stable")
+    codes = codes[order]
+    retire = pd.to_datetime(df[FIELDS.RETIRE_DATE]).to_numpy(dtype="datetime64[ns]")
+    retire = retire[order]
+
+    never = np.isnat(retire)
+    leaves = np.where(never, periods, np.searchsorted(grid, retire, side="left"))
+
+    left = np.cumsum(np.bincount(leaves, minlength=periods + 1))[:periods]
+    active = retire.size - left
+    in_category = _category_active_counts(retire, codes, n_categories, grid)
+
+    # position of the junior-most pilot of each category still active on the first
+    # date, members already retired hold no slot
+    junior_most = np.zeros(n_categories, dtype=np.int64)
+    held = leaves > 0
+    np.maximum.at(junior_most, codes[held], np.flatnonzero(held))
+
+    # active pilots at or senior to each of those positions, from departures
+    # histogrammed by the segment between consecutive junior-most positions
+    by_position = np.argsort(junior_most, kind="stable")
+    positions = junior_most[by_position]
+    segments = np.searchsorted(positions, np.arange(codes.size), side="left")
+
+    departed = np.bincount(
+        segments * (periods + 1) + leaves, minlength=(n_categories + 1) * (periods + 1)
+    ).reshape(n_categories + 1, periods + 1)[:n_categories, :periods]
+    departed = departed.cumsum(axis=0).cumsum(axis=1)
+
+    active_to = np.empty((n_categories, periods), dtype=np.int64)
+    active_to[by_position] = (positions + 1)[:, None] - departed
+
+    sizes = in_category[:, :1]
+    numbers = (active_to + sizes - in_category).astype(float)
+    numbers[(numbers > active[None, :]) | (sizes == 0)] = np.nan
+
+    if len(fields) > 1:
+        columns = pd.MultiIndex.from_frame(categories.astype(object))
+    else:
+        columns = pd.Index(categories[fields[0]].astype(object), name=fields[0])
+
+    return pd.DataFrame(
+        numbers.T, index=pd.DatetimeIndex(grid, name="date"), columns=columns
+    )
+
+
+@require_fields(
+    FIELDS.RETIRE_DATE, FIELDS.SENIORITY_NUMBER, FIELDS.EMPLOYEE_ID, *CATEGORY_FIELDS
+)
+def get_junior_most_holders(
+    df: pd.DataFrame,
+    dates: pd.DatetimeIndex,
+    fields: t.Sequence[str] = CATEGORY_FIELDS,
+) -> pd.DataFrame:
+    """
+    Return the cached :func:`calculate_junior_most_holders` table of `df`, built
+    once per SeniorityFrame, date grid and category fields. It must not be modified.
+    """
+    dates = pd.DatetimeIndex(dates)
+    name = ("junior_most", tuple(fields), tuple(dates.asi8))
+    return _cached_for_frame(
+        df, name, lambda frame: calculate_junior_most_holders(frame, dates, fields)
+    )
@@ -0,0 +1,326 @@
+"""
+Module containing the columnar (struct of arrays) storage for pilot data.
+
+A :class:`ColumnarSeniorityList` keeps each pilot attribute in its own NumPy array
+rather than holding a `Pilot` object per row. `Pilot` objects are only built when
+pilot data is iterated, which keeps large (merged) lists small in memory.
+"""
+from __future__ import annotations
+from datetime import date
+import sys
+import typing as t
+
+import numpy as np
+import pandas as pd
+
+from seniority_visualizer_app.utils import cast_date, DateCastable
+from .entities import Pilot, SeniorityList
+from .intervals import EmploymentIntervalIndex
+from .ordering import seniority_order
+
+
+class PilotColumns:
+    """
+    Read only columns of pilot data.
+
+    :param employee_ids: employee ids, stored as an object array of interned strings
+    :param hire_dates: hire dates, stored as datetime64[D]
+    :param retire_dates: retire dates, stored as datetime64[D]
+    :param literal_numbers: literal seniority numbers, None (or NaN) where missing,
+    stored as int32 alongside a `has_literal` mask
+    :raise ValueError: if a literal seniority number is not a whole number that fits
+    in int32
+    """
+
+    def __init__(
+        self,
+        employee_ids: t.Iterable[t.Any],
+        hire_dates: t.Iterable[t.Any],
+        retire_dates: t.Iterable[t.Any],
+        literal_numbers: t.Optional[t.Iterable[t.Any]] = None,
+    ):
+        ids = np.array([sys.intern(str(e)) for e in employee_ids], dtype=object)
+        hire = np.asarray(hire_dates, dtype="datetime64[D]")
+        retire = np.asarray(retire_dates, dtype="datetime64[D]")
+
+        if literal_numbers is None:
+            literal = np.zeros(len(ids), dtype=np.int32)
+            has_literal = np.zeros(len(ids), dtype=bool)
+        else:
+            literal, has_literal = _literal_column(literal_numbers)
+
+        if not len(ids) == len(hire) == len(retire) == len(literal):
+            raise ValueError("all pilot columns must be the same length")
+
+        self._set(ids, hire, retire, literal, has_literal)
+
+    def _set(
+        self,
+        ids: np.ndarray,
+        hire: np.ndarray,
+        retire: np.ndarray,
+        literal: np.ndarray,
+        has_literal: np.ndarray,
+    ):
+        for arr in (ids, hire, retire, literal, has_literal):
+            arr.flags.writeable = False
+
+        self.employee_ids: np.ndarray = ids
+        self.hire_dates: np.ndarray = hire
+        self.retire_dates: np.ndarray = retire
+        self.literal_numbers: np.ndarray = literal
+        self.has_literal: np.ndarray = has_literal
+
+        self._order: t.Optional[np.ndarray] = None
+        self._ranks: t.Optional[np.ndarray] = None
+        self._row_index: t.Optional[t.Dict[str, int]] = None
+
+    def __repr__(self):
+        s = f"<{type(self).__name__}(len: {len(self)})>"
+        return s
+
+    def __len__(self):
+        return len(self.employee_ids)
+
+    @classmethod
+    def from_pilots(cls, pilots: t.Iterable[Pilot]) -> PilotColumns:
+        """Return PilotColumns holding the data from `pilots`"""
+        pilots = list(pilots)
+
+        return cls(
+            employee_ids=[p.employee_id for p in pilots],
+            hire_dates=[p.hire_date for p in pilots],
+            retire_dates=[p.retire_date for p in pilots],
+            literal_numbers=[p.literal_seniority_number for p in pilots],
+        )
+
+    @classmethod
+    def concat(cls, batches: t.Iterable[PilotColumns]) -> PilotColumns:
+        """Return PilotColumns holding the rows of every one of `batches`, in order"""
+        batches = list(batches)
+
+        if not batches:
+            return cls([], [], [])
+
+        columns = cls.__new__(cls)
+        columns._set(
+            *(
+                np.concatenate([getattr(b, name) for b in batches])
+                for name in (
+                    "employee_ids",
+                    "hire_dates",
+                    "retire_dates",
+                    "literal_numbers",
+                    "has_literal",
+                )
+            )
+        )
+        return columns
+
+    @property
+    def seniority_order(self) -> np.ndarray:
+        """Row numbers sorted from most to least senior"""
+        if self._order is None:
+            order = seniority_order(
+                self.hire_dates,
+                self.retire_dates,
+                self.literal_numbers,
+                self.has_literal,
+            )
+            order.flags.writeable = False
+            self._order = order
+        return self._order
+
+    @property
+    def ranks(self) -> np.ndarray:
+        """0-indexed position in seniority order of each row"""
+        if self._ranks is None:
+            ranks = np.empty(len(self), dtype=np.int64)
+            ranks[self.seniority_order] = np.arange(len(self))
+            ranks.flags.writeable = False
+            self._ranks = ranks
+        return self._ranks
+
+    @property
+    def row_index(self) -> t.Dict[str, int]:
+        """Map of employee_id to the first row holding it"""
+        if self._row_index is None:
+            row_index: t.Dict[str, int] = {}
+            for row, emp_id in enumerate(self.employee_ids):
+                row_index.setdefault(emp_id, row)
+            self._row_index = row_index
+        return self._row_index
+
+    def pilot_at(self, row: int) -> Pilot:
+        """Return a new `Pilot` built from `row`"""
+        literal = int(self.literal_numbers[row]) if self.has_literal[row] else None
+
+        return Pilot(
+            employee_id=self.employee_ids[row],
+            hire_date=self.hire_dates[row].item(),
+            retire_date=self.retire_dates[row].item(),
+            literal_seniority_number=literal,
+        )
+
+    def iter_pilots(
+        self, rows: t.Optional[t.Iterable[int]] = None
+    ) -> t.Iterator[Pilot]:
+        """Yield `Pilot` objects for `rows` [default: all rows in stored order]"""
+        rows = range(len(self)) if rows is None else rows
+        return (self.pilot_at(row) for row in rows)
+
+    def find_row(self, pilot: Pilot) -> int:
+        """
+        Return the row holding `pilot`, matching on the same fields as `Pilot.__eq__`.
+        Raise ValueError if no row matches.
+        """
+        try:
+            row = self.row_index[pilot.employee_id]
+        except (AttributeError, KeyError, TypeError):
+            raise ValueError(f"{pilot} not in {self}")
+
+        hire = np.datetime64(pilot.hire_date, "D")
+        retire = np.datetime64(pilot.retire_date, "D")
+
+        if self.hire_dates[row] == hire and self.retire_dates[row] == retire:
+            return row
+
+        # duplicated employee_id with differing dates
+        matches = np.flatnonzero(
+            (self.employee_ids == pilot.employee_id)
+            & (self.hire_dates == hire)
+            & (self.retire_dates == retire)
+        )
+        if not matches.size:
+            raise ValueError(f"{pilot} not in {self}")
+
+        return int(matches[np.argmin(self.ranks[matches])])
+
+    def to_df(self, df_kwargs: t.Optional[t.Dict[str, t.Any]] = None) -> pd.DataFrame:
+        """
+        Return a DataFrame matching `SeniorityList.to_df`. The employee id column is
+        shared with the stored array rather than copied.
+        """
+        df_kwargs = df_kwargs or {}
+
+        if self.has_literal.all():
+            seniority_number: np.ndarray = self.literal_numbers.astype(np.int64)
+        else:
+            seniority_number = np.where(self.has_literal, self.literal_numbers, np.nan)
+
+        data = {
+            "employee_id": self.employee_ids,
+            "hire_date": self.hire_dates.astype("datetime64[ns]"),
+            "retire_date": self.retire_dates.astype("datetime64[ns]"),
+            "seniority_number": seniority_number,
+        }
+
+        return pd.DataFrame(data, copy=False, **df_kwargs)
+
+
+def _literal_column(values: t.Iterable[t.Any]) -> t.Tuple[np.ndarray, np.ndarray]:
+    """Return literal seniority numbers as int32, 0 where missing, and their mask"""
+    raw = pd.Series(list(values), dtype=object)
+    has_literal = raw.notna().to_numpy()
+
+    numbers = pd.to_numeric(raw.where(has_literal), errors="coerce").to_numpy(float)
+    info = np.iinfo(np.int32)
+    invalid = has_literal & ~(
+        (numbers % 1 == 0) & (numbers >= info.min) & (numbers <= info.max)
+    )
+
+    if invalid.any():
+        bad = raw[invalid].tolist()[:5]
+        raise ValueError(f"literal seniority numbers must be whole numbers: {bad}")
+
+    return np.where(has_literal, numbers, 0).astype(np.int32), has_literal
+
+
+class ColumnarSeniorityList(SeniorityList):
+    """
+    SeniorityList backed by :class:`PilotColumns` rather than a list of `Pilot`
+    objects. `Pilot` objects are built on demand whenever pilot data is iterated.
+    """
+
+    def __init__(
+        self,
+        columns: t.Optional[PilotColumns] = None,
+        published_date: t.Optional[DateCastable] = None,
+    ):
+        super().__init__(pilots=None, published_date=published_date)
+        self._columns: PilotColumns = (
+            columns if columns is not None else PilotColumns([], [], [])
+        )
+
+    def __len__(self):
+        return len(self._columns)
+
+    @classmethod
+    def from_pilots(cls, pilots: t.Iterable[Pilot], **kwargs) -> ColumnarSeniorityList:
+        """
+        Return a ColumnarSeniorityList holding the data from `pilots`. Additional
+        kwargs are passed to the `ColumnarSeniorityList.__init__()` method.
+        """
+        return cls(PilotColumns.from_pilots(pilots), **kwargs)
+
+    @classmethod
+    def from_dict(cls, dict_: dict) -> ColumnarSeniorityList:
+        """Return a ColumnarSeniorityList from the `SeniorityList.from_dict()` format"""
+        pilots = [Pilot.from_dict(p) for p in dict_["pilots"]]
+
+        return cls.from_pilots(pilots, published_date=dict_.get("published_date"))
+
+    @property
+    def columns(self) -> PilotColumns:
+        """Backing columns"""
+        return self._columns
+
+    def to_df(self, df_kwargs: t.Optional[t.Dict[str, t.Any]] = None):
+        """Return a Pandas Dataframe of pilot info"""
+        return self._columns.to_df(df_kwargs)
+
+    @property
+    def pilot_data(self):
+        """All pilots"""
+        return list(self._columns.iter_pilots())
+
+    @pilot_data.setter
+    def pilot_data(self, val):
+        raise AttributeError("pilot data is read only")
+
+    @property
+    def sorted_pilot_data(self) -> t.Tuple[Pilot, ...]:
+        """Presorted pilot data, built on first access and kept"""
+        if self._sorted_pilots is None:
+            order = self._columns.seniority_order
+            self._sorted_pilots = tuple(self._columns.iter_pilots(order))
+        return self._sorted_pilots
+
+    @sorted_pilot_data.setter
+    def sorted_pilot_data(self, val):
+        raise AttributeError("sorted pilot data is read only")
+
+    def filter_active_on(
+        self, ref_date: t.Optional[DateCastable] = None
+    ) -> t.Iterator[Pilot]:
+        """
+        Return an iterator of Pilot objects that are active on `ref_date`. If it is
+        not provided, the system date.today() is used.
+
+        :param ref_date: date to check pilot status against
+        :return: iterator of Pilot objects
+        """
+        ref = date.today() if ref_date is None else cast_date(ref_date)
+
+        ranks = self.interval_index.active_ranks_on(ref)
+
+        return self._columns.iter_pilots(self._columns.seniority_order[ranks])
+
+    def _build_interval_index(self) -> EmploymentIntervalIndex:
+        order = self._columns.seniority_order
+        return EmploymentIntervalIndex(
+            self._columns.hire_dates[order], self._columns.retire_dates[order]
+        )
+
+    def _lookup_rank(self, pilot: Pilot) -> int:
+        return int(self._columns.ranks[self._columns.find_row(pilot)])
@@ -1,11 +1,214 @@
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from glob import glob, has_magic
+import os
+from pathlib import Path
 from pprint import pformat
+import re
+import time
+import typing as t
 
 import click
 from flask.cli import with_appcontext
 
 
+#: files parsed ahead of the one being saved, per process, bounds parsed lists held
+PARSE_AHEAD_PER_JOB = 2
+
+#: a published date in a file name, ex -> 2020-06.csv or list_2020-06-15.csv
+FILE_DATE_PATTERN = re.compile(r"(?<!\d)(\d{4})-(\d{2})(?:-(\d{2}))?(?!\d)")
+
+
+class ParsedFile(t.NamedTuple):
+    """Result of parsing one file in the pool, `error` set if it failed"""
+
+    path: str
+    seniority_list: t.Any = None
+    error: t.Optional[str] = None
+
+
+def expand_sources(sources: t.Iterable[str]) -> t.List[Path]:
+    """
+    Return the files named by `sources`, each a file, a directory (every .csv file
+    in it) or a glob pattern, in order without repeats
+    """
+    paths: t.List[Path] = []
+
+    for source in sources:
+        if Path(source).is_dir():
+            paths.extend(sorted(Path(source).glob("*.csv")))
+        elif has_magic(source):
+            paths.extend(Path(p) for p in sorted(glob(source)) if Path(p).is_file())
+        else:
+            paths.append(Path(source))
+
+    return list(dict.fromkeys(paths))
+
+
+def published_date_from_path(path: Path) -> t.Optional[datetime]:
+    """
+    Return the published date in the name of `path`, the first of the month if it
+    names only a month, or None if it names no date
+    """
+    match = FILE_DATE_PATTERN.search(path.stem)
+
+    if match is None:
+        return None
+
+    year, month, day = match.groups()
+
+    try:
+        return datetime(int(year), int(month), int(day or 1))
+    except ValueError:
+        return None
+
+
+def _parse_file(path: Path, headers: t.Dict[str, str]) -> ParsedFile:
+    """Parse a seniority list file, csv files on the fast path"""
+    from seniority_visualizer_app.seniority.entities import SeniorityList
+    from seniority_visualizer_app.seniority.loader import SeniorityListLoader
+
+    loader = SeniorityListLoader(headers=headers)
+    sen_list: SeniorityList
+
+    try:
+        with path.open() as stream:
+            if path.suffix.lower() == ".csv":
+                sen_list = loader.load_fast_from_stream(stream)
+            else:
+                sen_list = loader.load_from_stream(stream)
+    except Exception as e:
+        return ParsedFile(str(path), error=f"{type(e).__name__}: {e}")
+
+    return ParsedFile(str(path), sen_list)
+
+
+def iter_parsed_files(
+    paths: t.Sequence[Path], headers: t.Dict[str, str], jobs: t.Optional[int] = None
+) -> t.Iterator[ParsedFile]:
+    """
+    Yield each of `paths` parsed, in order, by a pool of `jobs` processes
+    [default: one per cpu] or in this process if `jobs` is 1. Only a few files per
+    process are parsed ahead of the one yielded, so parsed lists do not pile up
+    while they are saved.
+    """
+    if jobs == 1 or len(paths) == 1:
+        yield from (_parse_file(path, headers) for path in paths)
+        return
+
+    ahead = PARSE_AHEAD_PER_JOB * (jobs or os.cpu_count() or 1)
+    pending: t.Deque = deque()
+
+    with ProcessPoolExecutor(max_workers=jobs) as pool:
+        for path in paths:
+            if len(pending) >= ahead:
+                yield pending.popleft().result()
+            pending.append(pool.submit(_parse_file, path, headers))
+
+        while pending:
+            yield pending.popleft().result()
+
+
+def _published_dates(
+    paths: t.Sequence[Path], published_date: t.Optional[datetime]
+) -> t.Dict[Path, t.Optional[datetime]]:
+    """
+    Return the published date of each of `paths`, `published_date` for a single
+    file or else the date in each name, raise UsageError if a file of many has none
+    """
+    if len(paths) > 1 and published_date is not None:
+        raise click.UsageError(
+            "--published-date takes a single file, name the files by date instead"
+        )
+
+    if published_date is not None:
+        return {paths[0]: published_date}
+
+    dates = {path: published_date_from_path(path) for path in paths}
+    undated = [str(path) for path, published in dates.items() if published is None]
+
+    if len(paths) > 1 and undated:
+        raise click.UsageError(f"no published date in the name of {', '.join(undated)}")
+
+    return dates
+
+
+def _echo_file(path: Path, headers: t.Dict[str, str]) -> None:
+    """Page through the pilots parsed from `path`"""
+    from seniority_visualizer_app.seniority.serializer import SeniorityListSerializer
+
+    parsed = _parse_file(path, headers)
+    if parsed.error:
+        raise click.UsageError(parsed.error)
+
+    data = SeniorityListSerializer().to_dict(parsed.seniority_list)
+
+    def pages():
+        yield f"Published Date: {data['published_date']}\n"
+        yield from (
+            pformat({k: str(v) for k, v in row.items()}) + "\n"
+            for row in data["pilots"]
+        )
+
+    click.echo_via_pager(pages())
+
+
+def _save_parsed(
+    parsed: ParsedFile, published_date: t.Optional[datetime]
+) -> ParsedFile:
+    """Save a parsed file, return it with `error` set if parsing or saving failed"""
+    from seniority_visualizer_app.seniority.models import SeniorityListRecord
+
+    if parsed.error is None:
+        try:
+            SeniorityListRecord.bulk_create(parsed.seniority_list, published_date)
+        except Exception as e:
+            parsed = parsed._replace(error=f"{type(e).__name__}: {e}")
+
+    if parsed.error is None:
+        click.echo(f"Saved {parsed.path} ({len(parsed.seniority_list)} pilots)")
+    else:
+        click.echo(f"Failed {parsed.path}: {parsed.error}", err=True)
+
+    return parsed
+
+
+def _save_files(
+    paths: t.Sequence[Path],
+    dates: t.Dict[Path, t.Optional[datetime]],
+    headers: t.Dict[str, str],
+    jobs: t.Optional[int],
+) -> None:
+    """Parse and save each of `paths`, report the throughput and any failures"""
+    started = time.perf_counter()
+    rows = 0
+    failed: t.List[ParsedFile] = []
+
+    for parsed in iter_parsed_files(paths, headers, jobs):
+        parsed = _save_parsed(parsed, dates[Path(parsed.path)])
+
+        if parsed.error is None:
+            rows += len(parsed.seniority_list)
+        else:
+            failed.append(parsed)
+
+    elapsed = max(time.perf_counter() - started, 1e-9)
+    saved = len(paths) - len(failed)
+
+    click.echo(
+        f"Saved {saved} of {len(paths)} files, {rows} pilots in {elapsed:.2f}s: "
+        f"{rows / elapsed:.0f} rows/s, {saved / elapsed:.2f} files/s"
+    )
+
+    if failed:
+        raise click.ClickException(
+            f"{len(failed)} files failed: {', '.join(f.path for f in failed)}"
+        )
+
+
 @click.command()
-@click.argument("file", type=click.File(mode="r"))
+@click.argument("sources", nargs=-1, required=True)
 @click.option(
     "-h",
     "--header",
@@ -14,45 +217,34 @@ from flask.cli import with_appcontext
     multiple=True,
     help="specify column header with its mapped attr, ex -> cmid employee_id",
 )
-@click.option("-p", "--published-date", type=click.DateTime())
+@click.option(
+    "-p",
+    "--published-date",
+    type=click.DateTime(),
+    help="published date of a single file [default: the date in its name]",
+)
+@click.option("-j", "--jobs", type=click.IntRange(min=1), help="parsing processes")
 @click.option("--print", "echo", is_flag=True, default=False)
 @with_appcontext
-def add(file, header, published_date, echo):
+def add(sources, header, published_date, jobs, echo):
     """
-    Add seniority list from csv file
+    Add seniority lists from files, directories of csv files or glob patterns.
+    Each list is published on the date in its file name, ex -> 2020-06.csv, unless
+    a single file is given with --published-date.
     """
-    from seniority_visualizer_app.seniority.loader import SeniorityListLoader
-    from seniority_visualizer_app.seniority.models import SeniorityListRecord
-    from seniority_visualizer_app.seniority.serializer import SeniorityListSerializer
-
     headers = {file_key: desired for file_key, desired in header}
 
-    loader = SeniorityListLoader(headers=headers)
-
-    try:
-        sen_list = loader.load_from_stream(file)
-    except Exception as e:
-        raise click.UsageError(e)
-
-    if echo:
-        data = SeniorityListSerializer().to_dict(sen_list)
+    paths = expand_sources(sources)
 
-        def pages():
-            yield f"Published Date: {data['published_date']}\n"
-            yield from (
-                pformat({k: str(v) for k, v in row.items()}) + "\n"
-                for row in data["pilots"]
-            )
+    if not paths:
+        raise click.UsageError(f"no files found in {' '.join(sources)}")
 
-        click.echo_via_pager(pages())
-        return None
+    dates = _published_dates(paths, published_date)
 
-    record = SeniorityListRecord.from_entity(sen_list)
-    record.published_date = published_date
-
-    click.echo(f"Record created with published date: {record.published_date}")
-    click.echo(f"Saving record")
+    if echo:
+        if len(paths) > 1:
+            raise click.UsageError("--print takes a single file")
 
-    record.save()
+        return _echo_file(paths[0], headers)
 
-    click.echo(f"Record saved!")
+    _save_files(paths, dates, headers, jobs)
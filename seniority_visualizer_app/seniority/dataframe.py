@@ -2,10 +2,18 @@
 Module handling the creation of the standard dataframe that statistical and plotting
 code will use.
 """
+import logging
 import typing as t
+import weakref
 from functools import wraps
 
+import numpy as np
 import pandas as pd
+from pandas.api import types as pd_types
+
+logger = logging.getLogger(__name__)
+
+T = t.TypeVar("T")
 
 
 class SeniorityDfFields:
@@ -73,13 +81,20 @@ def standardize_seniority_df_names(
 
 
 def make_standardized_seniority_dataframe(
-    df: pd.DataFrame, fields: t.Dict[str, str]
+    df: pd.DataFrame,
+    fields: t.Dict[str, str],
+    compact: bool = False,
+    columns: t.Optional[t.Iterable[str]] = None,
 ) -> pd.DataFrame:
     """
     Return a new dataframe with overridden fields.
 
     :param fields: dict containing current_column:SeniorityDfField pairs, see
     `standardize_seniority_df_names`
+    :param compact: store the fields in the smallest dtypes, see
+    `compact_seniority_dataframe`
+    :param columns: with `compact`, the other columns to keep besides the standard
+    fields [default: all]
     """
 
     renamed = standardize_seniority_df_names(df, fields)
@@ -92,13 +107,211 @@ def make_standardized_seniority_dataframe(
         SeniorityDfFields.EMPLOYEE_ID
     ].astype(str)
 
-    return renamed
+    if compact:
+        return compact_seniority_dataframe(renamed, columns)
+
+    return SeniorityFrame(renamed)
+
+
+#: fields held as categoricals in a compact dataframe, few values repeated per row
+CATEGORICAL_FIELDS = (
+    SeniorityDfFields.BASE,
+    SeniorityDfFields.SEAT,
+    SeniorityDfFields.FLEET,
+)
+
+
+def compact_seniority_dataframe(
+    df: pd.DataFrame, columns: t.Optional[t.Iterable[str]] = None
+) -> pd.DataFrame:
+    """
+    Return a copy of a standard seniority dataframe taking less memory: BASE, SEAT
+    and FLEET as categoricals, SENIORITY_NUMBER in the smallest signed integer
+    dtype holding it and RETIRE_DATE truncated to the day. Memory before and after,
+    from `DataFrame.memory_usage(deep=True)`, is logged.
+
+    :param columns: the other columns to keep besides the standard fields
+    [default: all]
+    """
+    if columns is not None:
+        keep = list(SeniorityDfFields.all()) + [
+            c for c in columns if c not in set(SeniorityDfFields.all())
+        ]
+        compact = df.loc[:, keep].copy()
+    else:
+        compact = df.copy()
+
+    for field in CATEGORICAL_FIELDS:
+        compact[field] = compact[field].astype("category")
+
+    compact[SeniorityDfFields.SENIORITY_NUMBER] = pd.to_numeric(
+        compact[SeniorityDfFields.SENIORITY_NUMBER], downcast="integer"
+    )
+
+    # pandas only holds datetime64[ns], so days are kept as midnight timestamps
+    compact[SeniorityDfFields.RETIRE_DATE] = pd.to_datetime(
+        compact[SeniorityDfFields.RETIRE_DATE]
+    ).dt.normalize()
+
+    before, after = memory_usage(df), memory_usage(compact)
+    logger.info(
+        f"compacted seniority dataframe of {len(df)} rows "
+        f"from {before:,} to {after:,} bytes"
+    )
+
+    return SeniorityFrame(compact)
+
+
+def memory_usage(df: pd.DataFrame) -> int:
+    """Return the bytes held by `df`, counting the contents of object columns"""
+    return int(df.memory_usage(deep=True).sum())
+
+
+def validate_standard_fields(df: pd.DataFrame):
+    """
+    Raise a `ValueError` if `df` is missing a standard field or holds one with the
+    wrong dtype: RETIRE_DATE must be datetime64 and SENIORITY_NUMBER numeric.
+    """
+    missing_keys = set(SeniorityDfFields.all()).difference(df.columns)
+
+    if missing_keys:
+        raise ValueError(f"missing keys: {missing_keys}")
+
+    if not pd_types.is_datetime64_dtype(df[SeniorityDfFields.RETIRE_DATE]):
+        raise ValueError(f"{SeniorityDfFields.RETIRE_DATE} must be datetime64")
+
+    if not pd_types.is_numeric_dtype(df[SeniorityDfFields.SENIORITY_NUMBER]):
+        raise ValueError(f"{SeniorityDfFields.SENIORITY_NUMBER} must be numeric")
+
+
+class SeniorityFrame(pd.DataFrame):
+    """
+    Standard seniority dataframe, validated once on construction, with lookups
+    for the questions asked of it on every request:
+
+    - the row of an employee id, from a hash index
+    - the rows in seniority order and the rows senior to a seniority number
+    - the retire dates in sorted order
+
+    The lookups are built on first use and kept in the per-DataFrame cache, with
+    the statistics of :mod:`.statistics`, so the frame must not be modified in
+    place afterwards. Frames derived from it, by slicing, sorting or copying, are
+    plain DataFrames.
+
+    :raise ValueError: if the standard fields are missing or mistyped
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        validate_standard_fields(self)
+
+    @property
+    def _constructor(self):
+        return pd.DataFrame
+
+    def _lookup(self, name: str, build: t.Callable[[], T]) -> T:
+        return _cached_for_frame(self, ("lookup", name), lambda _: build())
+
+    @property
+    def seniority_order(self) -> np.ndarray:
+        """Row positions sorted by seniority number"""
+
+        def build():
+            order = np.argsort(
+                self[SeniorityDfFields.SENIORITY_NUMBER].to_numpy(), kind="stable"
+            )
+            order.flags.writeable = False
+            return order
+
+        return self._lookup("seniority_order", build)
+
+    @property
+    def sorted_retire_dates(self) -> np.ndarray:
+        """Retire dates as sorted datetime64[ns], missing dates left out"""
+
+        def build():
+            dates = self[SeniorityDfFields.RETIRE_DATE].to_numpy(dtype="datetime64[ns]")
+            dates = np.sort(dates[~np.isnat(dates)])
+            dates.flags.writeable = False
+            return dates
+
+        return self._lookup("sorted_retire_dates", build)
+
+    def position_of(self, employee_id: t.Any) -> int:
+        """
+        Return the row position of `employee_id`, the first if it is repeated
+
+        :raise ValueError: if `employee_id` is not in the frame
+        """
+
+        def build():
+            ids = self[SeniorityDfFields.EMPLOYEE_ID].astype(str).tolist()
+            return {e: i for i, e in reversed(list(enumerate(ids)))}
+
+        try:
+            return self._lookup("positions", build)[str(employee_id)]
+        except KeyError:
+            raise ValueError(
+                f"no record with {SeniorityDfFields.EMPLOYEE_ID} == {employee_id}"
+            )
+
+    def record_for(self, employee_id: t.Any) -> pd.Series:
+        """
+        Return the row of `employee_id`
+
+        :raise ValueError: if `employee_id` is not in the frame
+        """
+        return self.iloc[self.position_of(employee_id)]
+
+    def rows_senior_to(self, seniority_number: float) -> np.ndarray:
+        """Return the row positions with a seniority number below `seniority_number`"""
+
+        def build():
+            numbers = self[SeniorityDfFields.SENIORITY_NUMBER].to_numpy()
+            return numbers[self.seniority_order]
+
+        numbers = self._lookup("sorted_seniority_numbers", build)
+        return self.seniority_order[
+            : np.searchsorted(numbers, seniority_number, side="left")
+        ]
+
+
+_frame_cache: t.Dict[t.Tuple[int, t.Hashable], t.Tuple[weakref.ref, t.Any]] = {}
+
+
+def _cached_for_frame(
+    df: pd.DataFrame, name: t.Hashable, factory: t.Callable[[pd.DataFrame], T]
+) -> T:
+    """
+    Return `factory(df)`, built once and kept for as long as `df` is alive if it is
+    a `SeniorityFrame`, which must not be modified in place. Plain DataFrames may
+    be, so `factory(df)` is built anew on every call.
+    """
+    if not isinstance(df, SeniorityFrame):
+        return factory(df)
+
+    key = (id(df), name)
+
+    cached = _frame_cache.get(key)
+    if cached is not None and cached[0]() is df:
+        return cached[1]
+
+    value = factory(df)
+
+    def discard(_, key=key):
+        _frame_cache.pop(key, None)
+
+    _frame_cache[key] = (weakref.ref(df, discard), value)
+
+    return value
 
 
 def require_fields(*fields):
     """
     Raise a KeyError if a function is called with a missing field. The
-    first index of the function should be the target parameter.
+    first index of the function should be the target parameter. A `SeniorityFrame`
+    was validated on construction, so it is only checked for fields other than the
+    standard fields.
 
     Usage:
         >>> def some_func(df, *args, **kwargs):
@@ -118,9 +331,13 @@ def require_fields(*fields):
         KeyError: "function 'some_func' missing fields: ['some_other_key']"
     """
 
+    standard = set(fields) <= set(SeniorityDfFields.all())
+
     def decorator(func):
         @wraps(func)
         def wrapper(df: pd.DataFrame, *args, **kwargs):
+            if standard and isinstance(df, SeniorityFrame):
+                return func(df, *args, **kwargs)
             keys = set(df.keys())
             require = set(fields)
             missing = require.difference(keys)
@@ -1,6 +1,6 @@
 from __future__ import annotations
 from datetime import date, datetime
-from typing import Union, Optional, Dict, Any, Iterable, Iterator, List
+from typing import Union, Optional, Dict, Any, Iterable, Iterator, List, Tuple
 import typing as t
 import uuid
 
@@ -8,14 +8,27 @@ import pandas as pd
 
 from seniority_visualizer_app.utils import cast_date, DateCastable
 from .exceptions import SeniorityListError
+from .intervals import EmploymentIntervalIndex
+from .ordering import sort_pilots
 
 
 # todo: sub in new employee_id entity
 class Pilot:
     """
     Models the individual pilot record interactions and states
+
+    Instances are slotted and cache their hash, which is reset whenever one of
+    the hashed fields (employee_id, hire_date, retire_date) is assigned.
     """
 
+    __slots__ = (
+        "_employee_id",
+        "_hire_date",
+        "_retire_date",
+        "_hash",
+        "literal_seniority_number",
+    )
+
     def __init__(
         self,
         employee_id: str,
@@ -23,39 +36,56 @@ class Pilot:
         retire_date: DateCastable,
         literal_seniority_number: Optional[int] = None,
     ):
+        self._hash: Optional[int] = None
         self.employee_id: str = employee_id
         self.hire_date = hire_date  # type: ignore
         self.retire_date = retire_date  # type: ignore
         self.literal_seniority_number = literal_seniority_number
 
+    @property
+    def employee_id(self) -> str:
+        return self._employee_id
+
+    @employee_id.setter
+    def employee_id(self, val: str) -> None:
+        self._employee_id = val
+        self._hash = None
+
     @property
     def hire_date(self) -> date:
         return self._hire_date
 
     @hire_date.setter
     def hire_date(self, val: DateCastable) -> None:
-        self._hire_date = cast_date(val)
+        self._hire_date = val if type(val) is date else cast_date(val)
+        self._hash = None
 
     @property
     def retire_date(self) -> date:
-        if isinstance(self._retire_date, datetime):
-            return self._retire_date.date()
         return self._retire_date
 
     @retire_date.setter
     def retire_date(self, val: DateCastable) -> None:
-        self._retire_date = cast_date(val)
+        self._retire_date = val if type(val) is date else cast_date(val)
+        self._hash = None
 
     def __lt__(self, other):
         """Returns True if self.is_senior_to(other)"""
         return self.is_senior_to(other)
 
     def __eq__(self, other):
-        return hash(self) == hash(other)
+        if not isinstance(other, Pilot):
+            return NotImplemented
+        return (
+            self._employee_id == other._employee_id
+            and self._hire_date == other._hire_date
+            and self._retire_date == other._retire_date
+        )
 
     def __hash__(self):
-        t = (self.employee_id, self.hire_date, self.retire_date)
-        return hash(t)
+        if self._hash is None:
+            self._hash = hash((self._employee_id, self._hire_date, self._retire_date))
+        return self._hash
 
     def __repr__(self):
         s = f"<{type(self).__name__}(emp_id: {self.employee_id} hired: {self.hire_date} retires: {self.retire_date})>"
@@ -104,12 +134,14 @@ class Pilot:
         :param other: other Pilot object
         :return: bool
         """
-        if self.hire_date < other.hire_date:
+        self_hire, other_hire = self._hire_date, other.hire_date
+        if self_hire < other_hire:
             return True
-        if self.hire_date == other.hire_date:
-            if self.retire_date < other.retire_date:
+        if self_hire == other_hire:
+            self_retire, other_retire = self._retire_date, other.retire_date
+            if self_retire < other_retire:
                 return True
-            if self.retire_date == other.retire_date:
+            if self_retire == other_retire:
                 self_lit = self.literal_seniority_number
                 other_lit = other.literal_seniority_number
                 if self_lit is not None and other_lit is not None:
@@ -140,6 +172,11 @@ class SeniorityList:
     Models collection and hierarchical behaviors of individual Pilot records
     """
 
+    # built on first access, see `_reset_rank_index`
+    _sorted_pilots: Optional[Tuple[Pilot, ...]]
+    _rank_index: Optional[Dict[str, int]]
+    _interval_index: Optional[EmploymentIntervalIndex]
+
     def __init__(
         self,
         pilots: Optional[Iterable[Pilot]] = None,
@@ -147,6 +184,7 @@ class SeniorityList:
     ):
         self._pilots: List[Pilot] = [] if pilots is None else [p for p in pilots]
         self.published_date: Optional[date] = published_date  # type: ignore
+        self._reset_rank_index()
 
     def __repr__(self):
         s = f"<{type(self).__name__}(len: {len(self)})>"
@@ -157,9 +195,10 @@ class SeniorityList:
 
     def __contains__(self, item):
         try:
-            return self._get_pilot_index(item, self.pilot_data)
+            self._lookup_rank(item)
         except ValueError:
             return False
+        return True
 
     @property
     def published_date(self) -> Optional[date]:
@@ -191,9 +230,10 @@ class SeniorityList:
         raise AttributeError("pilot data is read only")
 
     @property
-    def sorted_pilot_data(self) -> List[Pilot]:
+    def sorted_pilot_data(self) -> Tuple[Pilot, ...]:
         """Presorted pilot data"""
-        return sorted(self.pilot_data)
+        sorted_pilots, _ = self._get_rank_index()
+        return sorted_pilots
 
     @sorted_pilot_data.setter
     def sorted_pilot_data(self, val):
@@ -211,7 +251,19 @@ class SeniorityList:
         """
         ref = date.today() if ref_date is None else cast_date(ref_date)
 
-        return (p for p in self.sorted_pilot_data if p.is_active_on(ref))
+        sorted_pilots = self.sorted_pilot_data
+
+        return (sorted_pilots[i] for i in self.interval_index.active_ranks_on(ref))
+
+    @property
+    def interval_index(self) -> EmploymentIntervalIndex:
+        """Employment interval index over the sorted pilot data"""
+        if self._interval_index is None:
+            self._interval_index = self._build_interval_index()
+        return self._interval_index
+
+    def _build_interval_index(self) -> EmploymentIntervalIndex:
+        return EmploymentIntervalIndex.from_pilots(self.sorted_pilot_data)
 
     def lookup_pilot_seniority_number(
         self, pilot: Pilot, date_: Optional[DateCastable] = None
@@ -225,22 +277,64 @@ class SeniorityList:
         :param pilot: pilot to check
         :param date_: get seniority number as of date
         """
-        if date_ is not None:
-            casted = cast_date(date_)
-            data = self.filter_active_on(casted)
-        else:
-            data = iter(self.sorted_pilot_data)
-
         try:
-            idx = self._get_pilot_index(pilot, data)
-            return idx + 1
+            idx = self._lookup_rank(pilot)
         except ValueError:
             raise SeniorityListError(f"{pilot} not in {self}")
 
+        if date_ is not None:
+            casted = cast_date(date_)
+            if not self.interval_index.is_active_on(idx, casted):
+                raise SeniorityListError(f"{pilot} not in {self}")
+            idx = self.interval_index.count_active_senior_to(idx, casted)
+
+        return idx + 1
+
     @staticmethod
     def _get_pilot_index(pilot: Pilot, data: Iterable[Pilot]) -> int:
         """Get the index of a pilot in a list of pilot data"""
-        return sorted(data).index(pilot)
+        return sort_pilots(data).index(pilot)
+
+    def _reset_rank_index(self) -> None:
+        """
+        Drop the cached sorted order, rank index and interval index. Must be called
+        whenever the pilots held by the list change, they are rebuilt on next access.
+        """
+        self._sorted_pilots = None
+        self._rank_index = None
+        self._interval_index = None
+
+    def _get_rank_index(self) -> Tuple[Tuple[Pilot, ...], Dict[str, int]]:
+        """
+        Return the cached (sorted pilots, employee_id -> sorted position) pair,
+        building it on first access.
+        """
+        if self._sorted_pilots is None or self._rank_index is None:
+            sorted_pilots = tuple(sort_pilots(self._pilots))
+            rank_index: Dict[str, int] = {}
+            for idx, p in enumerate(sorted_pilots):
+                rank_index.setdefault(p.employee_id, idx)
+            self._sorted_pilots = sorted_pilots
+            self._rank_index = rank_index
+        return self._sorted_pilots, self._rank_index
+
+    def _lookup_rank(self, pilot: Pilot) -> int:
+        """
+        Return the 0-indexed position of `pilot` in the sorted pilot data. Raise
+        ValueError if the pilot is not a member of the list.
+        """
+        sorted_pilots, rank_index = self._get_rank_index()
+
+        try:
+            idx = rank_index[pilot.employee_id]
+        except (AttributeError, KeyError, TypeError):
+            raise ValueError(f"{pilot} not in {self}")
+
+        if sorted_pilots[idx] == pilot:
+            return idx
+
+        # duplicated employee_id with differing dates, fall back to equality search
+        return sorted_pilots.index(pilot)
 
     @classmethod
     def from_dict(cls, dict_: dict) -> SeniorityList:
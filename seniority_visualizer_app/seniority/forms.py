@@ -1,8 +1,17 @@
 from flask_wtf import FlaskForm
-from wtforms import IntegerField, SubmitField, BooleanField
+from wtforms import IntegerField, SubmitField, SelectField
 
 
 class BuildPilotPlotForm(FlaskForm):
     employee_id = IntegerField("employee_id")
-    pin_pilot_group = BooleanField(default=True)
+    scenario = SelectField(
+        "scenario",
+        choices=[
+            ("fixed", "Fixed headcount (one hire per retirement)"),
+            ("none", "No hiring"),
+            ("growth:0.02", "2% growth per year"),
+            ("growth:0.05", "5% growth per year"),
+        ],
+        default="fixed",
+    )
 
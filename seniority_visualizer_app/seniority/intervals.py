@@ -0,0 +1,126 @@
+"""
+Module containing the employment interval index used to answer "who is active on
+a date" queries without checking every pilot.
+
+A pilot is active on a date when `hire_date <= date < retire_date`.
+"""
+from __future__ import annotations
+from datetime import date
+import typing as t
+
+import numpy as np
+
+from seniority_visualizer_app.utils import cast_date, DateCastable
+
+DayLike = t.Union[DateCastable, np.datetime64]
+
+
+def to_day(value: DayLike) -> np.datetime64:
+    """Return a datetime64[D] from a date-like value"""
+    if isinstance(value, np.datetime64):
+        return value.astype("datetime64[D]")
+    return np.datetime64(cast_date(value), "D")
+
+
+class EmploymentIntervalIndex:
+    """
+    Index over the employment intervals of pilots held in seniority order.
+
+    Counting the pilots active on a date is two binary searches over the hire and
+    retire days sorted independently, O(log n). Listing them, in seniority order,
+    is a binary search for the pilots hired by the date, a prefix of the seniority
+    ordered columns (seniority order is primarily by hire date), followed by one
+    vectorized retire date check over that prefix: O(log n + h) for h pilots hired
+    by the date, every pilot for dates after the last hire. An interval tree would
+    list them in O(log n + k) for k active pilots, but walking it in Python is
+    slower than the vectorized scan at the size of a seniority list.
+
+    :param hire_days: hire dates in seniority order
+    :param retire_days: retire dates in seniority order
+    """
+
+    def __init__(self, hire_days: t.Iterable[t.Any], retire_days: t.Iterable[t.Any]):
+        hire = np.asarray(hire_days, dtype="datetime64[D]")
+        retire = np.asarray(retire_days, dtype="datetime64[D]")
+
+        if not len(hire) == len(retire):
+            raise ValueError("hire and retire days must be the same length")
+
+        # a pilot retiring on or before their hire date is never active
+        valid = hire < retire
+
+        self.hire_by_rank: np.ndarray = hire
+        self.retire_by_rank: np.ndarray = retire
+        self._sorted_hire: np.ndarray = np.sort(hire[valid])
+        self._sorted_retire: np.ndarray = np.sort(retire[valid])
+
+        for arr in (
+            self.hire_by_rank,
+            self.retire_by_rank,
+            self._sorted_hire,
+            self._sorted_retire,
+        ):
+            arr.flags.writeable = False
+
+    def __repr__(self):
+        s = f"<{type(self).__name__}(len: {len(self)})>"
+        return s
+
+    def __len__(self):
+        return len(self.hire_by_rank)
+
+    @classmethod
+    def from_pilots(cls, sorted_pilots: t.Sequence[t.Any]) -> EmploymentIntervalIndex:
+        """Return an index over pilots that are already in seniority order"""
+        return cls(
+            [p.hire_date for p in sorted_pilots], [p.retire_date for p in sorted_pilots]
+        )
+
+    def count_active_on(self, ref_date: t.Optional[DayLike] = None) -> int:
+        """Return the number of pilots active on `ref_date` [default: today]"""
+        day = to_day(date.today() if ref_date is None else ref_date)
+
+        hired = np.searchsorted(self._sorted_hire, day, side="right")
+        retired = np.searchsorted(self._sorted_retire, day, side="right")
+
+        return int(hired - retired)
+
+    def count_active_on_days(self, days: t.Iterable[t.Any]) -> np.ndarray:
+        """Return the number of pilots active on each of `days`"""
+        days = np.asarray(days, dtype="datetime64[D]")
+
+        hired = np.searchsorted(self._sorted_hire, days, side="right")
+        retired = np.searchsorted(self._sorted_retire, days, side="right")
+
+        return hired - retired
+
+    def active_ranks_on(self, ref_date: t.Optional[DayLike] = None) -> np.ndarray:
+        """
+        Return the 0-indexed seniority positions of the pilots active on `ref_date`
+        [default: today], most senior first. Scans the retire date of every pilot
+        hired by `ref_date`, see the class docstring.
+        """
+        day = to_day(date.today() if ref_date is None else ref_date)
+
+        hired = np.searchsorted(self.hire_by_rank, day, side="right")
+
+        return np.flatnonzero(self.retire_by_rank[:hired] > day)
+
+    def is_active_on(self, rank: int, ref_date: t.Optional[DayLike] = None) -> bool:
+        """Return True if the pilot at seniority position `rank` is active on a date"""
+        day = to_day(date.today() if ref_date is None else ref_date)
+
+        return bool(self.hire_by_rank[rank] <= day < self.retire_by_rank[rank])
+
+    def count_active_senior_to(
+        self, rank: int, ref_date: t.Optional[DayLike] = None
+    ) -> int:
+        """
+        Return the number of pilots senior to seniority position `rank` that are
+        active on `ref_date` [default: today].
+        """
+        day = to_day(date.today() if ref_date is None else ref_date)
+
+        hired = min(rank, int(np.searchsorted(self.hire_by_rank, day, side="right")))
+
+        return int(np.count_nonzero(self.retire_by_rank[:hired] > day))
@@ -1,16 +1,45 @@
 from __future__ import annotations
-from typing import List, TypeVar, Dict, IO
+import re
+from typing import List, TypeVar, Dict, IO, Iterator
 
 
+import pandas as pd
 import tablib
 
 from seniority_visualizer_app.seniority.entities import Pilot, SeniorityList
-from seniority_visualizer_app.utils import cast_date
+from seniority_visualizer_app.utils import cast_date, cast_dates
+from .columns import ColumnarSeniorityList, PilotColumns
 from .exceptions import LoaderError
+from .validation import REQUIRED_COLUMNS, ValidationReport, validate_pilot_table
 
 
 T = TypeVar("T")
 
+#: rows parsed at a time by the streaming loader methods
+DEFAULT_CHUNK_SIZE = 10_000
+
+#: first pandas version reading csv with the pyarrow engine
+PYARROW_CSV_PANDAS_VERSION = (1, 4)
+
+
+def _fast_csv_engine() -> str:
+    """Return "pyarrow" if it is installed and this pandas can read csv with it"""
+    version = tuple(int(part) for part in re.findall(r"\d+", pd.__version__)[:2])
+
+    if version < PYARROW_CSV_PANDAS_VERSION:
+        return "c"
+
+    try:
+        import pyarrow  # noqa: F401
+    except ImportError:
+        return "c"
+
+    return "pyarrow"
+
+
+#: pandas csv engine of the fast loader, see `_fast_csv_engine`
+FAST_CSV_ENGINE = _fast_csv_engine()
+
 
 PILOT_CASTING = {
     "hire_date": lambda s: cast_date(s),
@@ -71,20 +100,133 @@ class SeniorityListLoader:
         """
         Create a SeniorityList object from a stream-like object. Additional
         kwargs are passed to the `SeniorityList.__init__()` method.
+
+        :raise DatasourceValidationError: listing every issue of
+        :func:`.validation.validate_pilot_table` found in the file
         """
         data = self._load_stream_to_dicts(stream)
 
-        header_swapped = (self.rename_keys(d, self.headers) for d in data)
+        header_swapped = [self.rename_keys(d, self.headers) for d in data]
+
+        validate_pilot_table(_frame_from_dicts(header_swapped)).raise_for_issues()
 
         pilots = (Pilot.from_dict(d) for d in header_swapped)
 
+        return SeniorityList(pilots=pilots, **kwargs)
+
+    def _missing_key_error(self, key, raw_keys: List[str]) -> LoaderError:
+        s = (
+            f"Could not create pilot object without key: {key}. "
+            f"Make sure the loader has appropriate headers.\n"
+            f"Headers: {self.headers}\n"
+            f"Raw Data Keys: {raw_keys}"
+        )
+        return LoaderError(s)
+
+    def iter_chunks(
+        self, stream: IO, chunk_size: int = DEFAULT_CHUNK_SIZE
+    ) -> Iterator[pd.DataFrame]:
+        """
+        Yield the rows of a csv stream as DataFrames of at most `chunk_size` rows of
+        strings, with the headers renamed. The stream is read as chunks are taken,
+        so only one chunk is held at a time.
+        """
+        try:
+            reader = pd.read_csv(
+                stream, chunksize=chunk_size, dtype=str, keep_default_na=False
+            )
+        except pd.errors.EmptyDataError as e:
+            raise LoaderError(f"no data to load: {e}")
+
+        # TextFileReader is only a context manager from pandas 1.2
         try:
-            return SeniorityList(pilots=pilots, **kwargs)
-        except KeyError as e:
-            s = (
-                f"Could not create pilot object without key: {e}. "
-                f"Make sure the loader has appropriate headers.\n"
-                f"Headers: {self.headers}\n"
-                f"Raw Data Keys: {list(data[0].keys())}"
+            for chunk in reader:
+                yield self._checked_frame(chunk)
+        finally:
+            reader.close()
+
+    def _checked_frame(self, df: pd.DataFrame) -> pd.DataFrame:
+        """Return `df` with the headers renamed, raise LoaderError if one is missing"""
+        renamed = df.rename(columns=self.headers)
+
+        missing = [f for f in REQUIRED_COLUMNS if f not in renamed.columns]
+        if missing:
+            raise self._missing_key_error(missing, list(df.columns))
+
+        return renamed
+
+    def iter_pilots(
+        self, stream: IO, chunk_size: int = DEFAULT_CHUNK_SIZE
+    ) -> Iterator[Pilot]:
+        """Yield a `Pilot` for each row of a csv stream, parsed in chunks"""
+        for chunk in self.iter_chunks(stream, chunk_size):
+            yield from (Pilot.from_dict(d) for d in chunk.to_dict("records"))
+
+    def iter_column_batches(
+        self, stream: IO, chunk_size: int = DEFAULT_CHUNK_SIZE
+    ) -> Iterator[PilotColumns]:
+        """Yield `PilotColumns` of at most `chunk_size` rows of a csv stream"""
+        for chunk in self.iter_chunks(stream, chunk_size):
+            yield _columns_from_frame(chunk)
+
+    def load_columnar_from_stream(
+        self, stream: IO, chunk_size: int = DEFAULT_CHUNK_SIZE, **kwargs
+    ) -> ColumnarSeniorityList:
+        """
+        Create a ColumnarSeniorityList from a csv stream parsed in chunks, without
+        holding the whole file or a `Pilot` per row. Additional kwargs are passed to
+        the `ColumnarSeniorityList.__init__()` method.
+        """
+        columns = PilotColumns.concat(self.iter_column_batches(stream, chunk_size))
+
+        return ColumnarSeniorityList(columns, **kwargs)
+
+    def load_fast_from_stream(self, stream: IO, **kwargs) -> ColumnarSeniorityList:
+        """
+        Create a ColumnarSeniorityList from a csv stream in one pass of the pandas
+        `FAST_CSV_ENGINE`, casting each distinct date once. Additional kwargs are
+        passed to the `ColumnarSeniorityList.__init__()` method. Use
+        `load_from_stream` for other tabular formats.
+
+        :raise DatasourceValidationError: listing every issue of
+        :func:`.validation.validate_pilot_table` found in the file
+        """
+        df = self._read_fast(stream)
+
+        validate_pilot_table(df).raise_for_issues()
+
+        return ColumnarSeniorityList(_columns_from_frame(df), **kwargs)
+
+    def validate_stream(self, stream: IO) -> ValidationReport:
+        """Return the `ValidationReport` of a csv stream, with headers renamed"""
+        return validate_pilot_table(self._read_fast(stream))
+
+    def _read_fast(self, stream: IO) -> pd.DataFrame:
+        try:
+            df = pd.read_csv(
+                stream, dtype=str, keep_default_na=False, engine=FAST_CSV_ENGINE
             )
-            raise LoaderError(s)
+        except pd.errors.EmptyDataError as e:
+            raise LoaderError(f"no data to load: {e}")
+
+        return df.rename(columns=self.headers)
+
+
+def _frame_from_dicts(rows: List[dict]) -> pd.DataFrame:
+    """
+    Return the rows loaded by tablib as a DataFrame, blank where a cell is empty, to
+    be validated as a table of strings
+    """
+    return pd.DataFrame.from_records(rows).astype(object).fillna("")
+
+
+def _columns_from_frame(df: pd.DataFrame) -> PilotColumns:
+    """Return PilotColumns of a DataFrame of strings with the pilot fields"""
+    literal = df["literal_seniority_number"]
+
+    return PilotColumns(
+        employee_ids=df["employee_id"],
+        hire_dates=cast_dates(df["hire_date"]),
+        retire_dates=cast_dates(df["retire_date"]),
+        literal_numbers=literal.where(literal != ""),
+    )
@@ -16,6 +16,7 @@ from seniority_visualizer_app.database import (
     relationship,
 )
 from seniority_visualizer_app.utils import cast_date, DateCastable
+from .columns import ColumnarSeniorityList, PilotColumns
 from .entities import Pilot, SeniorityList
 from .utils import standardize_employee_id
 
@@ -32,7 +33,7 @@ class SeniorityListRecord(Model, SurrogatePK):
     added_date = db.Column(db.DateTime, default=datetime.utcnow)
     company_name = db.Column(db.String(32))
 
-    def __init__(self, published_date: datetime, **kwargs):
+    def __init__(self, published_date: Optional[datetime], **kwargs):
         super().__init__(published_date=published_date, **kwargs)
 
     def to_entity(self) -> SeniorityList:
@@ -70,6 +71,56 @@ class SeniorityListRecord(Model, SurrogatePK):
 
         return out
 
+    @classmethod
+    def bulk_create(
+        cls, entity: SeniorityList, published_date: Optional[datetime] = None
+    ) -> SeniorityListRecord:
+        """
+        Save a `SeniorityList` and its pilots in one transaction, inserting the
+        pilots with a single executemany rather than one ORM object each. The
+        transaction is rolled back if any insert fails.
+        """
+        if isinstance(entity, ColumnarSeniorityList):
+            columns = entity.columns
+        else:
+            columns = PilotColumns.from_pilots(entity.pilot_data)
+
+        literal = columns.literal_numbers.tolist()
+        has_literal = columns.has_literal.tolist()
+
+        record = cls(published_date=published_date)
+
+        try:
+            db.session.add(record)
+            db.session.flush()
+
+            rows = [
+                dict(
+                    employee_id=employee_id,
+                    seniority_list_id=record.id,
+                    hire_date=hire_date,
+                    retire_date=retire_date,
+                    literal_seniority_number=number if has_number else None,
+                )
+                for employee_id, hire_date, retire_date, number, has_number in zip(
+                    columns.employee_ids.tolist(),
+                    columns.hire_dates.astype("datetime64[us]").tolist(),
+                    columns.retire_dates.astype("datetime64[us]").tolist(),
+                    literal,
+                    has_literal,
+                )
+            ]
+
+            if rows:
+                db.session.execute(PilotRecord.__table__.insert(), rows)
+
+            db.session.commit()
+        except Exception:
+            db.session.rollback()
+            raise
+
+        return record
+
 
 class PilotRecord(Model, SurrogatePK):
     """
@@ -0,0 +1,534 @@
+"""
+Module containing the Monte Carlo attrition simulator.
+
+Projections in :mod:`.statistics` assume every pilot works until their retire date.
+Here pilots may also leave early (attrition, medical retirement) following hazard
+rates, and many trials give P10/P50/P90 bands of each pilot's seniority number.
+
+Every trial draws one early departure date per pilot from the cumulative hazard
+over the date grid (an exponential draw compared against it). A pilot stops being
+senior to anyone at the earlier of that date and their retire date, and the rank
+of a pilot on every date is then counted from a histogram of those departures,
+without building the full seniority matrix for every trial.
+
+Chunks of the selected pilots run across a `ProcessPoolExecutor`. Every worker
+draws the departures of the pilots senior to its chunks from the same seed, pilot
+after pilot, so each pilot gets the same draws in every chunk, a seed always gives
+the same bands whatever the number of workers, and results can be cached. A worker
+reduces each chunk to histograms of its pilots' seniority numbers on each date and
+then to their bands, so neither the trials nor the histograms of every pilot are
+held at once, and only the bands cross process boundaries.
+"""
+from __future__ import annotations
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from itertools import islice
+import os
+import typing as t
+
+import numpy as np
+import pandas as pd
+
+from . import statistics as stat
+from .dataframe import STANDARD_FIELDS as FIELDS, _cached_for_frame, require_fields
+
+PERCENTILES = (10, 50, 90)
+
+#: most (trial, pilot, date) cells simulated at once, bounds the memory of a worker
+MAX_BATCH_CELLS = 4_000_000
+
+#: most histogram bins a worker holds at once, pilots are simulated in chunks small
+#: enough to fit
+MAX_HISTOGRAM_BINS = 4_000_000
+
+#: standard deviations either side of a pilot's expected seniority number counted
+#: exactly, numbers further out are vanishingly rare and count at the window's edge
+TAIL_SIGMAS = 8
+
+
+class HazardRates(t.NamedTuple):
+    """
+    Yearly probability of a pilot leaving before their retire date.
+
+    :param annual: probability of leaving within any year
+    :param schedule: probabilities for the first years of the horizon, overriding
+    `annual` year by year
+    """
+
+    annual: float = 0.01
+    schedule: t.Tuple[float, ...] = ()
+
+    def cumulative(self, dates: pd.DatetimeIndex) -> np.ndarray:
+        """Return the cumulative hazard from the first of `dates` to each date"""
+        days = dates.to_numpy().astype("datetime64[D]")
+        years = (days - days[:1]).astype(np.int64) / 365.25
+
+        if not self.schedule:
+            return _yearly_hazard(self.annual) * years
+
+        # hazard rates are constant within each year of the horizon
+        rates = np.array(
+            [_yearly_hazard(p) for p in self.schedule] + [_yearly_hazard(self.annual)]
+        )
+        whole = np.minimum(np.floor(years).astype(np.int64), len(self.schedule))
+        accumulated = np.concatenate([[0], np.cumsum(rates[:-1])])
+
+        return accumulated[whole] + rates[whole] * (years - whole)
+
+
+def _yearly_hazard(probability: float) -> float:
+    """Return the constant hazard rate leaving `probability` of departure in a year"""
+    if not 0 <= probability < 1:
+        raise ValueError("hazard probabilities must be in [0, 1)")
+    return -np.log1p(-probability)
+
+
+class AttritionBands:
+    """
+    Seniority number bands of pilots over a date grid.
+
+    :param employee_ids: employee ids of the rows, in seniority order
+    :param dates: the date grid
+    :param bands: (percentiles, pilots, dates) seniority numbers, NaN where the
+    pilot has left in every trial
+    :param present: (pilots, dates) fraction of trials the pilot is still on the list
+    """
+
+    def __init__(
+        self,
+        employee_ids: np.ndarray,
+        dates: pd.DatetimeIndex,
+        bands: np.ndarray,
+        present: np.ndarray,
+        percentiles: t.Sequence[float] = PERCENTILES,
+    ):
+        self.employee_ids = employee_ids
+        self.dates = dates
+        self.bands = bands
+        self.present = present
+        self.percentiles = tuple(percentiles)
+        self._rows: t.Dict[str, int] = {e: i for i, e in enumerate(employee_ids)}
+
+    def __repr__(self):
+        s = f"<{type(self).__name__}(pilots: {len(self)}, dates: {len(self.dates)})>"
+        return s
+
+    def __len__(self):
+        return len(self.employee_ids)
+
+    def pilot_frame(self, employee_id: t.Any) -> pd.DataFrame:
+        """
+        Return a pilot's bands indexed by date, one `P<percentile>` column per
+        percentile plus the `present` fraction
+
+        :raise ValueError: if `employee_id` was not simulated
+        """
+        try:
+            row = self._rows[str(employee_id)]
+        except KeyError:
+            raise ValueError(f"no record with {FIELDS.EMPLOYEE_ID} == {employee_id}")
+
+        data = {f"P{p:g}": self.bands[i, row] for i, p in enumerate(self.percentiles)}
+        data["present"] = self.present[row]
+
+        return pd.DataFrame(data, index=self.dates)
+
+
+class _Windows(t.NamedTuple):
+    """
+    Seniority numbers counted by the histogram of each (selected pilot, date):
+    `widths` numbers from `low`, in bins from `offsets` of one flat array
+    """
+
+    low: np.ndarray
+    widths: np.ndarray
+    offsets: np.ndarray
+
+    @property
+    def size(self) -> int:
+        return int(self.offsets[-1, -1] + self.widths[-1, -1]) if self.low.size else 0
+
+
+class _Task(t.NamedTuple):
+    """
+    Inputs of one range of selected pilots, sent to a worker: the scheduled leave
+    columns of every pilot up to the junior-most selected one, the retire columns
+    of the selected ones and where `positions` splits into chunks
+    """
+
+    seed: int
+    trials: int
+    batch_trials: int
+    leaves: np.ndarray
+    retires: np.ndarray
+    cumulative_hazard: np.ndarray
+    positions: np.ndarray
+    chunks: np.ndarray
+
+
+class _TaskBands(t.NamedTuple):
+    """Bands of the pilots of one task, and the trials each is present on each date"""
+
+    bands: np.ndarray
+    held: np.ndarray
+
+
+def _draw_departures(
+    seed: int, trials: int, pilots: int, cumulative_hazard: np.ndarray
+) -> np.ndarray:
+    """
+    Return the (pilots, trials) grid column from which each of the `pilots` most
+    senior pilots has left early, the number of dates if never.
+
+    Draws are made pilot after pilot from one generator, so senior pilots get the
+    same draws however many pilots are drawn.
+    """
+    rng = np.random.default_rng(seed)
+    periods = cumulative_hazard.size
+    dtype = np.int16 if periods < np.iinfo(np.int16).max else np.int64
+    early = np.empty((pilots, trials), dtype=dtype)
+
+    step = max(1, MAX_BATCH_CELLS // max(trials, 1))
+    for start in range(0, pilots, step):
+        drawn = rng.standard_exponential((min(step, pilots - start), trials))
+        early[start : start + step] = np.searchsorted(cumulative_hazard, drawn)
+
+    return early
+
+
+def _simulate_trials(
+    early: np.ndarray,
+    leaves: np.ndarray,
+    retires: np.ndarray,
+    segments: np.ndarray,
+    positions: np.ndarray,
+    periods: int,
+) -> np.ndarray:
+    """
+    Return the (trials, selected pilots, dates) int32 seniority numbers of the
+    pilots at `positions`, 0 where a pilot has left
+
+    :param early: (pilots, trials) early departures of every pilot up to the
+    junior-most selected one
+    :param retires: retire columns of the selected pilots
+    """
+    trials, m = early.shape[1], positions.size
+
+    left = np.minimum(leaves, early.T)
+    gone = np.minimum(retires, early[positions].T)
+
+    # departures before each date by segment, a segment being the pilots senior to
+    # one selected pilot but not to the one before it
+    trial = np.arange(trials)[:, None]
+    cells = (trial * (m + 1) + segments) * (periods + 1) + left
+    hist = np.bincount(cells.ravel(), minlength=trials * (m + 1) * (periods + 1))
+    hist = hist.reshape(trials, m + 1, periods + 1)[:, :m, :periods]
+
+    departed = hist.cumsum(axis=1).cumsum(axis=2)
+    numbers = (positions + 1)[None, :, None] - departed
+
+    numbers[np.arange(periods)[None, None, :] >= gone[:, :, None]] = 0
+
+    return numbers.astype(np.int32)
+
+
+def _chunk_bands(
+    task: _Task, early: np.ndarray, positions: np.ndarray, retires: np.ndarray
+) -> _TaskBands:
+    """
+    Return the bands of one chunk of a task's pilots, from a histogram of their
+    seniority numbers built a slice of trials at a time
+    """
+    periods, m = task.cumulative_hazard.size, positions.size
+    pilots = positions[-1] + 1
+
+    leaves = task.leaves[:pilots]
+    segments = np.searchsorted(positions, np.arange(pilots), side="right")
+    windows = _windows(leaves, segments, positions, task.cumulative_hazard)
+
+    hist = np.zeros(windows.size, dtype=np.int64)
+    held = np.zeros((m, periods), dtype=np.int64)
+
+    cells = max((m + 1) * (periods + 1), pilots)
+    step = max(1, min(task.batch_trials, MAX_BATCH_CELLS // cells))
+
+    for start in range(0, task.trials, step):
+        numbers = _simulate_trials(
+            early[:pilots, start : start + step],
+            leaves,
+            retires,
+            segments,
+            positions,
+            periods,
+        )
+        present = numbers > 0
+
+        bins = windows.offsets + np.clip(numbers - windows.low, 0, windows.widths - 1)
+        hist += np.bincount(bins[present], minlength=windows.size)
+        held += present.sum(axis=0)
+
+    return _TaskBands(_percentiles_of_histogram(hist, windows, held, PERCENTILES), held)
+
+
+def _simulate_task(task: _Task) -> _TaskBands:
+    """
+    Return the bands of a task's pilots, chunk by chunk so a worker holds one
+    histogram at a time
+    """
+    early = _draw_departures(
+        task.seed, task.trials, task.leaves.size, task.cumulative_hazard
+    )
+
+    chunks = [
+        _chunk_bands(task, early, positions, retires)
+        for positions, retires in zip(
+            np.split(task.positions, task.chunks), np.split(task.retires, task.chunks)
+        )
+    ]
+
+    return _TaskBands(
+        np.concatenate([c.bands for c in chunks], axis=1),
+        np.concatenate([c.held for c in chunks]),
+    )
+
+
+def _chunk_starts(positions: np.ndarray, periods: int) -> np.ndarray:
+    """
+    Return where `positions` splits into chunks whose histograms hold about
+    `MAX_HISTOGRAM_BINS` bins at most.
+
+    A window is at most `TAIL_SIGMAS` binomial standard deviations, each at most
+    half the square root of the seniors, either side of the expected number.
+    """
+    spread = np.ceil(TAIL_SIGMAS * np.sqrt(positions) / 2)
+    bins = np.minimum(positions + 1, 2 * spread + 3).astype(np.int64) * periods
+
+    by_bins = np.cumsum(bins) // MAX_HISTOGRAM_BINS
+    by_count = np.arange(positions.size) // max(1, MAX_BATCH_CELLS // (periods + 1))
+
+    return np.flatnonzero((np.diff(by_bins) > 0) | (np.diff(by_count) > 0)) + 1
+
+
+def _windows(
+    leaves: np.ndarray,
+    segments: np.ndarray,
+    positions: np.ndarray,
+    cumulative_hazard: np.ndarray,
+) -> _Windows:
+    """
+    Return the histogram windows of the selected pilots, `TAIL_SIGMAS` standard
+    deviations either side of the expected seniority number.
+
+    On each date the seniors of a pilot still on the list by schedule leave early
+    independently with the same probability, so the number of early departures is
+    binomial and a pilot's seniority number is the scheduled one less that count.
+    """
+    m, periods = positions.size, cumulative_hazard.size
+
+    cells = segments * (periods + 1) + leaves
+    hist = np.bincount(cells, minlength=(m + 1) * (periods + 1))
+    left = hist.reshape(m + 1, periods + 1)[:m, :periods].cumsum(0).cumsum(1)
+
+    # seniors still on the list by schedule, and their chance of having left early
+    seniors = positions[:, None] - left
+    chance = -np.expm1(-cumulative_hazard)[None, :]
+
+    expected = seniors + 1 - seniors * chance
+    spread = TAIL_SIGMAS * np.sqrt(seniors * chance * (1 - chance))
+
+    low = np.maximum(np.floor(expected - spread), 1).astype(np.int64)
+    high = np.minimum(np.ceil(expected + spread), seniors + 1).astype(np.int64)
+    widths = high - low + 1
+
+    return _Windows(low, widths, np.cumsum(widths).reshape(widths.shape) - widths)
+
+
+def _percentiles_of_histogram(
+    hist: np.ndarray,
+    windows: _Windows,
+    held: np.ndarray,
+    percentiles: t.Sequence[float],
+) -> np.ndarray:
+    """
+    Return the (percentiles, pilots, dates) linearly interpolated percentiles of
+    the seniority numbers counted in `hist`, NaN where none are held.
+
+    Numbers outside a window were counted at its edge, so the bands only match
+    `np.percentile` over the trials while every number falls inside the windows.
+
+    :param hist: counts of each bin of `windows`, overwritten by their cumulative sum
+    :param held: (pilots, dates) total count of each histogram
+    """
+    cumulative = np.cumsum(hist, out=hist)
+    before = np.where(windows.offsets > 0, cumulative[windows.offsets - 1], 0)
+    last = np.maximum(held - 1, 0)
+
+    def value_at(rank: np.ndarray) -> np.ndarray:
+        """Return the `rank`th smallest number counted in each histogram"""
+        bins = np.searchsorted(cumulative, before + rank, side="right")
+        bins = np.minimum(bins, windows.offsets + windows.widths - 1)
+        return (windows.low + bins - windows.offsets).astype(float)
+
+    bands = np.full((len(percentiles),) + held.shape, np.nan)
+
+    for i, p in enumerate(percentiles):
+        position = last * p / 100
+        below = np.floor(position).astype(np.int64)
+        above = np.minimum(below + 1, last)
+
+        low, high = value_at(below), value_at(above)
+
+        bands[i] = np.where(held > 0, low + (high - low) * (position - below), np.nan)
+
+    return bands
+
+
+def _iter_bands(
+    tasks: t.Sequence[_Task], max_workers: t.Optional[int]
+) -> t.Iterator[t.Tuple[int, _TaskBands]]:
+    """
+    Yield the index and bands of `tasks` as they complete, with at most two tasks
+    per worker submitted at once so finished bands do not pile up
+    """
+    if max_workers == 1 or len(tasks) < 2:
+        yield from enumerate(map(_simulate_task, tasks))
+        return
+
+    workers = max_workers or os.cpu_count() or 1
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        queued = enumerate(tasks)
+
+        def submit(count: int) -> t.Dict[t.Any, int]:
+            return {
+                executor.submit(_simulate_task, task): i
+                for i, task in islice(queued, count)
+            }
+
+        pending = submit(2 * workers)
+
+        while pending:
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                yield pending.pop(future), future.result()
+                pending.update(submit(1))
+
+
+@require_fields(FIELDS.RETIRE_DATE, FIELDS.SENIORITY_NUMBER, FIELDS.EMPLOYEE_ID)
+def simulate_attrition(
+    df: pd.DataFrame,
+    dates: stat.DateSeries,
+    hazard: HazardRates = HazardRates(),
+    employee_ids: t.Optional[t.Iterable[t.Any]] = None,
+    trials: int = 1000,
+    seed: int = 0,
+    batch_trials: int = 100,
+    max_workers: t.Optional[int] = None,
+) -> AttritionBands:
+    """
+    Return the P10/P50/P90 seniority bands of pilots under early attrition.
+
+    The selected pilots are split into chunks, each simulated over every trial and
+    reduced to histograms of its pilots' seniority numbers on every date, then to
+    its bands. A worker holds one chunk's histograms at a time, at most
+    `MAX_HISTOGRAM_BINS` bins, and only the bands come back from it.
+
+    :param df: standard seniority dataframe
+    :param dates: the date grid, sorted ascending
+    :param hazard: early departure rates
+    :param employee_ids: pilots to report bands for [default: all]
+    :param trials: number of trials
+    :param seed: seed of the trials, the same seed always gives the same bands
+    :param batch_trials: most trials a worker simulates at once, bounding its memory
+    without changing the bands
+    :param max_workers: worker processes [default: one per core], 1 runs the
+    chunks in this process
+
+    :raise ValueError: if an `employee_ids` pilot is not in `df`
+    """
+    grid = pd.DatetimeIndex(dates)
+
+    order = np.argsort(df[FIELDS.SENIORITY_NUMBER].to_numpy(), kind="stable")
+    ids = df[FIELDS.EMPLOYEE_ID].astype(str).to_numpy()[order]
+    retire = pd.to_datetime(df[FIELDS.RETIRE_DATE]).to_numpy(dtype="datetime64[ns]")
+    retire = retire[order]
+
+    if employee_ids is None:
+        positions = np.arange(ids.size)
+    else:
+        rows = {e: i for i, e in enumerate(ids)}
+        try:
+            positions = np.array(sorted(rows[str(e)] for e in employee_ids), dtype=int)
+        except KeyError as e:
+            raise ValueError(f"no record with {FIELDS.EMPLOYEE_ID} == {e.args[0]}")
+
+    periods = len(grid)
+    never = np.isnat(retire)
+    grid_values = grid.to_numpy()
+    leaves = np.where(never, periods, np.searchsorted(grid_values, retire, "left"))
+    retires = np.where(never, periods, np.searchsorted(grid_values, retire, "right"))
+
+    cumulative_hazard = hazard.cumulative(grid)
+    chunks = [
+        c
+        for c in np.split(np.arange(positions.size), _chunk_starts(positions, periods))
+        if c.size
+    ]
+
+    # a few tasks per worker so they stay busy while the junior-most chunks, which
+    # count the most seniors, finish
+    workers = 1 if max_workers == 1 else max_workers or os.cpu_count() or 1
+    groups = [g for g in np.array_split(np.arange(len(chunks)), 2 * workers) if g.size]
+
+    tasks = []
+    for group in groups:
+        members = np.concatenate([chunks[i] for i in group])
+        tasks.append(
+            _Task(
+                seed,
+                trials,
+                batch_trials,
+                leaves[: positions[members[-1]] + 1],
+                retires[positions[members]],
+                cumulative_hazard,
+                positions[members],
+                np.cumsum([chunks[i].size for i in group[:-1]], dtype=np.int64),
+            )
+        )
+
+    bands = np.full((len(PERCENTILES), positions.size, periods), np.nan)
+    held = np.zeros((positions.size, periods), dtype=np.int64)
+    starts = np.cumsum([0] + [task.positions.size for task in tasks])
+
+    for i, task_bands in _iter_bands(tasks, max_workers):
+        bands[:, starts[i] : starts[i + 1]] = task_bands.bands
+        held[starts[i] : starts[i + 1]] = task_bands.held
+
+    present = held / max(trials, 1)
+
+    return AttritionBands(ids[positions], grid, bands, present)
+
+
+@require_fields(FIELDS.RETIRE_DATE, FIELDS.SENIORITY_NUMBER, FIELDS.EMPLOYEE_ID)
+def get_attrition_bands(
+    df: pd.DataFrame,
+    dates: pd.DatetimeIndex,
+    hazard: HazardRates = HazardRates(),
+    employee_ids: t.Optional[t.Iterable[t.Any]] = None,
+    trials: int = 1000,
+    seed: int = 0,
+) -> AttritionBands:
+    """
+    Return the cached :func:`simulate_attrition` bands, built once per
+    SeniorityFrame and simulation arguments
+    """
+    dates = pd.DatetimeIndex(dates)
+    hazard = HazardRates(hazard.annual, tuple(hazard.schedule))
+    ids = None if employee_ids is None else tuple(sorted(str(e) for e in employee_ids))
+
+    return _cached_for_frame(
+        df,
+        ("attrition", tuple(dates.asi8), hazard, ids, trials, seed),
+        lambda frame: simulate_attrition(
+            frame, dates, hazard, ids, trials=trials, seed=seed
+        ),
+    )
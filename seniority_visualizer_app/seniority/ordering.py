@@ -0,0 +1,84 @@
+"""
+Module containing the seniority ordering helpers.
+
+Sorting by :func:`seniority_sort_key`, or in bulk with :func:`seniority_order`,
+gives the same order as comparing pilots with :meth:`Pilot.is_senior_to` without
+paying for a Python level comparison per pair.
+"""
+import typing as t
+
+import numpy as np
+
+if t.TYPE_CHECKING:  # pragma: no cover
+    from .entities import Pilot
+
+SortKey = t.Tuple[int, int, int, t.Any]
+
+
+def seniority_sort_key(pilot: "Pilot") -> SortKey:
+    """
+    Return a key that sorts pilots from most to least senior.
+
+    The key is (hire day, retire day, literal number missing flag, literal number),
+    so pilots with a literal seniority number sort ahead of those without one.
+    """
+    literal = pilot.literal_seniority_number
+    has_literal = literal is not None
+
+    return (
+        pilot.hire_date.toordinal(),
+        pilot.retire_date.toordinal(),
+        0 if has_literal else 1,
+        literal if has_literal else 0,
+    )
+
+
+def seniority_order(
+    hire_days: np.ndarray,
+    retire_days: np.ndarray,
+    literal_numbers: np.ndarray,
+    has_literal: np.ndarray,
+) -> np.ndarray:
+    """
+    Return the indices that would sort the columnar pilot data into seniority
+    order. Ties are kept in their original order.
+
+    :param hire_days: hire dates as day ordinals or datetime64[D]
+    :param retire_days: retire dates as day ordinals or datetime64[D]
+    :param literal_numbers: literal seniority numbers, any value where missing
+    :param has_literal: boolean mask, True where a literal number is present
+    """
+    missing_literal = ~np.asarray(has_literal, dtype=bool)
+    literal_numbers = np.where(missing_literal, 0, literal_numbers)
+
+    # lexsort uses the last key as the primary key
+    return np.lexsort((literal_numbers, missing_literal, retire_days, hire_days))
+
+
+def sort_pilots(pilots: t.Iterable["Pilot"]) -> t.List["Pilot"]:
+    """
+    Return a list of pilots sorted by seniority, the same as `sorted(pilots)`.
+
+    Falls back to a key sort when literal seniority numbers are not all integers.
+    """
+    pilots = list(pilots)
+
+    literals = [p.literal_seniority_number for p in pilots]
+
+    if not all(lit is None or isinstance(lit, (int, np.integer)) for lit in literals):
+        return sorted(pilots, key=seniority_sort_key)
+
+    size = len(pilots)
+
+    hire_days = np.fromiter((p.hire_date.toordinal() for p in pilots), np.int64, size)
+    retire_days = np.fromiter(
+        (p.retire_date.toordinal() for p in pilots), np.int64, size
+    )
+    has_literal = np.fromiter((lit is not None for lit in literals), bool, size)
+    literal_numbers = np.fromiter(
+        (0 if lit is None else lit for lit in literals), np.int64, size
+    )
+
+    order = seniority_order(hire_days, retire_days, literal_numbers, has_literal)
+
+    return [pilots[i] for i in order]
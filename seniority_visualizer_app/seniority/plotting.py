@@ -10,7 +10,7 @@ from dateutil.relativedelta import relativedelta as rel_del
 from seniority_visualizer_app.utils import cast_date, DateCastable
 from .utils import standardize_employee_id
 from .entities import SeniorityList
-from .statistics import calculate_seniority_list_span
+from .statistics import calculate_seniority_list_span, make_date_grid
 
 
 # todo: remove this in favor of statistics version
@@ -21,18 +21,12 @@ def generate_date_indices(
     Yield a series of date objects from start to end (inclusive)
     """
     start_date = cast_date(start)
-    end_date = cast_date(end)
+    end_date = max(start_date, cast_date(end))
+    step = rel_del(months=1)
 
-    date_idx = start_date
+    dates = [d.date() for d in make_date_grid(start_date, end_date, freq=step)]
 
-    yield date_idx
+    yield from dates
 
-    while True:
-        date_idx += rel_del(months=1)
-        if date_idx <= end_date:
-            yield date_idx
-            continue
-        if yield_overflow:
-            yield date_idx
-            break
-        break
+    if yield_overflow:
+        yield dates[-1] + step
@@ -1,3 +1,5 @@
+from bisect import bisect_left, bisect_right
+from datetime import datetime
 import uuid
 import typing as t
 
@@ -9,6 +11,17 @@ class ICsvRepo:
         raise NotImplementedError()
 
     def get_all(self) -> t.Iterable[CsvRecord]:
+        """Return every record, ordered by published date"""
+        raise NotImplementedError()
+
+    def most_recent(self) -> t.Optional[CsvRecord]:
+        """Return the record published last, None if there are none"""
+        raise NotImplementedError()
+
+    def get_range(
+        self, start: t.Optional[datetime] = None, end: t.Optional[datetime] = None
+    ) -> t.List[CsvRecord]:
+        """Return the records published from `start` up to but excluding `end`"""
         raise NotImplementedError()
 
     def save(self, record: CsvRecord) -> uuid.UUID:
@@ -16,8 +29,19 @@ class ICsvRepo:
 
 
 class CsvRepoInMemory(ICsvRepo):
+    """
+    Records held in memory, indexed by id and kept in published order, so lookups
+    by id, the most recent record and ranges of published dates need no scan or
+    sort. Records must not have their published date changed once saved.
+    """
+
     def __init__(self, records: t.Optional[t.Iterable[CsvRecord]] = None):
-        self._records = list(records) if records is not None else []
+        self._by_id: t.Dict[uuid.UUID, CsvRecord] = {}
+        self._records: t.List[CsvRecord] = []
+        self._published: t.List[datetime] = []
+
+        for record in records if records is not None else []:
+            self.save(record, overwrite=True)
 
     def __repr__(self):
         s = f"<{type(self).__name__}(records: {len(self._records)})>"
@@ -32,16 +56,23 @@ class CsvRepoInMemory(ICsvRepo):
         if not isinstance(id, uuid.UUID):
             id = uuid.UUID(str(id))
 
-        for rec in self._records:
-            if rec.id == id:
-                return rec
-        raise ValueError(f"no record with id: {id}")
+        try:
+            return self._by_id[id]
+        except KeyError:
+            raise ValueError(f"no record with id: {id}")
 
     def get_all(self) -> t.List[CsvRecord]:
-        def key(rec: CsvRecord):
-            return rec.published
+        return self._records.copy()
+
+    def most_recent(self) -> t.Optional[CsvRecord]:
+        return self._records[-1] if self._records else None
 
-        return sorted(self._records.copy(), key=key)
+    def get_range(
+        self, start: t.Optional[datetime] = None, end: t.Optional[datetime] = None
+    ) -> t.List[CsvRecord]:
+        first = 0 if start is None else bisect_left(self._published, start)
+        last = len(self._records) if end is None else bisect_left(self._published, end)
+        return self._records[first:last]
 
     def save(self, record: CsvRecord, overwrite=False) -> uuid.UUID:
         """
@@ -56,11 +87,28 @@ class CsvRepoInMemory(ICsvRepo):
         try:
             existing_record = self.get(record.id)
         except ValueError:  # no record exists, save the new one
-            self._records.append(record)
+            self._insert(record)
             return record.id
         else:  # record exists, check overwrite
             if overwrite:
-                self._records.remove(existing_record)
-                self._records.append(record)
+                self._remove(existing_record)
+                self._insert(record)
                 return record.id
             raise ValueError(f"record already exists with id: {existing_record.id}")
+
+    def _insert(self, record: CsvRecord):
+        """Index `record`, after any others published at the same time"""
+        position = bisect_right(self._published, record.published)
+
+        self._records.insert(position, record)
+        self._published.insert(position, record.published)
+        self._by_id[record.id] = record
+
+    def _remove(self, record: CsvRecord):
+        position = bisect_left(self._published, record.published)
+        while self._records[position] is not record:
+            position += 1
+
+        del self._records[position]
+        del self._published[position]
+        del self._by_id[record.id]
@@ -0,0 +1,225 @@
+"""
+Module containing the hiring scenarios used to project the size of the pilot group.
+
+New hires are junior to every pilot already on a list, so a hiring scenario never
+changes anyone's seniority number. It only changes the number of active pilots, and
+with it every pilot's percentage in the company. A scenario is applied to a whole
+:class:`SeniorityTrajectory` at once and the projections of the most recently used
+scenarios are cached.
+
+Scenarios are parsed from short strings, used by the views' `scenario` argument:
+
+    * ``none``: no hiring, the group shrinks with every retirement
+    * ``fixed`` or ``fixed:<headcount>``: one hire per retirement, holding the group
+      at its published size or at `headcount`
+    * ``growth:<rate>``: grow the group by `rate` per year, as a fraction (``0.03``)
+      or a percentage (``3%``), greater than -100%
+    * ``classes:<date>=<count>,...``: hire classes of `count` pilots on each date
+"""
+from __future__ import annotations
+from collections import OrderedDict
+from datetime import date
+import typing as t
+import weakref
+
+import numpy as np
+import pandas as pd
+
+from seniority_visualizer_app.utils import cast_date
+from .trajectory import RETIRED, SeniorityTrajectory
+
+DEFAULT_SCENARIO = "none"
+
+#: projections cached per trajectory, the least recently used is dropped first
+SCENARIO_CACHE_SIZE = 8
+
+
+class NoHiring(t.NamedTuple):
+    """No new hires, the group shrinks with every retirement"""
+
+    def active_counts(self, trajectory: SeniorityTrajectory) -> np.ndarray:
+        return np.asarray(trajectory.active_counts, dtype=np.int64)
+
+    def __str__(self):
+        return "none"
+
+
+class FixedHeadcount(t.NamedTuple):
+    """
+    One hire per retirement, holding the group at `headcount` [default: the
+    published size of the list]
+    """
+
+    headcount: t.Optional[int] = None
+
+    def active_counts(self, trajectory: SeniorityTrajectory) -> np.ndarray:
+        target = len(trajectory) if self.headcount is None else self.headcount
+        return _at_least_remaining(trajectory, np.full(len(trajectory.dates), target))
+
+    def __str__(self):
+        return "fixed" if self.headcount is None else f"fixed:{self.headcount}"
+
+
+class PercentGrowth(t.NamedTuple):
+    """Grow the group, from its published size, by `rate` (a fraction) per year"""
+
+    rate: float
+
+    def active_counts(self, trajectory: SeniorityTrajectory) -> np.ndarray:
+        days = trajectory.dates.to_numpy().astype("datetime64[D]")
+        years = (days - days[:1]).astype(np.int64) / 365.25
+        target = np.floor(len(trajectory) * (1 + self.rate) ** years)
+        return _at_least_remaining(trajectory, target.astype(np.int64))
+
+    def __str__(self):
+        return f"growth:{self.rate:g}"
+
+
+class HireClasses(t.NamedTuple):
+    """Hire classes of `count` pilots on each date, as (date, count) pairs"""
+
+    classes: t.Tuple[t.Tuple[date, int], ...]
+
+    def active_counts(self, trajectory: SeniorityTrajectory) -> np.ndarray:
+        hire_days = np.array([d for d, _ in self.classes], dtype="datetime64[D]")
+        counts = np.array([c for _, c in self.classes], dtype=np.int64)
+
+        order = np.argsort(hire_days, kind="stable")
+        hired = np.concatenate([[0], np.cumsum(counts[order])])
+
+        grid_days = trajectory.dates.to_numpy().astype("datetime64[D]")
+        on_date = hired[np.searchsorted(hire_days[order], grid_days, side="right")]
+
+        return np.asarray(trajectory.active_counts, dtype=np.int64) + on_date
+
+    def __str__(self):
+        classes = ",".join(f"{d.isoformat()}={c}" for d, c in self.classes)
+        return f"classes:{classes}"
+
+
+HiringScenario = t.Union[NoHiring, FixedHeadcount, PercentGrowth, HireClasses]
+
+
+def _at_least_remaining(
+    trajectory: SeniorityTrajectory, target: np.ndarray
+) -> np.ndarray:
+    """Return `target`, raised to the pilots still on the list; no one is furloughed"""
+    return np.maximum(target, trajectory.active_counts).astype(np.int64)
+
+
+def parse_scenario(spec: t.Optional[str]) -> HiringScenario:
+    """
+    Return the `HiringScenario` described by `spec` [default: `DEFAULT_SCENARIO`],
+    see the module docstring for the format.
+
+    :raise ValueError: if `spec` is not a valid scenario
+    """
+    spec = (spec or DEFAULT_SCENARIO).strip().lower()
+    kind, _, arg = spec.partition(":")
+
+    try:
+        if kind == "none" and not arg:
+            return NoHiring()
+
+        if kind == "fixed":
+            headcount = int(arg) if arg else None
+            if headcount is not None and headcount < 0:
+                raise ValueError("headcount must not be negative")
+            return FixedHeadcount(headcount)
+
+        if kind == "growth" and arg:
+            rate = float(arg[:-1]) / 100 if arg.endswith("%") else float(arg)
+            if not (np.isfinite(rate) and rate > -1):
+                raise ValueError("growth rate must be finite and greater than -100%")
+            return PercentGrowth(rate)
+
+        if kind == "classes" and arg:
+            classes = []
+            for item in arg.split(","):
+                day, _, count = item.partition("=")
+                classes.append((cast_date(day.strip()), int(count)))
+            return HireClasses(tuple(sorted(classes)))
+
+    except (TypeError, ValueError) as e:
+        raise ValueError(f"invalid scenario {spec!r}: {e}") from e
+
+    raise ValueError(f"invalid scenario {spec!r}")
+
+
+class ScenarioProjection:
+    """
+    Active pilot counts of a trajectory under a hiring scenario, and from them the
+    percentage in company of any pilot. Only the counts are kept, one per date, so
+    a cached projection holds no per pilot data; a pilot's percentages are worked
+    out from their row of the trajectory when asked for.
+
+    :param trajectory: seniority trajectory of the list
+    :param scenario: hiring scenario to apply
+    """
+
+    def __init__(self, trajectory: SeniorityTrajectory, scenario: HiringScenario):
+        self.trajectory = trajectory
+        self.scenario = scenario
+
+        self.active_counts: np.ndarray = scenario.active_counts(trajectory)
+        self.active_counts.flags.writeable = False
+
+    def __repr__(self):
+        s = f"<{type(self).__name__}(scenario: {self.scenario}, len: {len(self)})>"
+        return s
+
+    def __len__(self):
+        return len(self.trajectory)
+
+    @property
+    def dates(self) -> pd.DatetimeIndex:
+        return self.trajectory.dates
+
+    def active_series(self) -> pd.Series:
+        """Return the number of active pilots indexed by date"""
+        return pd.Series(self.active_counts, index=self.dates, name="active")
+
+    def percentiles_for(self, employee_id: t.Any) -> np.ndarray:
+        """Return a pilot's percentage in company on each date, NaN once retired"""
+        held = self.trajectory.numbers_for(employee_id)
+
+        numbers = held.astype(float)
+        numbers[held == RETIRED] = np.nan
+
+        with np.errstate(divide="ignore", invalid="ignore"):
+            return (1 - (numbers - 1) / self.active_counts) * 100
+
+    def percentile_series(self, employee_id: t.Any) -> pd.Series:
+        """Return a pilot's percentage in company indexed by date, NaN once retired"""
+        return pd.Series(
+            self.percentiles_for(employee_id), index=self.dates, name="pct"
+        )
+
+
+_projections: weakref.WeakKeyDictionary = weakref.WeakKeyDictionary()
+
+
+def project_scenario(
+    trajectory: SeniorityTrajectory, scenario: t.Union[HiringScenario, str, None]
+) -> ScenarioProjection:
+    """
+    Return the `ScenarioProjection` of `scenario` (a scenario or a spec for
+    :func:`parse_scenario`), cached per trajectory for the `SCENARIO_CACHE_SIZE`
+    most recently used scenarios
+    """
+    if scenario is None or isinstance(scenario, str):
+        scenario = parse_scenario(scenario)
+
+    cached = _projections.setdefault(trajectory, OrderedDict())
+
+    # scenarios are tuples, so the type is part of the key: fixed:5 == growth:5
+    key = (type(scenario), scenario)
+    if key in cached:
+        cached.move_to_end(key)
+        return cached[key]
+
+    projection = cached[key] = ScenarioProjection(trajectory, scenario)
+    while len(cached) > SCENARIO_CACHE_SIZE:
+        cached.popitem(last=False)
+
+    return projection
@@ -1,4 +1,5 @@
 from datetime import datetime, date
+from functools import lru_cache
 from typing import Optional, Iterator, Tuple, Union
 import typing as t
 from dateutil.relativedelta import relativedelta
@@ -9,9 +10,17 @@ import numpy as np
 
 from seniority_visualizer_app.seniority.entities import Pilot, SeniorityList
 from . import data_objects as do
-from .dataframe import STANDARD_FIELDS as FIELDS, require_fields
+from .dataframe import (
+    STANDARD_FIELDS as FIELDS,
+    SeniorityFrame,
+    _cached_for_frame,
+    require_fields,
+)
 from .exceptions import CalculationError
 
+if t.TYPE_CHECKING:
+    from .trajectory import SeniorityTrajectory
+
 logger = logging.getLogger(__name__)
 
 DateLike = t.Union[date, pd.Timestamp]
@@ -47,6 +56,9 @@ def iter_seniority_over_time(
     """
     Yield Tuple[datetime, seniority_number, total_active] for a given pilot over a time series.
 
+    Active counts come from sweeping the sorted hire and retire events once rather than
+    filtering the list at every step.
+
     :param sen_list: SeniorityList instance to run calculation over
     :param pilot: Pilot object to yield seniority information about
     :param start: first date to yield data for [default: earliest hire date]
@@ -73,33 +85,68 @@ def iter_seniority_over_time(
     if not explicit_start < explicit_end:
         raise ValueError("somehow start >= end")
 
-    starting_pilots = sorted(sen_list.pilot_data)
+    sorted_pilots = sen_list.sorted_pilot_data
 
-    for p in starting_pilots:
+    for rank, p in enumerate(sorted_pilots):
         if p.employee_id == pilot.employee_id:
             target_pilot = p
             break
     else:
         raise ValueError(f"{pilot} not in {sen_list}")
 
+    index = sen_list.interval_index
+    all_active = _ActiveCountSweep(index.hire_by_rank, index.retire_by_rank)
+    senior_active = _ActiveCountSweep(
+        index.hire_by_rank[:rank], index.retire_by_rank[:rank]
+    )
+
     date_index = explicit_start
     stop = explicit_end
 
-    current_pilots = starting_pilots
+    # the first step reports against the whole list, active or not
+    yield date_index, rank + 1, len(sorted_pilots)
+
+    date_index += delta
 
     while date_index <= stop:
-        try:
-            current_seniority_number: Optional[int] = current_pilots.index(
-                target_pilot
-            ) + 1
-        except ValueError:
+        total_active = all_active.advance_to(date_index)
+
+        if target_pilot.is_active_on(date_index):
+            current_seniority_number: Optional[int] = (
+                senior_active.advance_to(date_index) + 1
+            )
+        else:
             current_seniority_number = None
 
-        yield date_index, current_seniority_number, len(current_pilots)
+        yield date_index, current_seniority_number, total_active
 
         date_index += delta
 
-        current_pilots = [p for p in starting_pilots if p.is_active_on(date_index)]
+
+class _ActiveCountSweep:
+    """
+    Running count of the employment intervals active on a date. Dates passed to
+    `advance_to` must never decrease, each hire and retirement event is walked
+    past exactly once.
+    """
+
+    def __init__(self, hire_days: np.ndarray, retire_days: np.ndarray):
+        valid = hire_days < retire_days
+        self._hires: t.List[date] = np.sort(hire_days[valid]).tolist()
+        self._retires: t.List[date] = np.sort(retire_days[valid]).tolist()
+        self._hired = 0
+        self._retired = 0
+
+    def advance_to(self, day: date) -> int:
+        """Return the number of intervals active on `day`"""
+        hires, retires = self._hires, self._retires
+
+        while self._hired < len(hires) and hires[self._hired] <= day:
+            self._hired += 1
+        while self._retired < len(retires) and retires[self._retired] <= day:
+            self._retired += 1
+
+        return self._hired - self._retired
 
 
 def calculate_pilot_seniority_statistics(
@@ -133,27 +180,162 @@ def make_seniority_plot_date_index(
         first_date = pin_to_first_day(first_date)
         last_date = ffwd_and_pin(last_date)
 
-    dates = pd.date_range(start=first_date, end=last_date, freq="D")
+    return make_date_grid(first_date, last_date, freq=freq)
 
-    day_filter = {
-        "D": lambda d: True,
-        "M": lambda d: d.day == min(first_date.day, 28),
-    }.get(freq, "M")
 
-    return dates[dates.map(day_filter)]
+DateStep = t.Union[str, relativedelta]
 
+GRID_MONTH_STEPS = {"M": 1, "Q": 3, "Y": 12}
 
-def make_pilots_remaining_series(
-    df: pd.DataFrame, index: pd.DatetimeIndex, name: str = "retirements"
-) -> pd.Series:
-    out = []
 
-    retire_dates = df[FIELDS.RETIRE_DATE]
+def make_date_grid(
+    start: DateLike, end: DateLike, freq: DateStep = "M", pin_to_first: bool = False
+) -> pd.DatetimeIndex:
+    """
+    Return a DatetimeIndex of dates from `start` to `end` (inclusive) generated
+    directly at the grid frequency. Grids are cached per (start, end, freq).
+
+    Frequencies:
+
+        * "D": every day
+        * "M", "Q", "Y": every 1, 3 or 12 months on the day of `start` (capped to
+          the 28th so every month has it)
+        * a :py:func:`relativedelta`: repeatedly adding the step to `start`, the same
+          as `date += step` in a loop
+
+    :param pin_to_first: pin `start` with :func:`pin_to_first_day` and `end` with
+    :func:`ffwd_and_pin` before building the grid
+    """
+    if pin_to_first:
+        start = pin_to_first_day(start)
+        end = ffwd_and_pin(end)
+
+    return _make_date_grid(pd.Timestamp(start), pd.Timestamp(end), freq)
+
+
+@lru_cache(maxsize=128)
+def _make_date_grid(
+    start: pd.Timestamp, end: pd.Timestamp, freq: DateStep
+) -> pd.DatetimeIndex:
+    if isinstance(freq, relativedelta):
+        return _make_stepped_grid(start, end, freq)
+
+    if freq == "D":
+        return pd.date_range(start=start, end=end, freq="D")
+
+    if freq not in GRID_MONTH_STEPS:
+        raise ValueError(f"unsupported date grid frequency: {freq}")
+
+    day = min(start.day, 28)
+    first_month = _month_number(start) + (1 if start.day > day else 0)
+    months = np.arange(first_month, _month_number(end) + 1, GRID_MONTH_STEPS[freq])
+
+    return _to_grid_index(months, day - 1, start, end)
+
+
+def _make_stepped_grid(
+    start: pd.Timestamp, end: pd.Timestamp, step: relativedelta
+) -> pd.DatetimeIndex:
+    total_months = step.years * 12 + step.months
+
+    if not step == relativedelta(months=total_months):
+        dates = []
+        cur = start
+        while cur <= end:
+            dates.append(cur)
+            nxt = cur + step
+            if not nxt > cur:
+                raise ValueError(f"date grid step must move forward: {step}")
+            cur = nxt
+        return pd.DatetimeIndex(dates)
+
+    if total_months <= 0:
+        raise ValueError(f"date grid step must move forward: {step}")
+
+    # adding whole months keeps the day, capped by the shortest month passed so far
+    months = np.arange(_month_number(start), _month_number(end) + 1, total_months)
+    month_starts = months.astype("datetime64[M]").astype("datetime64[D]")
+    month_lengths = (months + 1).astype("datetime64[M]").astype("datetime64[D]")
+    month_lengths = (month_lengths - month_starts).astype(int)
+    days = np.minimum.accumulate(np.minimum(month_lengths, start.day))
+
+    return _to_grid_index(months, days - 1, start, end)
+
+
+def _month_number(timestamp: pd.Timestamp) -> int:
+    """Return months since 1970-01, the datetime64[M] epoch"""
+    return (timestamp.year - 1970) * 12 + timestamp.month - 1
+
+
+def _to_grid_index(
+    months: np.ndarray, day_offsets: t.Any, start: pd.Timestamp, end: pd.Timestamp
+) -> pd.DatetimeIndex:
+    days = months.astype("datetime64[M]").astype("datetime64[D]") + day_offsets
+    grid = pd.DatetimeIndex(days) + (start - start.normalize())
+
+    return grid[grid <= end]
+
+
+class RemainingPilotCounter:
+    """
+    Sorted retire dates answering how many pilots remain, ie retire strictly after,
+    any number of dates with a single binary search.
+    """
+
+    def __init__(self, retire_dates: t.Iterable[DateLike]):
+        dates = pd.to_datetime(pd.Series(retire_dates)).to_numpy(dtype="datetime64[ns]")
+        dates = np.sort(dates[~np.isnat(dates)])
+        dates.flags.writeable = False
+
+        self.retire_dates: np.ndarray = dates
+
+    def __repr__(self):
+        s = f"<{type(self).__name__}(len: {len(self)})>"
+        return s
+
+    @classmethod
+    def from_sorted(cls, retire_dates: np.ndarray) -> "RemainingPilotCounter":
+        """Return a counter of datetime64[ns] `retire_dates` already sorted"""
+        counter = cls.__new__(cls)
+        counter.retire_dates = retire_dates
+        return counter
+
+    def __len__(self):
+        return self.retire_dates.size
+
+    def count_on(self, dates: DateSeries) -> np.ndarray:
+        """Return the number of pilots remaining on each of `dates`"""
+        ref_dates = pd.DatetimeIndex(dates).to_numpy(dtype="datetime64[ns]")
+
+        return self.retire_dates.size - np.searchsorted(
+            self.retire_dates, ref_dates, side="right"
+        )
+
+    def count_on_date(self, date_: DateLike) -> int:
+        """Return the number of pilots remaining on `date_`"""
+        return int(self.count_on([date_])[0])
+
 
-    for date_ in index:
-        active = retire_dates[retire_dates > date_]
+@require_fields(FIELDS.RETIRE_DATE)
+def get_remaining_pilot_counter(df: pd.DataFrame) -> RemainingPilotCounter:
+    """
+    Return the `RemainingPilotCounter` for the retire dates of `df`, cached if it is
+    a `SeniorityFrame`
+    """
+
+    def build(frame: pd.DataFrame) -> RemainingPilotCounter:
+        if isinstance(frame, SeniorityFrame):
+            return RemainingPilotCounter.from_sorted(frame.sorted_retire_dates)
+        return RemainingPilotCounter(frame[FIELDS.RETIRE_DATE])
+
+    return _cached_for_frame(df, "remaining", build)
 
-        out.append(active.size)
+
+def make_pilots_remaining_series(
+    df: pd.DataFrame, index: pd.DatetimeIndex, name: str = "retirements"
+) -> pd.Series:
+    """Return a Series of the number of pilots remaining on each date of `index`"""
+    out = get_remaining_pilot_counter(df).count_on(index)
 
     return pd.Series(data=out, index=index, dtype=int, name=name)
 
@@ -196,6 +378,117 @@ def calculate_retirements_over_time(
     return list(data)
 
 
+class MonthlyRetirements:
+    """
+    Retirements bucketed by calendar month with `np.bincount`. Counts over any span
+    of months and rolling means of any width come from prefix sums.
+
+    :param retire_dates: retire date of every pilot, missing dates are never counted
+    """
+
+    def __init__(self, retire_dates: t.Iterable[DateLike]):
+        dates = pd.to_datetime(pd.Series(retire_dates)).to_numpy(dtype="datetime64[ns]")
+
+        self.total_pilots: int = dates.size
+
+        months = dates[~np.isnat(dates)].astype("datetime64[M]").astype(np.int64)
+
+        if months.size:
+            self.first_month: np.datetime64 = np.datetime64(int(months.min()), "M")
+            counts = np.bincount(months - months.min())
+        else:
+            self.first_month = np.datetime64("1970-01", "M")
+            counts = np.zeros(0, dtype=np.int64)
+
+        self.counts: np.ndarray = counts
+        self._prefix: np.ndarray = np.concatenate([[0], np.cumsum(counts)])
+
+    def __repr__(self):
+        s = f"<{type(self).__name__}(first: {self.first_month}, len: {len(self)})>"
+        return s
+
+    def __len__(self):
+        return self.counts.size
+
+    def _retired_before(self, months: np.ndarray) -> np.ndarray:
+        """Return the number of retirements before the start of each month"""
+        offsets = (months - self.first_month).astype(np.int64)
+        return self._prefix[np.clip(offsets, 0, self.counts.size)]
+
+    def counts_for(self, months: t.Iterable[t.Any]) -> np.ndarray:
+        """Return the number of retirements in each calendar month of `months`"""
+        months = np.asarray(months, dtype="datetime64[M]")
+        return self._retired_before(months + 1) - self._retired_before(months)
+
+    def make_frame(
+        self, start: DateLike, end: DateLike, rolling_periods: int = 6
+    ) -> pd.DataFrame:
+        """
+        Return a DataFrame indexed by the month starts from `start` up to `end`, with
+        the columns:
+
+            * retirements: retirements within the month
+            * rolling: mean retirements over the last `rolling_periods` months, NaN
+              until that many months are in the frame
+            * remaining: pilots left after the month's retirements, counting from
+              the whole list at the first month
+
+        Months are calendar months, bounded at midnight, the same as
+        `pd.interval_range(start, end, freq="MS")` for a `start` at midnight. The
+        time of day of `start` is ignored: a list published on the first of a month
+        starts with that month, and a retirement on the first of a month is counted
+        in that month. `pd.interval_range` carries the time of `start` into every
+        boundary, counting those retirements in the month before.
+        """
+        start, end = pd.Timestamp(start).normalize(), pd.Timestamp(end)
+
+        first = np.datetime64(start, "M")
+        if pd.Timestamp(first) < start:
+            first += 1
+        last = np.datetime64(end, "M")
+
+        months = np.arange(first, max(first, last))
+
+        retirements = self.counts_for(months)
+
+        window_prefix = np.concatenate([[0], np.cumsum(retirements)])
+
+        rolling = np.full(months.size, np.nan)
+        if 0 < rolling_periods <= months.size:
+            rolling[rolling_periods - 1 :] = (
+                window_prefix[rolling_periods:] - window_prefix[:-rolling_periods]
+            ) / rolling_periods
+
+        return pd.DataFrame(
+            data=dict(
+                retirements=retirements,
+                rolling=rolling,
+                remaining=self.total_pilots - window_prefix[1:],
+            ),
+            index=pd.DatetimeIndex(months.astype("datetime64[ns]"), name="date"),
+        )
+
+
+def calculate_retirements_by_month(
+    retire_dates: t.Iterable[DateLike],
+) -> MonthlyRetirements:
+    """Return the retirements of a list bucketed by calendar month"""
+    return MonthlyRetirements(retire_dates)
+
+
+@require_fields(FIELDS.RETIRE_DATE)
+def get_monthly_retirements(df: pd.DataFrame) -> MonthlyRetirements:
+    """
+    Return the `MonthlyRetirements` for the retire dates of `df`, cached if it is a
+    `SeniorityFrame`
+    """
+    return _cached_for_frame(
+        df,
+        "monthly_retirements",
+        lambda frame: MonthlyRetirements(frame[FIELDS.RETIRE_DATE]),
+    )
+
+
 @require_fields(FIELDS.RETIRE_DATE, FIELDS.SENIORITY_NUMBER, FIELDS.EMPLOYEE_ID)
 def calculate_number_of_active_senior_pilots_for_dates(
     df: pd.DataFrame, date_series: DateSeries, employee_id: str
@@ -213,31 +506,132 @@ def calculate_number_of_active_senior_pilots_for_dates(
     :raise ValueError: if record does not exist for `employee_id`
     """
 
-    def senior_filter(sen_num: int, ref_date: str):
-        def _senior(ds: pd.Series):
-            return ds[
-                (ds[F.SENIORITY_NUMBER] < sen_num) & (df[F.RETIRE_DATE] > ref_date)
-            ]
-
-        return _senior
-
     F = FIELDS
 
-    target_info = df[df[F.EMPLOYEE_ID] == employee_id]
+    if isinstance(df, SeniorityFrame):
+        target_record = df.record_for(employee_id)
+        senior_retire_dates = df[F.RETIRE_DATE].to_numpy()[
+            df.rows_senior_to(target_record[F.SENIORITY_NUMBER])
+        ]
+    else:
+        target_info = df[df[F.EMPLOYEE_ID] == employee_id]
+
+        if target_info.shape[0] == 0:
+            raise ValueError(f"no record with {F.EMPLOYEE_ID} == {employee_id}")
 
-    if target_info.shape[0] == 0:
-        raise ValueError(f"no record with {F.EMPLOYEE_ID} == {employee_id}")
+        target_record = target_info.iloc[0]
 
-    target_record = target_info.iloc[0]
+        senior_retire_dates = df.loc[
+            df[F.SENIORITY_NUMBER] < target_record[F.SENIORITY_NUMBER], F.RETIRE_DATE
+        ]
 
-    target_sen_num = target_record[F.SENIORITY_NUMBER]
+    seniors = RemainingPilotCounter(senior_retire_dates)
 
     data = pd.DataFrame(index=date_series)
 
-    data["seniority_on_date"] = data.index.map(
-        lambda d: senior_filter(target_sen_num, d)(df).shape[0]
-    )
+    data["seniority_on_date"] = seniors.count_on(data.index)
 
     data[data.index > target_record[F.RETIRE_DATE]] = float("nan")
 
     return data["seniority_on_date"].to_list()
+
+
+def _seniority_thresholds(
+    trajectory: "SeniorityTrajectory",
+    number: Optional[int],
+    percentile: Optional[float],
+    pinned: bool,
+) -> np.ndarray:
+    """
+    Return the largest seniority number meeting the target on each date of
+    `trajectory`, for either an absolute `number` or a `percentile` in company
+    (100 being the most senior, as in the pilot plot)
+    """
+    periods = len(trajectory.dates)
+
+    if number is not None and percentile is None:
+        return np.full(periods, number, dtype=float)
+
+    if number is not None or percentile is None:
+        raise ValueError("give one of number or percentile")
+
+    if not 0 <= percentile <= 100:
+        raise ValueError("percentile must be within [0, 100]")
+
+    active = np.full(periods, len(trajectory)) if pinned else trajectory.active_counts
+
+    # percentile = (1 - (number - 1) / active) * 100
+    return 1 + active * (1 - percentile / 100)
+
+
+def calculate_date_reaching_seniority(
+    trajectory: "SeniorityTrajectory",
+    employee_id: str,
+    number: Optional[int] = None,
+    percentile: Optional[float] = None,
+    pinned: bool = False,
+) -> Optional[pd.Timestamp]:
+    """
+    Return the first date of `trajectory` on which a pilot holds seniority `number`
+    or better, or is at or above `percentile` in company, None if they never do.
+
+    A pilot's number never worsens, so an absolute number (and a percentile of a
+    `pinned` group, which is an absolute number) is a binary search over the dates
+    the pilot holds a number. A percentile of the shrinking group is not monotone,
+    so it is the first date meeting the target.
+
+    :param trajectory: :class:`.trajectory.SeniorityTrajectory` of the list
+    :param employee_id: employee id of the pilot
+    :param number: target seniority number
+    :param percentile: target percentage in company, 100 being the most senior
+    :param pinned: hold the group at its published size for percentiles
+
+    :raise ValueError: if the pilot is not on the list or the target is invalid
+    """
+    thresholds = _seniority_thresholds(trajectory, number, percentile, pinned)
+    numbers = trajectory.numbers_for(employee_id)
+
+    # dates the pilot holds a number are a prefix of the grid
+    held = int(np.count_nonzero(numbers))
+
+    if number is not None or pinned:
+        j = int(np.searchsorted(-numbers[:held], -thresholds[0], side="left"))
+    else:
+        meets = numbers[:held] <= thresholds[:held]
+        j = int(np.argmax(meets)) if meets.any() else held
+
+    return trajectory.dates[j] if j < held else None
+
+
+def calculate_dates_reaching_seniority(
+    trajectory: "SeniorityTrajectory",
+    number: Optional[int] = None,
+    percentile: Optional[float] = None,
+    pinned: bool = False,
+    employee_ids: Optional[t.Iterable[str]] = None,
+) -> pd.Series:
+    """
+    Return :func:`calculate_date_reaching_seniority` for many pilots at once as a
+    Series of dates indexed by employee id, NaT for pilots who never reach it.
+
+    :param employee_ids: pilots to evaluate [default: all, in seniority order]
+    """
+    thresholds = _seniority_thresholds(trajectory, number, percentile, pinned)
+
+    if employee_ids is None:
+        ids = trajectory.employee_ids
+        numbers = trajectory.matrix
+    else:
+        ids = np.asarray([str(e) for e in employee_ids], dtype=object)
+        numbers = trajectory.matrix[[trajectory.row_for(e) for e in ids]]
+
+    # a retired pilot holds no number, 0, which would otherwise meet every target
+    meets = (numbers <= thresholds[None, :]) & (numbers != 0)
+
+    first = np.argmax(meets, axis=1)
+    reached = meets[np.arange(len(ids)), first]
+
+    dates = trajectory.dates[first].to_numpy().copy()
+    dates[~reached] = np.datetime64("NaT")
+
+    return pd.Series(dates, index=pd.Index(ids, name=FIELDS.EMPLOYEE_ID), name="date")
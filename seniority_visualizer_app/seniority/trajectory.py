@@ -0,0 +1,189 @@
+"""
+Module containing the seniority trajectory of every pilot on a published list.
+
+The trajectory is an n x T int32 matrix holding the seniority number of every pilot
+(rows, in seniority order) on every date of a grid (columns). Ranks only improve as
+senior pilots retire, so each column is the previous column less the number of
+seniors who retired in between, and the whole matrix is built in one pass over the
+grid instead of one DataFrame scan per pilot.
+"""
+from __future__ import annotations
+import typing as t
+
+import numpy as np
+import pandas as pd
+
+from . import statistics as stat
+from .dataframe import STANDARD_FIELDS as FIELDS, _cached_for_frame, require_fields
+
+#: value held in the matrix once a pilot has retired
+RETIRED = 0
+
+
+class SeniorityTrajectory:
+    """
+    Seniority numbers of every pilot on every date of a grid.
+
+    A pilot keeps their number up to and including their retire date and is
+    `RETIRED` after it. Seniors are counted while `retire_date > date`, the same as
+    :func:`statistics.calculate_number_of_active_senior_pilots_for_dates`.
+    `active_counts` holds the number of pilots with `retire_date > date` on each
+    date, the denominator of :meth:`percentile_series`.
+
+    :param employee_ids: employee id of every pilot
+    :param seniority_numbers: seniority number of every pilot, any order
+    :param retire_dates: retire date of every pilot
+    :param dates: the date grid, sorted ascending
+    """
+
+    def __init__(
+        self,
+        employee_ids: t.Iterable[t.Any],
+        seniority_numbers: t.Iterable[t.Any],
+        retire_dates: t.Iterable[t.Any],
+        dates: stat.DateSeries,
+    ):
+        ids = np.asarray([str(e) for e in employee_ids], dtype=object)
+        numbers = np.asarray(seniority_numbers)
+        retire = pd.to_datetime(pd.Series(retire_dates)).to_numpy(
+            dtype="datetime64[ns]"
+        )
+        grid = pd.DatetimeIndex(dates)
+
+        if not len(ids) == len(numbers) == len(retire):
+            raise ValueError("all pilot columns must be the same length")
+
+        if not grid.is_monotonic_increasing:
+            raise ValueError("dates must be sorted ascending")
+
+        order = np.argsort(numbers, kind="stable")
+        ids, retire = ids[order], retire[order]
+
+        self.dates: pd.DatetimeIndex = grid
+        self.employee_ids: np.ndarray = ids
+        self.matrix: np.ndarray = _build_matrix(retire, grid.to_numpy())
+        self.active_counts: np.ndarray = len(ids) - np.searchsorted(
+            np.sort(retire), grid.to_numpy(), side="right"
+        )
+        self._rows: t.Dict[str, int] = {e: i for i, e in enumerate(ids)}
+
+        self.employee_ids.flags.writeable = False
+        self.matrix.flags.writeable = False
+        self.active_counts.flags.writeable = False
+
+    def __repr__(self):
+        n, periods = self.matrix.shape
+        s = f"<{type(self).__name__}(pilots: {n}, dates: {periods})>"
+        return s
+
+    def __len__(self):
+        return self.matrix.shape[0]
+
+    def row_for(self, employee_id: t.Any) -> int:
+        """
+        Return the row of `employee_id`
+
+        :raise ValueError: if `employee_id` is not on the list
+        """
+        try:
+            return self._rows[str(employee_id)]
+        except KeyError:
+            raise ValueError(f"no record with {FIELDS.EMPLOYEE_ID} == {employee_id}")
+
+    def numbers_for(self, employee_id: t.Any) -> np.ndarray:
+        """Return a pilot's (read only) seniority numbers, `RETIRED` once retired"""
+        return self.matrix[self.row_for(employee_id)]
+
+    def seniority_series(self, employee_id: t.Any) -> pd.Series:
+        """Return a pilot's seniority numbers indexed by date, NaN once retired"""
+        numbers = self.numbers_for(employee_id).astype(float)
+        numbers[numbers == RETIRED] = np.nan
+        return pd.Series(numbers, index=self.dates, name=str(employee_id))
+
+    def percentile_series(self, employee_id: t.Any) -> pd.Series:
+        """
+        Return the percentage of active pilots junior to a pilot on each date, NaN
+        once retired
+        """
+        numbers = self.seniority_series(employee_id)
+        return (1 - (numbers - 1) / self.active_counts) * 100
+
+
+def _build_matrix(
+    retire: np.ndarray, grid: np.ndarray, group_starts: t.Optional[np.ndarray] = None
+) -> np.ndarray:
+    """
+    Return the n x T seniority number matrix for pilots in seniority order.
+
+    A pilot stops counting towards the numbers of juniors at the first grid date on
+    or after their retire date, and loses their own number at the first grid date
+    after it. Between two grid dates only the pilots junior to a new retiree move
+    up, so each column is the previous one less the running count of new retirees.
+
+    :param group_starts: for pilots held as contiguous groups (each in seniority
+    order), the row of the first pilot of each pilot's group. Numbers are then
+    within the group: the running count restarts at every group.
+    """
+    n, periods = retire.size, grid.size
+
+    matrix = np.empty((n, periods), dtype=np.int32)
+    if not n or not periods:
+        return matrix
+
+    never = np.isnat(retire)
+    leaves = np.where(never, periods, np.searchsorted(grid, retire, side="left"))
+    retires = np.where(never, periods, np.searchsorted(grid, retire, side="right"))
+
+    # pilots grouped by the column they stop counting towards juniors
+    by_column = np.argsort(leaves, kind="stable")
+    bounds = np.searchsorted(leaves[by_column], np.arange(periods + 1), side="left")
+
+    column = np.arange(1, n + 1, dtype=np.int32)
+    moved = np.zeros(n, dtype=np.int32)
+
+    if group_starts is not None:
+        column -= group_starts.astype(np.int32)
+
+    for j in range(periods):
+        leaving = by_column[bounds[j] : bounds[j + 1]]
+        if leaving.size:
+            moved[:] = 0
+            # positions are unique so a plain fancy assignment is a histogram
+            moved[leaving] = 1
+            seniors_moved = np.cumsum(moved, dtype=np.int32) - moved
+            if group_starts is not None:
+                seniors_moved -= seniors_moved[group_starts]
+            column -= seniors_moved
+        matrix[:, j] = column
+
+    matrix[np.arange(periods)[None, :] >= retires[:, None]] = RETIRED
+
+    return matrix
+
+
+@require_fields(FIELDS.RETIRE_DATE, FIELDS.SENIORITY_NUMBER, FIELDS.EMPLOYEE_ID)
+def build_seniority_trajectory(
+    df: pd.DataFrame, dates: stat.DateSeries
+) -> SeniorityTrajectory:
+    """Return the `SeniorityTrajectory` of every pilot in `df` over `dates`"""
+    return SeniorityTrajectory(
+        df[FIELDS.EMPLOYEE_ID],
+        df[FIELDS.SENIORITY_NUMBER],
+        df[FIELDS.RETIRE_DATE],
+        dates,
+    )
+
+
+@require_fields(FIELDS.RETIRE_DATE, FIELDS.SENIORITY_NUMBER, FIELDS.EMPLOYEE_ID)
+def get_seniority_trajectory(
+    df: pd.DataFrame, dates: pd.DatetimeIndex
+) -> SeniorityTrajectory:
+    """
+    Return the cached `SeniorityTrajectory` of `df` over `dates`, built once per
+    SeniorityFrame and date grid
+    """
+    dates = pd.DatetimeIndex(dates)
+    name = ("trajectory", tuple(dates.asi8))
+    return _cached_for_frame(
+        df, name, lambda frame: build_seniority_trajectory(frame, dates)
+    )
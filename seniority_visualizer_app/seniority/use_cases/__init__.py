@@ -44,20 +44,16 @@ class GetCurrentSeniorityCsv(UseCase):
     def process_request(
         self, request: uc_req.SeniortyFilterRequest
     ) -> t.Union[ResponseSuccess, ResponseFailure]:
-        records = self.repo.get_all()
+        if request.most_recent:
+            record = self.repo.most_recent()
 
-        sorted_records = sorted(records, key=lambda r: r.published, reverse=False)
+            if record is None:
+                return ResponseFailure.build_resource_error("no records in repo")
 
-        if request.most_recent and records:
-            return ResponseSuccess(sorted_records[-1])
+            return ResponseSuccess(record)
 
-        if request.most_recent and not records:
-            return ResponseFailure.build_resource_error("no records in repo")
-
-        if not request.most_recent and records:
-            return ResponseSuccess(list(sorted_records))
-
-        return ResponseSuccess(sorted_records)
+        # the repo keeps its records ordered by published date
+        return ResponseSuccess(list(self.repo.get_all()))
 
 
 class GetCurrentSeniorityListReport(UseCase):
@@ -0,0 +1,163 @@
+"""
+Module containing the validation of a seniority list table before it is loaded.
+
+Every check runs over whole columns at once and every problem found is reported
+with the rows it was found on, so a file can be fixed in one pass rather than one
+failed load at a time.
+"""
+from __future__ import annotations
+import typing as t
+
+import numpy as np
+import pandas as pd
+
+from seniority_visualizer_app.utils import cast_dates
+from .exceptions import DatasourceSchemaError, DatasourceValidationError
+
+#: columns a table must have, after its headers are renamed
+REQUIRED_COLUMNS = (
+    "employee_id",
+    "hire_date",
+    "retire_date",
+    "literal_seniority_number",
+)
+
+#: rows listed per issue by `ValidationReport.__str__`
+LISTED_ROWS = 10
+
+#: row number of the first data row, the header being row 1 as in a spreadsheet
+FIRST_ROW = 2
+
+
+class ValidationIssue(t.NamedTuple):
+    """A problem found in a table, on `rows` numbered as in a spreadsheet"""
+
+    check: str
+    column: t.Optional[str]
+    message: str
+    rows: t.Tuple[int, ...] = ()
+
+    def __str__(self):
+        rows = ", ".join(str(r) for r in self.rows[:LISTED_ROWS])
+        if len(self.rows) > LISTED_ROWS:
+            rows += f" and {len(self.rows) - LISTED_ROWS} more"
+
+        return f"{self.message}" + (f" (rows {rows})" if rows else "")
+
+
+class ValidationReport(t.NamedTuple):
+    """Every `ValidationIssue` found in a table of `total_rows` data rows"""
+
+    total_rows: int
+    issues: t.Tuple[ValidationIssue, ...] = ()
+
+    def __str__(self):
+        if self.ok:
+            return f"{self.total_rows} rows, no issues"
+
+        lines = [f"{self.total_rows} rows, {len(self.issues)} issues:"]
+        lines.extend(f"  {issue}" for issue in self.issues)
+        return "\n".join(lines)
+
+    @property
+    def ok(self) -> bool:
+        return not self.issues
+
+    def raise_for_issues(self) -> None:
+        """
+        :raise DatasourceSchemaError: if a required column is missing
+        :raise DatasourceValidationError: if any other issue was found
+        """
+        if any(issue.check == "missing_column" for issue in self.issues):
+            raise DatasourceSchemaError(str(self))
+        if self.issues:
+            raise DatasourceValidationError(str(self))
+
+
+def validate_pilot_table(df: pd.DataFrame) -> ValidationReport:
+    """
+    Return the `ValidationReport` of a table of strings, as read by
+    :class:`.loader.SeniorityListLoader` with its headers renamed, checking for:
+
+    - missing required columns
+    - missing or duplicate employee ids
+    - unparseable hire and retire dates
+    - retire dates before hire dates
+    - seniority numbers that are not whole numbers, or not increasing down the list
+
+    A blank seniority number is allowed.
+    """
+    missing = [c for c in REQUIRED_COLUMNS if c not in df.columns]
+    if missing:
+        issue = ValidationIssue(
+            "missing_column", None, f"missing required columns: {missing}"
+        )
+        return ValidationReport(len(df), (issue,))
+
+    issues = []
+
+    def flag(check: str, column: str, message: str, mask: np.ndarray):
+        if mask.any():
+            rows = tuple((np.flatnonzero(mask) + FIRST_ROW).tolist())
+            issues.append(ValidationIssue(check, column, message, rows))
+
+    ids = df["employee_id"].astype(str).str.strip()
+    flag("missing_employee_id", "employee_id", "missing employee id", _blank(ids))
+    flag(
+        "duplicate_employee_id",
+        "employee_id",
+        "duplicate employee id",
+        (ids.duplicated(keep=False) & ~_blank(ids)).to_numpy(),
+    )
+
+    dates = {}
+    for column in ("hire_date", "retire_date"):
+        dates[column] = _parse_dates(df[column])
+        flag(
+            "invalid_date",
+            column,
+            f"unparseable {column.replace('_', ' ')}",
+            np.isnat(dates[column]),
+        )
+
+    flag(
+        "retire_before_hire",
+        "retire_date",
+        "retire date before hire date",
+        dates["retire_date"] < dates["hire_date"],
+    )
+
+    raw = df["literal_seniority_number"].astype(str).str.strip()
+    numbers = pd.to_numeric(raw.where(~_blank(raw)), errors="coerce")
+    # loaded as int32, see `columns._literal_column`
+    info = np.iinfo(np.int32)
+    whole = (numbers % 1 == 0) & numbers.between(info.min, info.max)
+    invalid = (numbers.isna() & ~_blank(raw)) | (~whole & numbers.notna())
+    flag(
+        "invalid_seniority_number",
+        "literal_seniority_number",
+        "seniority number is not a whole number in the int32 range",
+        invalid.to_numpy(),
+    )
+
+    # each number must exceed every number above it, blank or invalid rows included
+    senior_max = numbers.where(~invalid).cummax().ffill().shift()
+    flag(
+        "non_monotone_seniority_number",
+        "literal_seniority_number",
+        "seniority number not greater than those above it",
+        (numbers <= senior_max).to_numpy(),
+    )
+
+    return ValidationReport(len(df), tuple(issues))
+
+
+def _blank(values: pd.Series) -> np.ndarray:
+    return (values == "").to_numpy()
+
+
+def _parse_dates(values: pd.Series) -> np.ndarray:
+    """
+    Return date strings as datetime64[D], NaT where `cast_date` can not parse them.
+    """
+    return cast_dates(values.astype(str), errors="coerce")
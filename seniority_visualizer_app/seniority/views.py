@@ -1,3 +1,5 @@
+from datetime import datetime
+from functools import lru_cache
 from typing import List, Union
 import typing as t
 from pathlib import Path
@@ -29,6 +31,13 @@ from .repo import CsvRepoInMemory, ICsvRepo
 from .entities import CsvRecord
 from .forms import BuildPilotPlotForm
 from . import statistics as stat
+from .scenarios import NoHiring, parse_scenario, project_scenario
+from .categories import (
+    CATEGORY_FIELDS,
+    get_category_trajectory,
+    get_junior_most_holders,
+)
+from .trajectory import SeniorityTrajectory, get_seniority_trajectory
 from .dataframe import STANDARD_FIELDS, make_standardized_seniority_dataframe
 from ..shared.entities import EmployeeID
 from .use_cases import GetCurrentSeniorityCsv, GetCurrentSeniorityListReport
@@ -80,8 +89,11 @@ def get_repo(app: Flask) -> ICsvRepo:
     return repo
 
 
-def make_df_from_record(record: CsvRecord) -> pd.DataFrame:
-    """Return a pd.DataFrame from a CsvRecord."""
+def make_df_from_record(record: CsvRecord, compact: bool = False) -> pd.DataFrame:
+    """
+    Return a pd.DataFrame from a CsvRecord. A `compact` one holds only the standard
+    fields, see :func:`.dataframe.compact_seniority_dataframe`.
+    """
     buffer = io.StringIO()
     buffer.write(record.text)
     buffer.seek(0)
@@ -97,9 +109,104 @@ def make_df_from_record(record: CsvRecord) -> pd.DataFrame:
         "fleet": STANDARD_FIELDS.FLEET,
     }
 
+    if compact:
+        return make_standardized_seniority_dataframe(
+            df, fields=fields, compact=True, columns=()
+        )
+
     return make_standardized_seniority_dataframe(df, fields=fields)
 
 
+def get_trajectory_for_record(
+    record: CsvRecord, start: datetime
+) -> SeniorityTrajectory:
+    """
+    Return the seniority trajectory of every pilot on `record`, monthly from `start`
+    to the latest retirement. Built once per published list and start date.
+    """
+    df = get_frame_for_record(record)
+    return get_seniority_trajectory(df, get_dates_for_frame(df, start))
+
+
+def get_frame_for_record(record: CsvRecord) -> pd.DataFrame:
+    """
+    Return the standardized DataFrame of `record`, shared by every request for the
+    same published list so the statistics cached per SeniorityFrame are reused. It
+    must not be modified.
+    """
+    return _load_frame(record.published, record.text)
+
+
+@lru_cache(maxsize=4)
+def _load_frame(published: datetime, text: str) -> pd.DataFrame:
+    # kept for as long as the list is current in every worker, so held compact
+    return make_df_from_record(CsvRecord(uuid.uuid4(), published, text), compact=True)
+
+
+def get_dates_for_frame(df: pd.DataFrame, start: datetime) -> pd.DatetimeIndex:
+    """Return the monthly date grid from `start` to the latest retirement of `df`"""
+    return stat.make_date_grid(
+        pd.Timestamp(start), df[STANDARD_FIELDS.RETIRE_DATE].max()
+    )
+
+
+def get_current_record() -> t.Optional[CsvRecord]:
+    """Return the current seniority list, or None if there is none"""
+    repo = get_repo(current_app)
+
+    response = GetCurrentSeniorityCsv(repo).execute(
+        uc.requests.SeniortyFilterRequest(most_recent=True, all=False)
+    )
+
+    if not response:
+        return None
+
+    return response.value
+
+
+def get_plot_start() -> datetime:
+    """Return the first date of pilot projections, the start of next month"""
+    return stat.ffwd_and_pin(pd.Timestamp.today().normalize())
+
+
+def get_current_trajectory() -> t.Optional[SeniorityTrajectory]:
+    """
+    Return the seniority trajectory of the current seniority list from the start of
+    next month, or None if there is no current list
+    """
+    record = get_current_record()
+
+    if record is None:
+        return None
+
+    return get_trajectory_for_record(record, get_plot_start())
+
+
+def get_category_fields(args: t.Mapping[str, str]) -> t.Tuple[str, ...]:
+    """
+    Return the category fields of request `args`, given as `category=base,fleet`,
+    empty if there is no category
+
+    :raise ValueError: if a field is not a category field
+    """
+    names = [n.strip().upper() for n in args.get("category", "").split(",")]
+    fields = tuple(n for n in names if n)
+
+    unknown = set(fields).difference(CATEGORY_FIELDS)
+    if unknown:
+        raise ValueError(f"unknown category fields: {sorted(unknown)}")
+
+    return fields
+
+
+def get_scenario_spec(args: t.Mapping[str, str]) -> t.Optional[str]:
+    """Return the hiring scenario spec of request `args`, honouring `pin=True`"""
+    spec = args.get("scenario")
+    if spec is None and args.get("pin", "").upper() in ["TRUE", "YES"]:
+        return "fixed"
+    return spec
+
+
 def get_pilot_records_for_employee_id(
         employee_id: Union[str, int, EmployeeID]
 ) -> List[PilotRecord]:
@@ -177,25 +284,14 @@ def plot_retirements():
     else:
         record: CsvRecord = response.value[-1]
 
-    df = make_df_from_record(record)
+    df = get_frame_for_record(record)
 
-    INTERVALS = pd.interval_range(
-        start=pd.Timestamp(record.published),
+    retire_data = stat.get_monthly_retirements(df).make_frame(
+        start=record.published,
         end=stat.ffwd_and_pin(df[STANDARD_FIELDS.RETIRE_DATE].max()),
-        freq="MS",
-        closed="left",
-    )
-
-    retirements = stat.calculate_retirements_over_time(
-        df[STANDARD_FIELDS.RETIRE_DATE], INTERVALS
+        rolling_periods=ROLLING,
     )
 
-    retire_data = pd.DataFrame(data=dict(retirements=retirements), index=INTERVALS.left)
-    retire_data.index.name = "date"
-
-    retire_data["rolling"] = retire_data["retirements"].rolling(window=ROLLING).mean()
-    retire_data["remaining"] = len(df) - retire_data["retirements"].cumsum()
-
     source = ColumnDataSource(retire_data)
 
     fig: Figure = figure(
@@ -264,7 +360,13 @@ def build_pilot_plot():
     form = BuildPilotPlotForm()
 
     if form.validate_on_submit():
-        return redirect(url_for(".pilot_plot", emp_id=int(form.employee_id.data), pin=form.pin_pilot_group.data))
+        return redirect(
+            url_for(
+                ".pilot_plot",
+                emp_id=int(form.employee_id.data),
+                scenario=form.scenario.data,
+            )
+        )
 
     return render_template("seniority/build_pilot_plot.html", form=form)
 
@@ -274,7 +376,8 @@ def pilot_plot(emp_id: str):
     """
     Plot for specific pilot
 
-    `pin=True` to pin the size of the pilot group
+    `scenario=<spec>` to project the size of the pilot group with a hiring scenario,
+    see :mod:`.scenarios`. The older `pin=True` is the same as `scenario=fixed`.
     """
 
     from bokeh.plotting import figure, ColumnDataSource
@@ -284,37 +387,36 @@ def pilot_plot(emp_id: str):
 
     if form.validate_on_submit():
         emp_id = form.employee_id.data
-        pin = form.pin_pilot_group.data
-        return redirect(url_for(".pilot_plot", emp_id=emp_id, pin=pin))
+        scenario = form.scenario.data
+        return redirect(url_for(".pilot_plot", emp_id=emp_id, scenario=scenario))
 
     else:
         form.employee_id.data = emp_id.zfill(5)
 
-    # pin the total number of active pilots, replace retirements
-    pin_retirements = request.args.get("pin", "").upper() in ["TRUE", "YES"]
-
-    repo = get_repo(current_app)
+    try:
+        scenario = parse_scenario(get_scenario_spec(request.args))
+    except ValueError as e:
+        flash(str(e), "danger")
+        return render_template("seniority/base_plot.html", errors=True)
 
-    response = GetCurrentSeniorityCsv(repo).execute(
-        uc.requests.SeniortyFilterRequest(all=True)
+    # specs outside of the form's choices show the default choice
+    choices = [value for value, _ in form.scenario.choices]
+    form.scenario.data = (
+        str(scenario) if str(scenario) in choices else form.scenario.default
     )
 
-    if not response:
-        return render_template("seniority/base_plot.html", errors=True)
-
-    else:
-        record: CsvRecord = response.value[-1]
+    trajectory = get_current_trajectory()
 
-    df = make_df_from_record(record)
+    if trajectory is None:
+        return render_template("seniority/base_plot.html", errors=True)
 
-    start = pd.Timestamp.today().normalize()
-    end = df[STANDARD_FIELDS.RETIRE_DATE].max()
-    dates: pd.DatetimeIndex = pd.date_range(start, end, freq="MS")
+    projection = project_scenario(trajectory, scenario)
+    dates: pd.DatetimeIndex = trajectory.dates
 
     try:
-        data = stat.calculate_number_of_active_senior_pilots_for_dates(
-            df, dates, emp_id
-        )
+        # active pilots senior to `emp_id`
+        data = trajectory.seniority_series(emp_id) - 1
+        pct_data = projection.percentile_series(emp_id)
     except Exception as e:
         current_app.logger.error(e)
         flash(f"No info for {emp_id}", "danger")
@@ -326,26 +428,22 @@ def pilot_plot(emp_id: str):
         plot_width=1000,
     )
 
-    active_data = stat.make_pilots_remaining_series(df, dates)
+    active_data = projection.active_counts
 
-    if not pin_retirements:
-        pct_data = (1 - (pd.Series(data, index=dates) / active_data)) * 100
-    else:
-        active_data = np.ones(len(active_data.index)) * len(df)
-        # +1 for 0 being the number 1 in seniority
-        pct_data = (1 - (pd.Series(data, index=dates) / len(df))) * 100
+    if not isinstance(scenario, NoHiring):
         flash(
-            f"The 'PCT' and 'Active' lines are adjusted for one hire per retirement, "
-            f"negating the math effect of the shrinking pilot group. "
+            f"The 'PCT' and 'Active' lines follow the '{scenario}' hiring scenario, "
+            f"new hires are junior to every pilot on the list. "
             f"The remaining information is unchanged.",
-            "warning")
+            "warning",
+        )
 
     source_data = pd.DataFrame(
         data=dict(
             date=dates,
-            seniority=data,
+            seniority=data.to_numpy(),
             active=active_data,
-            pct=pct_data,
+            pct=pct_data.to_numpy(),
         )
     )
     source_data["seniority"] = source_data["seniority"] + 1
@@ -398,3 +496,104 @@ def pilot_plot(emp_id: str):
         title=f"Plot for {emp_id:0>5}",
         form=form,
     )
+
+
+@blueprint.route("pilot_plot/<emp_id>/data")
+def pilot_plot_data(emp_id: str):
+    """
+    JSON of the data behind `pilot_plot`, taking the same `scenario` argument
+    """
+    try:
+        scenario = parse_scenario(get_scenario_spec(request.args))
+        category_fields = get_category_fields(request.args)
+    except ValueError as e:
+        return jsonify(error=str(e)), 400
+
+    record = get_current_record()
+
+    if record is None:
+        return jsonify(error="no current seniority list"), 404
+
+    trajectory = get_trajectory_for_record(record, get_plot_start())
+    projection = project_scenario(trajectory, scenario)
+
+    try:
+        seniority = trajectory.seniority_series(emp_id)
+        pct = projection.percentile_series(emp_id)
+    except ValueError:
+        return jsonify(error=f"No info for {emp_id}"), 404
+
+    data = dict(
+        employee_id=emp_id,
+        scenario=str(scenario),
+        dates=[d.date().isoformat() for d in trajectory.dates],
+        seniority=_nullable(seniority, int),
+        active=projection.active_counts.tolist(),
+        pct=_nullable(pct.round(2)),
+    )
+
+    if category_fields:
+        by_category = get_category_trajectory(
+            get_frame_for_record(record), trajectory.dates, category_fields
+        )
+        data.update(
+            category={
+                k.lower(): v for k, v in by_category.category_of(emp_id).items()
+            },
+            category_seniority=_nullable(by_category.seniority_series(emp_id), int),
+            category_active=by_category.category_size_series(emp_id).tolist(),
+        )
+
+    return jsonify(**data)
+
+
+def _nullable(series: pd.Series, cast: t.Callable = float) -> list:
+    """Return `series` as a list of `cast` values with None for NaN, for JSON"""
+    return [None if pd.isna(v) else cast(v) for v in series.tolist()]
+
+
+@blueprint.route("junior_most")
+@cache.cached(3600, query_string=True)
+def junior_most_holders():
+    """
+    JSON of the seniority number of the junior-most holder of every category, by
+    month from the start of next month.
+
+    `category=base,seat` picks the fields making up a category [default: base,
+    seat and fleet] and `<field>=<value>` (e.g. `base=JFK`) filters the categories.
+    """
+    try:
+        category_fields = get_category_fields(request.args) or CATEGORY_FIELDS
+    except ValueError as e:
+        return jsonify(error=str(e)), 400
+
+    record = get_current_record()
+
+    if record is None:
+        return jsonify(error="no current seniority list"), 404
+
+    df = get_frame_for_record(record)
+    dates = get_dates_for_frame(df, get_plot_start())
+
+    table = get_junior_most_holders(df, dates, category_fields)
+
+    categories = []
+    for key, numbers in table.items():
+        values = key if isinstance(key, tuple) else (key,)
+        category = {
+            f.lower(): v.item() if isinstance(v, np.generic) else v
+            for f, v in zip(category_fields, values)
+        }
+
+        if any(
+            str(category[name]).upper() != request.args[name].upper()
+            for name in category
+            if name in request.args
+        ):
+            continue
+
+        categories.append(dict(category, junior_most=_nullable(numbers, int)))
+
+    return jsonify(
+        dates=[d.date().isoformat() for d in table.index], categories=categories
+    )
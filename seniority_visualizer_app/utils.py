@@ -1,10 +1,13 @@
 # -*- coding: utf-8 -*-
 """Helper utilities and decorators."""
 from datetime import datetime, date, timedelta
+from functools import lru_cache
 import re
-from typing import Union, TypeVar
+from typing import Any, Iterable, Union, TypeVar
 
 from flask import flash
+import numpy as np
+import pandas as pd
 
 
 DateCastable = TypeVar("DateCastable", datetime, date, str)
@@ -89,7 +92,71 @@ def cast_date(d: DateCastable) -> date:
     if isinstance(d, date):
         return d
     if isinstance(d, str):
-        date_string = to_iso(d)
-        return datetime.fromisoformat(date_string).date()
+        return _parse_date_string(d)
 
     raise TypeError("d must be a date, datetime, or an iso formatted string")
+
+
+#: distinct date strings kept parsed by `cast_date`, a list holds a few hundred
+DATE_CACHE_SIZE = 4096
+
+
+@lru_cache(maxsize=DATE_CACHE_SIZE)
+def _parse_date_string(date_string: str) -> date:
+    return datetime.fromisoformat(to_iso(date_string)).date()
+
+
+def cast_dates(
+    values: Iterable[Any], as_date: bool = False, errors: str = "raise"
+) -> np.ndarray:
+    """
+    Cast a sequence or array of date-like objects into a datetime64[D] array, or
+    an object array of datetime.date instances if `as_date`. Each distinct value
+    is cast once with `cast_date`, so the same errors are raised, unless `errors`
+    is "coerce", where values that can not be cast become NaT.
+
+    .. code-block::
+
+        >>> cast_dates(["2020-1-5", "2020/01/05", date(2020, 1, 6)])
+        array(['2020-01-05', '2020-01-05', '2020-01-06'], dtype='datetime64[D]')
+        >>> cast_dates(["2020-1-5T10:20"], as_date=True)
+        array([datetime.date(2020, 1, 5)], dtype=object)
+        >>> cast_dates(["2020-1-5", "soon", None], errors="coerce")
+        array(['2020-01-05',        'NaT',        'NaT'], dtype='datetime64[D]')
+
+    Accepts what `cast_date` does, and datetime64 arrays
+    """
+    if errors not in ("raise", "coerce"):
+        raise ValueError(f"errors must be 'raise' or 'coerce', not {errors!r}")
+
+    message = "values must be dates, datetimes, or iso formatted strings"
+
+    if (
+        isinstance(values, (np.ndarray, pd.Series, pd.Index))
+        and values.dtype.kind == "M"
+    ):
+        days = np.asarray(values, dtype="datetime64[D]")
+
+        if errors == "raise" and np.isnat(days).any():
+            raise TypeError(message)
+    else:
+        codes, uniques = pd.factorize(np.asarray(list(values), dtype=object))
+
+        if errors == "raise" and (codes < 0).any():
+            raise TypeError(message)
+
+        parsed = np.full(len(uniques) + 1, np.datetime64("NaT"), dtype="datetime64[D]")
+        for i, value in enumerate(uniques):
+            try:
+                parsed[i] = cast_date(value)
+            except (TypeError, ValueError):
+                if errors == "raise":
+                    raise
+
+        # missing values are coded -1, the trailing NaT
+        days = parsed[codes]
+
+    if as_date:
+        return days.astype(object)
+
+    return days
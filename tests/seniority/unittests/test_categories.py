@@ -0,0 +1,179 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from seniority_visualizer_app.seniority import statistics as stat
+from seniority_visualizer_app.seniority.categories import (
+    CATEGORY_FIELDS,
+    CategoryTrajectory,
+    calculate_junior_most_holders,
+    get_category_trajectory,
+    get_junior_most_holders,
+)
+from seniority_visualizer_app.seniority.dataframe import (
+    STANDARD_FIELDS as fields,
+    compact_seniority_dataframe,
+)
+from seniority_visualizer_app.seniority.trajectory import build_seniority_trajectory
+
+
+@pytest.fixture
+def monthly_dates(standard_seniority_df) -> pd.DatetimeIndex:
+    return stat.make_date_grid(
+        pd.Timestamp("2020-02-01"), standard_seniority_df[fields.RETIRE_DATE].max()
+    )
+
+
+@pytest.mark.parametrize(
+    "category_fields",
+    [CATEGORY_FIELDS, (fields.BASE,), (fields.SEAT, fields.FLEET)],
+)
+def test_matches_trajectory_of_each_category(
+    standard_seniority_df, monthly_dates, category_fields
+):
+    df = standard_seniority_df
+    by_category = CategoryTrajectory(df, monthly_dates, category_fields)
+
+    assert by_category.matrix.shape == (len(df), len(monthly_dates))
+
+    for code, category in by_category.categories.iloc[::3].iterrows():
+        members = df[(df[list(category_fields)] == category).all(axis=1)]
+        expected = build_seniority_trajectory(members, monthly_dates)
+
+        rows = by_category.rows_in(code)
+
+        assert by_category.employee_ids[rows].tolist() == (
+            expected.employee_ids.tolist()
+        )
+        np.testing.assert_array_equal(by_category.matrix[rows], expected.matrix)
+        np.testing.assert_array_equal(
+            by_category.active_counts[code], expected.active_counts
+        )
+
+
+def test_pilot_lookups(standard_seniority_df, monthly_dates):
+    df = standard_seniority_df
+    by_category = CategoryTrajectory(df, monthly_dates)
+
+    pilot = df.iloc[1234]
+    employee_id = pilot[fields.EMPLOYEE_ID]
+
+    category = by_category.category_of(employee_id)
+
+    assert category == {f: pilot[f] for f in CATEGORY_FIELDS}
+    assert by_category.row_for(employee_id) in range(
+        *by_category.rows_in(by_category.code_for(**category)).indices(len(df))
+    )
+
+    members = df[(df[list(CATEGORY_FIELDS)] == pilot[list(CATEGORY_FIELDS)]).all(1)]
+    expected = (members[fields.SENIORITY_NUMBER] < pilot[fields.SENIORITY_NUMBER]).sum()
+
+    assert by_category.seniority_series(employee_id).iloc[0] <= expected + 1
+    assert by_category.category_size_series(employee_id).iloc[0] <= len(members)
+
+
+def test_invalid_categories(standard_seniority_df, monthly_dates):
+    with pytest.raises(ValueError):
+        CategoryTrajectory(standard_seniority_df, monthly_dates, ("LAST_NAME",))
+
+    by_category = CategoryTrajectory(standard_seniority_df, monthly_dates)
+
+    with pytest.raises(ValueError):
+        by_category.code_for(BASE="JFK")
+    with pytest.raises(ValueError):
+        by_category.code_for(BASE="XXX", SEAT="CA", FLEET="320")
+    with pytest.raises(ValueError):
+        by_category.row_for("not an id")
+
+
+def test_cached_per_fields(standard_seniority_df, monthly_dates):
+    by_category = get_category_trajectory(standard_seniority_df, monthly_dates)
+
+    assert get_category_trajectory(standard_seniority_df, monthly_dates) is by_category
+    assert (
+        get_category_trajectory(standard_seniority_df, monthly_dates, (fields.BASE,))
+        is not by_category
+    )
+
+
+def brute_force_junior_most(df, dates, category_fields, category, j):
+    """Fill each category in seniority order, pilot by pilot"""
+    ranked = df.sort_values(fields.SENIORITY_NUMBER).reset_index(drop=True)
+    members = (ranked[list(category_fields)] == pd.Series(category)).all(axis=1)
+
+    def active_on(i):
+        return ranked[fields.RETIRE_DATE] > dates[i]
+
+    held = members & active_on(0)
+    junior_most = held[held].index.max()
+
+    size = (members & active_on(0)).sum()
+    eligible = (members | (ranked.index > junior_most)) & active_on(j)
+
+    holders = eligible[eligible].index
+    if not size or len(holders) < size:
+        return np.nan
+
+    return active_on(j)[: holders[size - 1] + 1].sum()
+
+
+@pytest.mark.parametrize(
+    "category_fields", [CATEGORY_FIELDS, (fields.BASE, fields.SEAT)]
+)
+def test_junior_most_holders(standard_seniority_df, monthly_dates, category_fields):
+    df = standard_seniority_df
+    table = calculate_junior_most_holders(df, monthly_dates, category_fields)
+
+    assert table.shape == (
+        len(monthly_dates),
+        df.groupby(list(category_fields)).ngroups,
+    )
+
+    for key in table.columns[::2]:
+        category = dict(zip(category_fields, key))
+        for j in [0, 1, 60, 200, 400, len(monthly_dates) - 1]:
+            expected = brute_force_junior_most(
+                df, monthly_dates, category_fields, category, j
+            )
+            np.testing.assert_equal(table[key].iloc[j], expected)
+
+
+def test_junior_most_holders_skip_members_retired_before_dates():
+    df = pd.DataFrame(
+        {
+            fields.SENIORITY_NUMBER: range(1, 7),
+            fields.EMPLOYEE_ID: [f"{n}" for n in range(1, 7)],
+            fields.RETIRE_DATE: pd.to_datetime(["2030-01-01"] * 5 + ["2020-01-15"]),
+            fields.BASE: ["A", "B", "B", "B", "B", "A"],
+            fields.SEAT: "CA",
+            fields.FLEET: "320",
+        }
+    )
+    dates = pd.date_range("2020-02-01", periods=3, freq="MS")
+
+    table = calculate_junior_most_holders(df, dates, (fields.BASE,))
+
+    assert table["A"].tolist() == [1.0, 1.0, 1.0]
+    assert table["B"].tolist() == [5.0, 5.0, 5.0]
+
+
+def test_junior_most_holders_cached(standard_seniority_df, monthly_dates):
+    table = get_junior_most_holders(standard_seniority_df, monthly_dates)
+
+    assert get_junior_most_holders(standard_seniority_df, monthly_dates) is table
+
+
+def test_compact_frame_matches(standard_seniority_df, monthly_dates):
+    compact = compact_seniority_dataframe(standard_seniority_df)
+
+    expected = CategoryTrajectory(standard_seniority_df, monthly_dates)
+    by_category = CategoryTrajectory(compact, monthly_dates)
+
+    np.testing.assert_array_equal(by_category.matrix, expected.matrix)
+    np.testing.assert_array_equal(by_category.active_counts, expected.active_counts)
+
+    pd.testing.assert_frame_equal(
+        calculate_junior_most_holders(compact, monthly_dates),
+        calculate_junior_most_holders(standard_seniority_df, monthly_dates),
+        check_column_type=False,
+    )
@@ -0,0 +1,134 @@
+from datetime import date
+from typing import List
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from seniority_visualizer_app.seniority.columns import (
+    ColumnarSeniorityList,
+    PilotColumns,
+)
+from seniority_visualizer_app.seniority.entities import Pilot, SeniorityList
+from seniority_visualizer_app.seniority.exceptions import SeniorityListError
+from tests.factories import PilotFactory
+
+
+@pytest.fixture
+def sample_lists(pilot_dicts_from_csv):
+    pilots = [Pilot.from_dict(d) for d in pilot_dicts_from_csv]
+
+    return (
+        SeniorityList(pilots, published_date="2020-01-01"),
+        ColumnarSeniorityList.from_pilots(pilots, published_date="2020-01-01"),
+    )
+
+
+class TestPilotColumns:
+    def test_dtypes(self):
+        pilots: List[Pilot] = PilotFactory.build_batch(10)
+
+        cols = PilotColumns.from_pilots(pilots)
+
+        assert cols.hire_dates.dtype == np.dtype("datetime64[D]")
+        assert cols.retire_dates.dtype == np.dtype("datetime64[D]")
+        assert cols.literal_numbers.dtype == np.int32
+        assert cols.employee_ids.dtype == object
+        assert not cols.hire_dates.flags.writeable
+
+    def test_pilot_at_round_trip(self):
+        pilots: List[Pilot] = PilotFactory.build_batch(10)
+        pilots[3].literal_seniority_number = None
+
+        cols = PilotColumns.from_pilots(pilots)
+
+        for row, pilot in enumerate(pilots):
+            built = cols.pilot_at(row)
+            assert built == pilot
+            assert built.literal_seniority_number == pilot.literal_seniority_number
+
+    def test_literal_numbers(self):
+        hire, retire = [date(2000, 1, 1)] * 4, [date(2030, 1, 1)] * 4
+
+        cols = PilotColumns(list("1234"), hire, retire, ["7", 8.0, None, "1e3"])
+
+        assert cols.literal_numbers.tolist() == [7, 8, 0, 1000]
+        assert cols.has_literal.tolist() == [True, True, False, True]
+
+        for bad in ["2.5", "x", 2**40]:
+            with pytest.raises(ValueError, match="whole numbers"):
+                PilotColumns(list("1234"), hire, retire, [1, 2, 3, bad])
+
+    def test_mismatched_lengths_raise(self):
+        with pytest.raises(ValueError, match="same length"):
+            PilotColumns(["1", "2"], [date(2000, 1, 1)], [date(2030, 1, 1)])
+
+
+class TestColumnarSeniorityList:
+    def test_matches_seniority_list(self, sample_lists):
+        sen_list, columnar = sample_lists
+
+        assert len(columnar) == len(sen_list) == 3925
+        assert columnar.published_date == sen_list.published_date
+        assert columnar.pilot_data == sen_list.pilot_data
+        assert columnar.sorted_pilot_data == sen_list.sorted_pilot_data
+
+    def test_sorted_pilot_data_built_once(self, sample_lists):
+        _, columnar = sample_lists
+
+        assert columnar.sorted_pilot_data is columnar.sorted_pilot_data
+
+        with pytest.raises(AttributeError):
+            columnar.sorted_pilot_data = ()
+        with pytest.raises(AttributeError):
+            columnar.pilot_data = []
+
+    def test_filter_active_on(self, sample_lists):
+        sen_list, columnar = sample_lists
+
+        for ref in ["2000-01-01", "2025-06-15", "2060-01-01"]:
+            assert list(columnar.filter_active_on(ref)) == list(
+                sen_list.filter_active_on(ref)
+            )
+
+    def test_lookup_pilot_seniority_number(self, sample_lists):
+        sen_list, columnar = sample_lists
+
+        for pilot in sen_list.sorted_pilot_data[::250]:
+            assert pilot in columnar
+            assert columnar.lookup_pilot_seniority_number(
+                pilot
+            ) == sen_list.lookup_pilot_seniority_number(pilot)
+            assert columnar.lookup_pilot_seniority_number(
+                pilot, date_="2021-01-01"
+            ) == sen_list.lookup_pilot_seniority_number(pilot, date_="2021-01-01")
+
+        missing = Pilot("99999999", "2000-01-01", "2030-01-01")
+
+        assert missing not in columnar
+
+        with pytest.raises(SeniorityListError):
+            columnar.lookup_pilot_seniority_number(missing)
+
+    def test_to_df(self, sample_lists):
+        sen_list, columnar = sample_lists
+
+        pd.testing.assert_frame_equal(columnar.to_df(), sen_list.to_df())
+
+    def test_from_dict(self, sample_lists, pilot_dicts_from_csv):
+        sen_list, _ = sample_lists
+
+        columnar = ColumnarSeniorityList.from_dict(
+            {"published_date": "2020-01-01", "pilots": pilot_dicts_from_csv}
+        )
+
+        assert isinstance(columnar, ColumnarSeniorityList)
+        assert columnar.published_date == sen_list.published_date
+        assert columnar.sorted_pilot_data == sen_list.sorted_pilot_data
+
+    def test_empty(self):
+        columnar = ColumnarSeniorityList()
+
+        assert len(columnar) == 0
+        assert columnar.pilot_data == []
+        assert list(columnar.filter_active_on()) == []
@@ -2,12 +2,19 @@ import pytest
 import datetime as dt
 import random
 from io import StringIO
+from unittest import mock
 
 import pandas as pd
 from pandas.core.dtypes import common as pd_common
 import numpy as np
 
-from seniority_visualizer_app.seniority.dataframe import STANDARD_FIELDS, require_fields
+from seniority_visualizer_app.seniority.dataframe import (
+    STANDARD_FIELDS,
+    SeniorityFrame,
+    compact_seniority_dataframe,
+    memory_usage,
+    require_fields,
+)
 
 
 def test_fixture(standard_seniority_df):
@@ -53,3 +60,99 @@ def test_require_fields():
     df["MISSING KEY"] = True
 
     assert func_1(df)
+
+
+def test_seniority_frame_lookups(standard_seniority_df):
+    fields = STANDARD_FIELDS
+    frame = standard_seniority_df
+
+    assert isinstance(frame, SeniorityFrame)
+
+    pilot = frame.iloc[1234]
+    assert frame.position_of(pilot[fields.EMPLOYEE_ID]) == 1234
+    pd.testing.assert_series_equal(frame.record_for(pilot[fields.EMPLOYEE_ID]), pilot)
+
+    with pytest.raises(ValueError):
+        frame.position_of("not an id")
+
+    numbers = frame[fields.SENIORITY_NUMBER].to_numpy()
+    assert (np.diff(numbers[frame.seniority_order]) > 0).all()
+
+    seniors = frame.rows_senior_to(pilot[fields.SENIORITY_NUMBER])
+    assert sorted(seniors) == list(
+        np.flatnonzero(numbers < pilot[fields.SENIORITY_NUMBER])
+    )
+
+    np.testing.assert_array_equal(
+        frame.sorted_retire_dates,
+        np.sort(frame[fields.RETIRE_DATE].dropna().to_numpy()),
+    )
+
+
+def test_seniority_frame_validation(standard_seniority_df):
+    fields = STANDARD_FIELDS
+    plain = pd.DataFrame(standard_seniority_df)
+
+    with pytest.raises(ValueError, match="missing keys"):
+        SeniorityFrame(plain.drop(columns=fields.BASE))
+
+    with pytest.raises(ValueError, match=fields.RETIRE_DATE):
+        SeniorityFrame(plain.astype({fields.RETIRE_DATE: str}))
+
+    derived = standard_seniority_df.sort_values(fields.RETIRE_DATE)
+    assert type(derived) is pd.DataFrame
+    assert type(standard_seniority_df.copy()) is pd.DataFrame
+
+
+def test_require_fields_trusts_seniority_frame(standard_seniority_df):
+    calls = []
+
+    @require_fields(STANDARD_FIELDS.EMPLOYEE_ID, STANDARD_FIELDS.RETIRE_DATE)
+    def func(df):
+        calls.append(df)
+
+    with mock.patch.object(SeniorityFrame, "keys") as keys:
+        func(standard_seniority_df)
+
+    keys.assert_not_called()
+    assert len(calls) == 1
+
+
+def test_require_fields_checks_other_fields_of_seniority_frame(
+    standard_seniority_df,
+):
+    @require_fields(STANDARD_FIELDS.EMPLOYEE_ID, "MISSING KEY")
+    def func(df):
+        pass
+
+    with pytest.raises(KeyError, match="MISSING KEY"):
+        func(standard_seniority_df)
+
+    with pytest.raises(KeyError, match="MISSING KEY"):
+        func(pd.DataFrame(standard_seniority_df))
+
+
+def test_compact_dataframe(standard_seniority_df):
+    fields = STANDARD_FIELDS
+    compact = compact_seniority_dataframe(standard_seniority_df)
+
+    assert isinstance(compact, SeniorityFrame)
+    assert compact.columns.tolist() == standard_seniority_df.columns.tolist()
+    assert memory_usage(compact) < memory_usage(standard_seniority_df)
+
+    for field in (fields.BASE, fields.SEAT, fields.FLEET):
+        assert pd_common.is_categorical_dtype(compact[field])
+    assert compact[fields.SENIORITY_NUMBER].dtype == np.int16
+    retire = compact[fields.RETIRE_DATE].dropna()
+    assert (retire.dt.normalize() == retire).all()
+
+    pd.testing.assert_frame_equal(
+        pd.DataFrame(compact).astype(standard_seniority_df.dtypes),
+        pd.DataFrame(standard_seniority_df),
+    )
+
+
+def test_compact_dataframe_projection(standard_seniority_df):
+    compact = compact_seniority_dataframe(standard_seniority_df, columns=["last_name"])
+
+    assert set(compact.columns) == set(STANDARD_FIELDS) | {"last_name"}
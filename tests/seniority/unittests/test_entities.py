@@ -112,6 +112,24 @@ class TestPilot:
         assert pilot.is_active_on(day_before_retired)
         assert not pilot.is_active_on(retired)
 
+    def test_hash_reset_on_assignment(self):
+        pilot = PilotFactory(hire_date=date(1990, 1, 1))
+        original_hash = hash(pilot)
+
+        copied = Pilot(pilot.employee_id, pilot.hire_date, pilot.retire_date)
+
+        assert pilot == copied
+        assert hash(copied) == original_hash
+
+        pilot.hire_date = "1991-01-01"
+
+        assert hash(pilot) != original_hash
+        assert pilot != copied
+        assert pilot.hire_date == date(1991, 1, 1)
+
+        with pytest.raises(AttributeError):
+            pilot.some_attribute = True
+
     def test_from_dict(self):
         info = {
             "hire_date": datetime(2020, 1, 1),
@@ -213,19 +231,17 @@ class TestSeniorityList:
 
             sen_list.lookup_pilot_seniority_number(mock_pilot)
 
-        for i, pilot in pilot_sen.items():
-            if i <= 50:
-                pilot.is_active_on = mock.Mock(return_value=False)
-            else:
-                pilot.is_active_on = mock.Mock(return_value=True)
-
+        # pilots 1 through 50 have retired by 2034-02-15, leaving pilot 51 as number 1
         assert (
                 sen_list.lookup_pilot_seniority_number(
-                    pilot_sen[51], date_=date(2050, 1, 1)
+                    pilot_sen[51], date_=date(2034, 2, 15)
                 )
                 == 1
         )
 
+        with pytest.raises(SeniorityListError):
+            sen_list.lookup_pilot_seniority_number(pilot_sen[50], date_=date(2034, 2, 15))
+
     def test_from_dict(self):
         pilots = PILOT_DICTS
 
@@ -448,3 +464,46 @@ class TestSeniorityListEntity:
 
         assert sen_list._get_pilot_index(target, sen_list.pilot_data) == 50 == sen_list._get_pilot_index(from_dict,
                                                                                                          sen_list.pilot_data)
+
+    def test_rank_index_is_cached(self):
+        pilots: List[Pilot] = PilotFactory.build_batch(100)
+        shuffled = pilots.copy()
+        shuffle(shuffled)
+
+        sen_list = SeniorityList(shuffled)
+
+        assert sen_list._rank_index is None
+
+        sorted_data = sen_list.sorted_pilot_data
+
+        assert list(sorted_data) == pilots
+        assert sen_list.sorted_pilot_data is sorted_data
+        assert sen_list._rank_index[pilots[0].employee_id] == 0
+
+        assert pilots[0] in sen_list
+        assert sen_list.lookup_pilot_seniority_number(pilots[0]) == 1
+        assert sen_list.lookup_pilot_seniority_number(pilots[99]) == 100
+
+        sen_list._reset_rank_index()
+
+        assert sen_list._sorted_pilots is None
+        assert sen_list.lookup_pilot_seniority_number(pilots[50]) == 51
+
+    def test_rank_index_requires_matching_pilot(self):
+        pilots: List[Pilot] = PilotFactory.build_batch(10)
+
+        sen_list = SeniorityList(pilots)
+
+        target = pilots[5]
+
+        impostor = Pilot(
+            employee_id=target.employee_id,
+            hire_date=target.hire_date,
+            retire_date=target.retire_date + timedelta(days=1),
+        )
+
+        assert target in sen_list
+        assert impostor not in sen_list
+
+        with pytest.raises(SeniorityListError):
+            sen_list.lookup_pilot_seniority_number(impostor)
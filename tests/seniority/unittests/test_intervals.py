@@ -0,0 +1,75 @@
+from datetime import date, timedelta
+
+import numpy as np
+import pytest
+
+from seniority_visualizer_app.seniority.entities import Pilot, SeniorityList
+from seniority_visualizer_app.seniority.intervals import EmploymentIntervalIndex
+
+REF_DATES = [
+    date(1985, 1, 1),
+    date(1999, 10, 4),
+    date(2010, 3, 15),
+    date(2022, 2, 1),
+    date(2035, 7, 1),
+    date(2070, 1, 1),
+]
+
+
+@pytest.fixture
+def sample_seniority_list(pilot_dicts_from_csv) -> SeniorityList:
+    return SeniorityList(Pilot.from_dict(d) for d in pilot_dicts_from_csv)
+
+
+@pytest.mark.parametrize("ref_date", REF_DATES)
+def test_matches_brute_force(sample_seniority_list, ref_date):
+    sorted_pilots = sample_seniority_list.sorted_pilot_data
+    index = EmploymentIntervalIndex.from_pilots(sorted_pilots)
+
+    expected = [i for i, p in enumerate(sorted_pilots) if p.is_active_on(ref_date)]
+
+    assert index.count_active_on(ref_date) == len(expected)
+    assert index.active_ranks_on(ref_date).tolist() == expected
+
+    for rank in range(0, len(sorted_pilots), 397):
+        assert index.is_active_on(rank, ref_date) == sorted_pilots[rank].is_active_on(
+            ref_date
+        )
+        assert index.count_active_senior_to(rank, ref_date) == len(
+            [i for i in expected if i < rank]
+        )
+
+
+def test_count_active_on_days(sample_seniority_list):
+    index = sample_seniority_list.interval_index
+
+    counts = index.count_active_on_days(np.array(REF_DATES, dtype="datetime64[D]"))
+
+    assert counts.tolist() == [index.count_active_on(d) for d in REF_DATES]
+
+
+def test_retired_before_hired_never_active():
+    hired = date(2000, 1, 1)
+    index = EmploymentIntervalIndex([hired, hired], [hired + timedelta(days=1), hired])
+
+    assert index.count_active_on(hired) == 1
+    assert index.active_ranks_on(hired).tolist() == [0]
+    assert not index.is_active_on(1, hired)
+
+
+def test_seniority_list_uses_interval_index(sample_seniority_list):
+    sen_list = sample_seniority_list
+
+    target = sen_list.sorted_pilot_data[2000]
+    ref_date = date(2030, 1, 1)
+
+    active = [p for p in sen_list.sorted_pilot_data if p.is_active_on(ref_date)]
+
+    assert list(sen_list.filter_active_on(ref_date)) == active
+    assert sen_list.lookup_pilot_seniority_number(target, ref_date) == (
+        active.index(target) + 1
+    )
+
+    sen_list._reset_rank_index()
+
+    assert sen_list._interval_index is None
@@ -1,10 +1,21 @@
 import datetime as dt
+import io
+import sys
 from pathlib import Path
+from unittest import mock
 
+import pandas as pd
 import pytest
 
 from tests.utils import SAMPLE_CSV
 
+from seniority_visualizer_app.seniority.columns import ColumnarSeniorityList
+from seniority_visualizer_app.seniority.exceptions import (
+    DatasourceSchemaError,
+    DatasourceValidationError,
+    LoaderError,
+)
+from seniority_visualizer_app.seniority import loader
 from seniority_visualizer_app.seniority.loader import SeniorityListLoader
 
 
@@ -52,3 +63,147 @@ class TestSeniorityLoader:
 
         assert sen_list.published_date == dt.date(2000, 1, 1)
         assert len(sen_list.pilot_data) == 3925
+
+    def test_load_from_stream_reports_every_issue(self):
+        csv_ = (
+            "employee_id,hire_date,retire_date,literal_seniority_number\n"
+            "1,2000-01-05,2030-01-05,1\n"
+            "2,2000-13-05,2030-01-05,2\n"
+            "3,2000-01-05,2030-01-05,two\n"
+        )
+
+        with pytest.raises(DatasourceValidationError) as e:
+            SeniorityListLoader().load_from_stream(io.StringIO(csv_))
+
+        assert "unparseable hire date (rows 3)" in str(e.value)
+        assert "not a whole number in the int32 range (rows 4)" in str(e.value)
+
+    def test_load_from_stream_missing_headers(self):
+        with pytest.raises(DatasourceSchemaError, match="literal_seniority_number"):
+            SeniorityListLoader().load_from_stream(Path(SAMPLE_CSV).open())
+
+    @pytest.mark.parametrize("chunk_size", [333, 10_000])
+    def test_iter_pilots(self, sample_csv_loader, chunk_size):
+        expected = sample_csv_loader.load_from_stream(Path(SAMPLE_CSV).open())
+
+        pilots = list(
+            sample_csv_loader.iter_pilots(Path(SAMPLE_CSV).open(), chunk_size)
+        )
+
+        assert pilots == expected.pilot_data
+        assert [p.literal_seniority_number for p in pilots] == [
+            p.literal_seniority_number for p in expected.pilot_data
+        ]
+
+    def test_load_columnar_from_stream(self, sample_csv_loader):
+        expected = sample_csv_loader.load_from_stream(Path(SAMPLE_CSV).open())
+
+        sen_list = sample_csv_loader.load_columnar_from_stream(
+            Path(SAMPLE_CSV).open(), chunk_size=500, published_date="2000-1-1"
+        )
+
+        assert isinstance(sen_list, ColumnarSeniorityList)
+        assert sen_list.published_date == dt.date(2000, 1, 1)
+        assert sen_list.sorted_pilot_data == expected.sorted_pilot_data
+
+    def test_streams_in_chunks(self, sample_csv_loader):
+        text = Path(SAMPLE_CSV).read_text()
+        header, *rows = text.splitlines()
+        stream = io.StringIO("\n".join([header] + rows * 20))
+
+        chunks = sample_csv_loader.iter_chunks(stream, chunk_size=100)
+        first = next(chunks)
+
+        assert len(first) == 100
+        assert "employee_id" in first.columns
+        assert stream.tell() < len(stream.getvalue()) / 2
+
+    def test_chunk_reader_closed_without_context_manager(self, sample_csv_loader):
+        class Reader:
+            """A TextFileReader before pandas 1.2, not a context manager"""
+
+            closed = False
+
+            def __init__(self, reader):
+                self.reader = reader
+
+            def __iter__(self):
+                return iter(self.reader)
+
+            def close(self):
+                self.closed = True
+                self.reader.close()
+
+        readers = []
+        pandas_read_csv = pd.read_csv
+
+        def read_csv(*args, **kwargs):
+            readers.append(Reader(pandas_read_csv(*args, **kwargs)))
+            return readers[-1]
+
+        with mock.patch.object(loader.pd, "read_csv", side_effect=read_csv):
+            chunks = sample_csv_loader.iter_chunks(
+                Path(SAMPLE_CSV).open(), chunk_size=100
+            )
+            assert len(next(chunks)) == 100
+            chunks.close()
+
+        assert readers[0].closed
+
+    def test_stream_missing_headers(self):
+        with pytest.raises(LoaderError, match="literal_seniority_number"):
+            list(SeniorityListLoader().iter_pilots(Path(SAMPLE_CSV).open()))
+
+        with pytest.raises(LoaderError):
+            list(SeniorityListLoader().iter_pilots(io.StringIO("")))
+
+    def test_load_fast_from_stream(self, sample_csv_loader):
+        expected = sample_csv_loader.load_from_stream(Path(SAMPLE_CSV).open())
+
+        sen_list = sample_csv_loader.load_fast_from_stream(
+            Path(SAMPLE_CSV).open(), published_date="2000-1-1"
+        )
+
+        assert isinstance(sen_list, ColumnarSeniorityList)
+        assert sen_list.published_date == dt.date(2000, 1, 1)
+        assert sen_list.sorted_pilot_data == expected.sorted_pilot_data
+        assert [p.literal_seniority_number for p in sen_list.sorted_pilot_data] == [
+            int(p.literal_seniority_number) for p in expected.sorted_pilot_data
+        ]
+
+    def test_fast_loader_dates(self):
+        csv_ = (
+            "employee_id,hire_date,retire_date,literal_seniority_number\n"
+            "1,2000-01-05,2030/1/5,1\n"
+            "2,2001-2-3,2031-02-03 10:20:50,\n"
+        )
+
+        sen_list = SeniorityListLoader().load_fast_from_stream(io.StringIO(csv_))
+
+        assert [(p.hire_date, p.retire_date) for p in sen_list.pilot_data] == [
+            (dt.date(2000, 1, 5), dt.date(2030, 1, 5)),
+            (dt.date(2001, 2, 3), dt.date(2031, 2, 3)),
+        ]
+        assert [p.literal_seniority_number for p in sen_list.pilot_data] == [1, None]
+
+        with pytest.raises(DatasourceValidationError, match="unparseable hire date"):
+            SeniorityListLoader().load_fast_from_stream(
+                io.StringIO(csv_.replace("2000-01-05", "2000-13-05"))
+            )
+
+
+@pytest.mark.parametrize(
+    "pandas_version, pyarrow, engine",
+    [
+        ("1.0.1", object(), "c"),
+        ("1.3.5", object(), "c"),
+        ("1.4.0", object(), "pyarrow"),
+        ("2.1.0rc0", object(), "pyarrow"),
+        ("1.5.3", None, "c"),
+    ],
+)
+def test_fast_csv_engine(pandas_version, pyarrow, engine):
+    with mock.patch.object(loader.pd, "__version__", pandas_version), mock.patch.dict(
+        sys.modules, {"pyarrow": pyarrow}
+    ):
+        assert loader._fast_csv_engine() == engine
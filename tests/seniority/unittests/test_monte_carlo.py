@@ -0,0 +1,255 @@
+from unittest import mock
+import warnings
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from seniority_visualizer_app.seniority import monte_carlo as mc, statistics as stat
+from seniority_visualizer_app.seniority.dataframe import STANDARD_FIELDS as fields
+from seniority_visualizer_app.seniority.monte_carlo import (
+    HazardRates,
+    _Windows,
+    _percentiles_of_histogram,
+    get_attrition_bands,
+    simulate_attrition,
+)
+from seniority_visualizer_app.seniority.trajectory import build_seniority_trajectory
+
+
+@pytest.fixture
+def yearly_dates(standard_seniority_df) -> pd.DatetimeIndex:
+    return stat.make_date_grid(
+        pd.Timestamp("2020-02-01"),
+        standard_seniority_df[fields.RETIRE_DATE].max(),
+        freq="Y",
+    )
+
+
+@pytest.fixture
+def sample_ids(standard_seniority_df):
+    return standard_seniority_df[fields.EMPLOYEE_ID].iloc[::500].tolist()
+
+
+def test_no_attrition_matches_trajectory(standard_seniority_df, yearly_dates):
+    trajectory = build_seniority_trajectory(standard_seniority_df, yearly_dates)
+
+    bands = simulate_attrition(
+        standard_seniority_df,
+        yearly_dates,
+        HazardRates(annual=0),
+        trials=3,
+        max_workers=1,
+    )
+
+    expected = np.where(trajectory.matrix == 0, np.nan, trajectory.matrix)
+
+    assert bands.employee_ids.tolist() == trajectory.employee_ids.tolist()
+    for band in bands.bands:
+        np.testing.assert_array_equal(band, expected)
+    np.testing.assert_array_equal(bands.present, trajectory.matrix > 0)
+
+
+def test_attrition_only_improves_seniority(
+    standard_seniority_df, yearly_dates, sample_ids
+):
+    trajectory = build_seniority_trajectory(standard_seniority_df, yearly_dates)
+
+    bands = simulate_attrition(
+        standard_seniority_df,
+        yearly_dates,
+        HazardRates(annual=0.05),
+        employee_ids=sample_ids,
+        trials=200,
+        max_workers=1,
+    )
+
+    for employee_id in sample_ids:
+        frame = bands.pilot_frame(employee_id)
+        scheduled = trajectory.seniority_series(employee_id)
+        held = frame["present"] > 0
+
+        assert (frame["P10"][held] <= frame["P50"][held]).all()
+        assert (frame["P50"][held] <= frame["P90"][held]).all()
+        assert (frame["P90"][held] <= scheduled[held]).all()
+        assert (frame["present"] <= scheduled.notna()).all()
+
+
+def test_deterministic_for_seed(standard_seniority_df, yearly_dates, sample_ids):
+    def run(seed, max_workers, batch_trials=20):
+        return simulate_attrition(
+            standard_seniority_df,
+            yearly_dates,
+            HazardRates(annual=0.03, schedule=(0.1, 0.05)),
+            employee_ids=sample_ids,
+            trials=60,
+            seed=seed,
+            batch_trials=batch_trials,
+            max_workers=max_workers,
+        )
+
+    # one chunk per pilot, so the pool runs several tasks
+    with mock.patch.object(mc, "MAX_HISTOGRAM_BINS", 1):
+        inline = run(seed=1, max_workers=1)
+        pooled = run(seed=1, max_workers=2)
+
+    np.testing.assert_array_equal(inline.bands, pooled.bands)
+    np.testing.assert_array_equal(inline.present, pooled.present)
+    assert not np.array_equal(inline.present, run(seed=2, max_workers=1).present)
+
+
+def test_hazard_schedule():
+    dates = pd.DatetimeIndex(["2020-01-01", "2020-07-01", "2021-01-01", "2023-01-01"])
+    years = np.array([0, 182, 366, 1096]) / 365.25
+
+    constant = HazardRates(annual=0.1).cumulative(dates)
+    np.testing.assert_allclose(constant, -np.log(0.9) * years)
+
+    scheduled = HazardRates(annual=0.1, schedule=(0.5,)).cumulative(dates)
+    np.testing.assert_allclose(
+        scheduled,
+        [
+            0,
+            -np.log(0.5) * years[1],
+            -np.log(0.5) - np.log(0.9) * (years[2] - 1),
+            -np.log(0.5) - np.log(0.9) * (years[3] - 1),
+        ],
+    )
+
+    with pytest.raises(ValueError):
+        HazardRates(annual=1).cumulative(dates)
+
+
+def test_unknown_employee_id(standard_seniority_df, yearly_dates):
+    with pytest.raises(ValueError):
+        simulate_attrition(
+            standard_seniority_df, yearly_dates, employee_ids=["not an id"]
+        )
+
+
+def test_cached_per_arguments(standard_seniority_df, yearly_dates, sample_ids):
+    bands = get_attrition_bands(
+        standard_seniority_df, yearly_dates, employee_ids=sample_ids, trials=20
+    )
+
+    assert (
+        get_attrition_bands(
+            standard_seniority_df, yearly_dates, employee_ids=sample_ids, trials=20
+        )
+        is bands
+    )
+    assert (
+        get_attrition_bands(
+            standard_seniority_df,
+            yearly_dates,
+            employee_ids=sample_ids,
+            trials=20,
+            seed=1,
+        )
+        is not bands
+    )
+
+
+def test_percentiles_of_histogram():
+    rng = np.random.default_rng(0)
+    samples = rng.integers(0, 6, (25, 4, 3)).astype(np.int32)
+    samples[:, 0, 0] = 0
+
+    low = np.ones((4, 3), dtype=np.int64)
+    widths = np.full((4, 3), 5)
+    windows = _Windows(low, widths, np.cumsum(widths).reshape(4, 3) - widths)
+
+    held = (samples > 0).sum(axis=0)
+    bins = (windows.offsets + samples - low)[samples > 0]
+    hist = np.bincount(bins, minlength=windows.size)
+
+    expected = np.nanpercentile(
+        np.where(samples > 0, samples, np.nan), [10, 50, 90], axis=0
+    )
+
+    np.testing.assert_allclose(
+        _percentiles_of_histogram(hist, windows, held, (10, 50, 90)), expected
+    )
+
+
+def test_bands_match_percentiles_of_trials(
+    standard_seniority_df, yearly_dates, sample_ids
+):
+    hazard = HazardRates(annual=0.05)
+
+    # several chunks, each simulated a few trials at a time
+    with mock.patch.object(mc, "MAX_HISTOGRAM_BINS", 2000):
+        bands = simulate_attrition(
+            standard_seniority_df,
+            yearly_dates,
+            hazard,
+            employee_ids=sample_ids,
+            trials=90,
+            batch_trials=40,
+            max_workers=1,
+        )
+
+    df = standard_seniority_df.sort_values(fields.SENIORITY_NUMBER, kind="stable")
+    retire = pd.to_datetime(df[fields.RETIRE_DATE]).to_numpy()[None, :, None]
+    grid = yearly_dates.to_numpy()[None, None, :]
+    positions = np.flatnonzero(df[fields.EMPLOYEE_ID].isin(sample_ids))
+
+    early = mc._draw_departures(0, 90, len(df), hazard.cumulative(yearly_dates))
+    stays = np.arange(len(yearly_dates))[None, None, :] < early.T[:, :, None]
+
+    # every trial of every pilot, brute force
+    senior = (grid < retire) & stays
+    numbers = np.cumsum(senior, axis=1) - senior + 1
+    samples = np.where((grid <= retire) & stays, numbers, 0)[:, positions]
+
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore", RuntimeWarning)
+        expected = np.nanpercentile(
+            np.where(samples > 0, samples, np.nan), [10, 50, 90], axis=0
+        )
+
+    np.testing.assert_allclose(bands.bands, expected)
+    np.testing.assert_allclose(bands.present, (samples > 0).mean(axis=0))
+
+
+def test_bands_independent_of_chunks(standard_seniority_df, yearly_dates):
+    def run(**kwargs):
+        return simulate_attrition(
+            standard_seniority_df,
+            yearly_dates,
+            HazardRates(annual=0.05),
+            trials=30,
+            max_workers=1,
+            **kwargs,
+        )
+
+    whole = run()
+    with mock.patch.object(mc, "MAX_HISTOGRAM_BINS", 50_000):
+        chunked = run(batch_trials=7)
+
+    np.testing.assert_array_equal(whole.bands, chunked.bands)
+    np.testing.assert_array_equal(whole.present, chunked.present)
+
+
+def test_draws_shared_by_senior_pilots():
+    cumulative_hazard = HazardRates(annual=0.2).cumulative(
+        pd.date_range("2020-01-01", periods=30, freq="Y")
+    )
+    many = mc._draw_departures(3, 50, 40, cumulative_hazard)
+
+    np.testing.assert_array_equal(
+        mc._draw_departures(3, 50, 15, cumulative_hazard), many[:15]
+    )
+
+
+def test_cached_with_schedule_list(standard_seniority_df, yearly_dates, sample_ids):
+    def bands(schedule):
+        return get_attrition_bands(
+            standard_seniority_df,
+            yearly_dates,
+            HazardRates(annual=0.03, schedule=schedule),
+            employee_ids=sample_ids,
+            trials=10,
+        )
+
+    assert bands([0.1, 0.05]) is bands((0.1, 0.05))
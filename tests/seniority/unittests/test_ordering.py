@@ -0,0 +1,70 @@
+from datetime import date
+from functools import cmp_to_key
+import random
+
+import numpy as np
+import pytest
+
+from seniority_visualizer_app.seniority import ordering
+from seniority_visualizer_app.seniority.entities import Pilot
+
+
+def compare(p1: Pilot, p2: Pilot) -> int:
+    if p1.is_senior_to(p2):
+        return -1
+    if p2.is_senior_to(p1):
+        return 1
+    return 0
+
+
+def make_tied_pilots(n: int, literal_choices) -> list:
+    """Pilots drawn from a handful of dates so ties on every key are common"""
+    rng = random.Random(1234)
+    hire_dates = [date(1990 + i, 1, 1) for i in range(3)]
+    retire_dates = [date(2030 + i, 6, 1) for i in range(3)]
+
+    return [
+        Pilot(
+            employee_id=str(i).zfill(5),
+            hire_date=rng.choice(hire_dates),
+            retire_date=rng.choice(retire_dates),
+            literal_seniority_number=rng.choice(literal_choices),
+        )
+        for i in range(n)
+    ]
+
+
+def test_sort_key_matches_is_senior_to():
+    pilots = make_tied_pilots(300, [None, 1, 2, 3, 50])
+
+    by_key = sorted(pilots, key=ordering.seniority_sort_key)
+    by_comparison = sorted(pilots, key=cmp_to_key(compare))
+
+    assert by_key == by_comparison
+    assert [p.employee_id for p in by_key] == [p.employee_id for p in sorted(pilots)]
+
+
+@pytest.mark.parametrize(
+    "literal_choices", [[None, 1, 2, 3, 50], [None], ["1", "10", "9", None]]
+)
+def test_sort_pilots_matches_sorted(literal_choices):
+    pilots = make_tied_pilots(300, literal_choices)
+
+    result = ordering.sort_pilots(pilots)
+
+    assert [p.employee_id for p in result] == [p.employee_id for p in sorted(pilots)]
+
+
+def test_seniority_order_columns():
+    hire = np.array(["2000-01-01", "1999-01-01", "2000-01-01", "2000-01-01"], "M8[D]")
+    retire = np.array(["2030-01-01", "2040-01-01", "2030-01-01", "2029-01-01"], "M8[D]")
+    literal = np.array([5, 0, 0, 9])
+    has_literal = np.array([True, False, False, True])
+
+    order = ordering.seniority_order(hire, retire, literal, has_literal)
+
+    assert order.tolist() == [1, 3, 0, 2]
+
+
+def test_sort_pilots_empty():
+    assert ordering.sort_pilots([]) == []
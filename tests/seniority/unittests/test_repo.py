@@ -1,7 +1,9 @@
+import datetime as dt
 import uuid
 
 import pytest
 
+from seniority_visualizer_app.seniority import repo
 from tests import factories
 
 
@@ -68,3 +70,63 @@ class TestCsvRepoInMemory:
 
         assert res == overwriting.id
         assert csv_repo.get(res) == overwriting
+
+    def test_get_all_ordered_by_published(self, csv_repo_in_memory_factory):
+        csv_repo, records = csv_repo_in_memory_factory(20)
+
+        by_published = sorted(records, key=lambda r: r.published)
+
+        assert csv_repo.get_all() == by_published
+        assert csv_repo.most_recent() == by_published[-1]
+
+        # a copy, so the repo's order can not be changed by the caller
+        csv_repo.get_all().reverse()
+        assert csv_repo.get_all() == by_published
+
+    def test_most_recent_of_empty(self, csv_repo_in_memory_factory):
+        csv_repo, _ = csv_repo_in_memory_factory()
+
+        assert csv_repo.most_recent() is None
+
+    def test_overwrite_keeps_order(self, csv_repo_in_memory_factory):
+        csv_repo, records = csv_repo_in_memory_factory(5)
+
+        latest = factories.CsvRecordFactory.build(published=dt.datetime(2100, 1, 1))
+        csv_repo.save(latest)
+
+        assert csv_repo.most_recent() == latest
+
+        earliest = factories.CsvRecordFactory.build(
+            id=latest.id, published=dt.datetime(1900, 1, 1)
+        )
+        csv_repo.save(earliest, overwrite=True)
+
+        assert len(csv_repo.get_all()) == 6
+        assert csv_repo.get_all()[0] == earliest
+        assert csv_repo.get(latest.id) == earliest
+        assert csv_repo.most_recent() == max(records, key=lambda r: r.published)
+
+    def test_same_published_kept_in_save_order(self):
+        published = dt.datetime(2020, 1, 1)
+        records = factories.CsvRecordFactory.build_batch(3, published=published)
+
+        csv_repo = repo.CsvRepoInMemory(records)
+
+        assert csv_repo.get_all() == records
+        assert csv_repo.most_recent() == records[-1]
+
+    def test_get_range(self):
+        records = [
+            factories.CsvRecordFactory.build(published=dt.datetime(2000 + i, 1, 1))
+            for i in range(10)
+        ]
+        csv_repo = repo.CsvRepoInMemory(records[::-1])
+
+        assert csv_repo.get_range() == records
+        assert (
+            csv_repo.get_range(dt.datetime(2003, 1, 1), dt.datetime(2006, 1, 1))
+            == records[3:6]
+        )
+        assert csv_repo.get_range(dt.datetime(2003, 6, 1)) == records[4:]
+        assert csv_repo.get_range(end=dt.datetime(2002, 1, 1)) == records[:2]
+        assert csv_repo.get_range(dt.datetime(2020, 1, 1)) == []
@@ -0,0 +1,157 @@
+from datetime import date
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from seniority_visualizer_app.seniority import statistics as stat
+from seniority_visualizer_app.seniority.dataframe import STANDARD_FIELDS as fields
+from seniority_visualizer_app.seniority.scenarios import (
+    SCENARIO_CACHE_SIZE,
+    FixedHeadcount,
+    HireClasses,
+    NoHiring,
+    PercentGrowth,
+    parse_scenario,
+    _projections,
+    project_scenario,
+)
+from seniority_visualizer_app.seniority.trajectory import (
+    SeniorityTrajectory,
+    build_seniority_trajectory,
+)
+
+
+@pytest.fixture
+def trajectory(standard_seniority_df) -> SeniorityTrajectory:
+    dates = stat.make_date_grid(
+        pd.Timestamp("2020-02-01"), standard_seniority_df[fields.RETIRE_DATE].max()
+    )
+    return build_seniority_trajectory(standard_seniority_df, dates)
+
+
+@pytest.fixture
+def small_trajectory() -> SeniorityTrajectory:
+    dates = pd.date_range("2020-01-01", periods=4, freq="MS")
+    retire = ["2020-02-01", "2020-12-01", "2020-03-15", "2030-01-01"]
+    return SeniorityTrajectory(["a", "b", "c", "d"], [1, 2, 3, 4], retire, dates)
+
+
+@pytest.mark.parametrize(
+    "spec,expected",
+    [
+        (None, NoHiring()),
+        ("none", NoHiring()),
+        ("fixed", FixedHeadcount()),
+        ("FIXED:3500", FixedHeadcount(3500)),
+        ("growth:0.03", PercentGrowth(0.03)),
+        ("growth:3%", PercentGrowth(0.03)),
+        (
+            "classes:2021-06-01=20,2021-01-01=10",
+            HireClasses(((date(2021, 1, 1), 10), (date(2021, 6, 1), 20))),
+        ),
+    ],
+)
+def test_parse_scenario(spec, expected):
+    scenario = parse_scenario(spec)
+
+    assert type(scenario) is type(expected)
+    assert scenario == expected
+    assert parse_scenario(str(scenario)) == scenario
+
+
+@pytest.mark.parametrize(
+    "spec",
+    [
+        "bogus",
+        "none:1",
+        "fixed:-1",
+        "growth",
+        "growth:x",
+        "growth:-100%",
+        "growth:-2",
+        "growth:nan",
+        "growth:inf",
+        "classes:x=1",
+    ],
+)
+def test_parse_scenario_invalid(spec):
+    with pytest.raises(ValueError):
+        parse_scenario(spec)
+
+
+def test_active_counts(small_trajectory):
+    def active(spec):
+        return project_scenario(small_trajectory, spec).active_counts.tolist()
+
+    assert active("none") == [4, 3, 3, 2]
+    assert active("fixed") == [4, 4, 4, 4]
+    assert active("fixed:2") == [4, 3, 3, 2]
+    assert active("classes:2020-02-15=5,2020-03-01=1") == [4, 3, 9, 8]
+
+
+def test_percent_growth(trajectory):
+    projection = project_scenario(trajectory, "growth:10%")
+
+    years = (trajectory.dates - trajectory.dates[0]).days / 365.25
+    expected = np.floor(len(trajectory) * 1.1 ** years.to_numpy())
+
+    assert projection.active_counts.tolist() == expected.astype(int).tolist()
+
+
+@pytest.mark.parametrize("spec", ["none", "fixed"])
+def test_percentiles_match_pilot_plot(trajectory, standard_seniority_df, spec):
+    """Matches the percentages `pilot_plot` computed before scenarios"""
+    df = standard_seniority_df
+    projection = project_scenario(trajectory, spec)
+
+    for employee_id in df[fields.EMPLOYEE_ID].iloc[::397]:
+        seniors = pd.Series(
+            stat.calculate_number_of_active_senior_pilots_for_dates(
+                df, trajectory.dates, employee_id
+            ),
+            index=trajectory.dates,
+        )
+        if spec == "none":
+            active = stat.make_pilots_remaining_series(df, trajectory.dates)
+        else:
+            active = len(df)
+
+        expected = (1 - seniors / active) * 100
+
+        np.testing.assert_allclose(
+            projection.percentile_series(employee_id), expected, rtol=1e-5
+        )
+
+
+def test_projection_keeps_no_pilot_data(trajectory):
+    projection = project_scenario(trajectory, "fixed")
+
+    arrays = [v for v in vars(projection).values() if isinstance(v, np.ndarray)]
+
+    assert sum(a.nbytes for a in arrays) == projection.active_counts.nbytes
+    assert projection.active_counts.shape == (len(trajectory.dates),)
+
+
+def test_projection_cached_per_scenario(small_trajectory):
+    fixed = project_scenario(small_trajectory, "fixed:5")
+
+    assert project_scenario(small_trajectory, FixedHeadcount(5)) is fixed
+    assert project_scenario(small_trajectory, PercentGrowth(5)) is not fixed
+
+
+def test_projection_cache_is_bounded(small_trajectory):
+    fixed = project_scenario(small_trajectory, "fixed:5")
+
+    for i in range(SCENARIO_CACHE_SIZE - 1):
+        project_scenario(small_trajectory, PercentGrowth(i / 100))
+
+    # fixed:5 is the least recently used, using it keeps it cached
+    assert project_scenario(small_trajectory, "fixed:5") is fixed
+
+    project_scenario(small_trajectory, "none")
+    project_scenario(small_trajectory, "growth:0.5")
+
+    assert project_scenario(small_trajectory, "fixed:5") is fixed
+    assert len(_projections[small_trajectory]) == SCENARIO_CACHE_SIZE
+    assert (PercentGrowth, PercentGrowth(0.0)) not in _projections[small_trajectory]
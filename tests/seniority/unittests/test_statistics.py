@@ -3,11 +3,15 @@ from pathlib import Path
 import datetime as dt
 
 import pytest
+import numpy as np
 import pandas as pd
+from dateutil.relativedelta import relativedelta
 
 from seniority_visualizer_app.seniority import statistics as stat
 from seniority_visualizer_app.seniority import data_objects as do
 from seniority_visualizer_app.seniority.entities import Pilot, SeniorityList
+from seniority_visualizer_app.seniority.dataframe import SeniorityFrame, _frame_cache
+from seniority_visualizer_app.seniority.trajectory import build_seniority_trajectory
 
 fields = stat.FIELDS  # alias for brevity
 
@@ -81,6 +85,65 @@ class TestMakeSeniorityPlotTimeSeries:
             assert res[0] == dt.date(2020, 1, 1)
 
 
+class TestMakeDateGrid:
+    @pytest.mark.parametrize(
+        "start", ["2020-01-01", "2020-01-15", "2020-01-30", "2021-02-28 08:30"]
+    )
+    def test_monthly_matches_daily_filter(self, start):
+        start = pd.Timestamp(start)
+        end = pd.Timestamp("2030-06-15")
+
+        daily = pd.date_range(start, end, freq="D")
+        expected = daily[daily.map(lambda d: d.day == min(start.day, 28))]
+
+        assert stat.make_date_grid(start, end, "M").equals(expected)
+
+    def test_quarterly_and_yearly(self):
+        start, end = dt.date(2020, 2, 10), dt.date(2022, 2, 10)
+
+        quarterly = stat.make_date_grid(start, end, "Q")
+        yearly = stat.make_date_grid(start, end, "Y")
+
+        assert len(quarterly) == 9
+        assert quarterly[1] == pd.Timestamp("2020-05-10")
+        assert yearly.to_list() == [
+            pd.Timestamp(f"{year}-02-10") for year in (2020, 2021, 2022)
+        ]
+
+    def test_pinned(self):
+        grid = stat.make_date_grid(
+            dt.date(2020, 1, 15), pd.Timestamp("2020-05-06"), "M", pin_to_first=True
+        )
+
+        assert grid[0] == pd.Timestamp("2020-01-01")
+        assert grid[-1] == pd.Timestamp("2020-06-01")
+        assert len(grid) == 6
+
+    @pytest.mark.parametrize(
+        "step", [relativedelta(months=1), relativedelta(years=1, months=1)]
+    )
+    def test_relativedelta_step_accumulates(self, step):
+        start = dt.date(2020, 1, 31)
+        end = dt.date(2026, 1, 1)
+
+        expected = []
+        cur = start
+        while cur <= end:
+            expected.append(pd.Timestamp(cur))
+            cur += step
+
+        assert stat.make_date_grid(start, end, step).to_list() == expected
+
+    def test_cached(self):
+        start, end = dt.date(2020, 1, 1), dt.date(2040, 1, 1)
+
+        assert stat.make_date_grid(start, end) is stat.make_date_grid(start, end)
+
+    def test_bad_freq(self):
+        with pytest.raises(ValueError, match="unsupported"):
+            stat.make_date_grid(dt.date(2020, 1, 1), dt.date(2021, 1, 1), "W")
+
+
 def test_pilots_remaining_series(standard_seniority_df):
     today = dt.date.today()
 
@@ -91,7 +154,61 @@ def test_pilots_remaining_series(standard_seniority_df):
 
     res = stat.make_pilots_remaining_series(standard_seniority_df, dates)
 
-    assert res is not None
+    retire_dates = standard_seniority_df[fields.RETIRE_DATE]
+
+    assert res.to_list() == [(retire_dates > d).sum() for d in dates]
+    assert res.index.equals(dates)
+    assert res.name == "retirements"
+
+
+class TestRemainingPilotCounter:
+    def test_count_on(self):
+        counter = stat.RemainingPilotCounter(
+            pd.Series(pd.to_datetime(["2020-01-01", "2020-02-01", None, "2020-03-01"]))
+        )
+
+        assert len(counter) == 3
+        dates = pd.to_datetime(["2019-12-31", "2020-01-01", "2020-02-15", "2021-01-01"])
+        assert counter.count_on(dates).tolist() == [3, 2, 1, 0]
+        assert counter.count_on_date(dt.date(2020, 1, 15)) == 2
+
+    def test_cached_per_seniority_frame(self, standard_seniority_df):
+        df = SeniorityFrame(standard_seniority_df.copy())
+
+        counter = stat.get_remaining_pilot_counter(df)
+
+        assert stat.get_remaining_pilot_counter(df) is counter
+        assert stat.get_remaining_pilot_counter(SeniorityFrame(df)) is not counter
+
+        key = (id(df), "remaining")
+        del df, counter
+
+        assert key not in _frame_cache
+
+    def test_plain_dataframe_rebuilt(self, standard_seniority_df):
+        df = standard_seniority_df.copy()
+        date_ = pd.Timestamp("2020-01-01")
+
+        before = stat.make_pilots_remaining_series(df, pd.DatetimeIndex([date_]))
+
+        df[fields.RETIRE_DATE] = pd.Timestamp("2019-01-01")
+
+        after = stat.make_pilots_remaining_series(df, pd.DatetimeIndex([date_]))
+
+        assert before.iloc[0] > 0
+        assert after.iloc[0] == 0
+        assert not any(key == id(df) for key, _ in _frame_cache)
+
+    def test_shares_seniority_frame_lookups(self, standard_seniority_df):
+        frame = SeniorityFrame(standard_seniority_df)
+
+        counter = stat.get_remaining_pilot_counter(frame)
+
+        assert counter.retire_dates is frame.sorted_retire_dates
+
+        # the frame's lookups live in the same per-frame cache
+        names = {name for key, name in _frame_cache if key == id(frame)}
+        assert names == {"remaining", ("lookup", "sorted_retire_dates")}
 
 
 def test_calculate_retirements_over_time():
@@ -107,3 +224,261 @@ def test_calculate_retirements_over_time():
 
     assert result == [2, 0, 1, 0, 1]
     assert len(result) == len(intervals)
+
+
+def brute_force_seniority_over_time(sen_list, pilot, start, end, delta):
+    """Reference implementation filtering the whole list at every step"""
+    starting_pilots = sorted(sen_list.pilot_data)
+    target = next(p for p in starting_pilots if p.employee_id == pilot.employee_id)
+
+    date_index = start
+    current_pilots = starting_pilots
+
+    while date_index <= end:
+        try:
+            number = current_pilots.index(target) + 1
+        except ValueError:
+            number = None
+
+        yield date_index, number, len(current_pilots)
+
+        date_index += delta
+        current_pilots = [p for p in starting_pilots if p.is_active_on(date_index)]
+
+
+class TestIterSeniorityOverTime:
+    @pytest.fixture
+    def sen_list(self, pilot_dicts_from_csv):
+        return SeniorityList(Pilot.from_dict(d) for d in pilot_dicts_from_csv)
+
+    @pytest.mark.parametrize("rank", [0, 1500, 3924])
+    def test_matches_brute_force(self, sen_list, rank):
+        pilot = sen_list.sorted_pilot_data[rank]
+        start = dt.date(2019, 1, 31)
+        end = dt.date(2045, 1, 1)
+        delta = relativedelta(months=7)
+
+        result = list(stat.iter_seniority_over_time(sen_list, pilot, start, end, delta))
+        expected = list(
+            brute_force_seniority_over_time(sen_list, pilot, start, end, delta)
+        )
+
+        assert result == expected
+        assert result[0] == (start, rank + 1, 3925)
+
+    def test_defaults_to_list_span(self, sen_list):
+        pilot = sen_list.sorted_pilot_data[10]
+        span = stat.calculate_seniority_list_span(sen_list)
+
+        result = list(stat.iter_seniority_over_time(sen_list, pilot))
+
+        assert result[0][0] == span.earliest_hire
+        assert result[-1][0] <= span.latest_retire
+        assert result[-1][1] is None
+
+    def test_raises_for_missing_pilot(self, sen_list):
+        with pytest.raises(ValueError):
+            next(
+                stat.iter_seniority_over_time(
+                    sen_list, Pilot("nobody", "2000-01-01", "2030-01-01")
+                )
+            )
+
+
+def masked_active_senior_pilots(df, date_series, employee_id):
+    """Reference implementation applying a boolean mask per date"""
+    target_record = df[df[fields.EMPLOYEE_ID] == employee_id].iloc[0]
+    target_sen_num = target_record[fields.SENIORITY_NUMBER]
+
+    data = pd.DataFrame(index=date_series)
+    data["seniority_on_date"] = data.index.map(
+        lambda d: df[
+            (df[fields.SENIORITY_NUMBER] < target_sen_num)
+            & (df[fields.RETIRE_DATE] > d)
+        ].shape[0]
+    )
+    data[data.index > target_record[fields.RETIRE_DATE]] = float("nan")
+
+    return data["seniority_on_date"].to_list()
+
+
+class TestCalculateNumberOfActiveSeniorPilotsForDates:
+    @pytest.mark.parametrize("position", [0, 1, 2000, 3924])
+    @pytest.mark.parametrize("frame_type", [SeniorityFrame, pd.DataFrame])
+    def test_matches_masked_filter(self, standard_seniority_df, position, frame_type):
+        df = frame_type(standard_seniority_df)
+        employee_id = df[fields.EMPLOYEE_ID].iloc[position]
+        dates = pd.date_range("2019-12-15", "2060-01-01", freq="MS")
+
+        result = stat.calculate_number_of_active_senior_pilots_for_dates(
+            df, dates, employee_id
+        )
+        expected = masked_active_senior_pilots(df, dates, employee_id)
+
+        pd.testing.assert_series_equal(pd.Series(result), pd.Series(expected))
+
+    def test_nan_after_retirement(self, standard_seniority_df):
+        df = standard_seniority_df
+        record = df.iloc[100]
+        retire = record[fields.RETIRE_DATE]
+
+        dates = pd.DatetimeIndex(
+            [retire - pd.Timedelta(days=1), retire, retire + pd.Timedelta(days=1)]
+        )
+
+        result = stat.calculate_number_of_active_senior_pilots_for_dates(
+            df, dates, record[fields.EMPLOYEE_ID]
+        )
+
+        assert not pd.isna(result[0])
+        assert not pd.isna(result[1])
+        assert pd.isna(result[2])
+
+    @pytest.mark.parametrize("frame_type", [SeniorityFrame, pd.DataFrame])
+    def test_raises_for_missing_employee(self, standard_seniority_df, frame_type):
+        with pytest.raises(ValueError, match="no record"):
+            stat.calculate_number_of_active_senior_pilots_for_dates(
+                frame_type(standard_seniority_df),
+                pd.date_range("2020-01-01", periods=3),
+                "nope",
+            )
+
+
+class TestMonthlyRetirements:
+    def test_counts_for(self):
+        dates = pd.Series(
+            pd.to_datetime(["2020-01-01", "2020-01-15", "2020-03-15", None, "2020-05-30"])
+        )
+
+        monthly = stat.calculate_retirements_by_month(dates)
+
+        months = np.arange(np.datetime64("2019-12"), np.datetime64("2020-07"))
+
+        assert monthly.counts_for(months).tolist() == [0, 2, 0, 1, 0, 1, 0]
+        assert monthly.total_pilots == 5
+
+    @pytest.mark.parametrize("rolling_periods", [1, 6, 13])
+    def test_make_frame_matches_interval_cut(
+        self, standard_seniority_df, rolling_periods
+    ):
+        retire_dates = standard_seniority_df[fields.RETIRE_DATE]
+        start = pd.Timestamp("2020-01-15")
+        end = stat.ffwd_and_pin(retire_dates.max())
+
+        intervals = pd.interval_range(start=start, end=end, freq="MS", closed="left")
+        retirements = stat.calculate_retirements_over_time(retire_dates, intervals)
+
+        expected = pd.DataFrame(
+            data=dict(retirements=retirements), index=intervals.left
+        )
+        expected["rolling"] = (
+            expected["retirements"].rolling(window=rolling_periods).mean()
+        )
+        expected["remaining"] = len(retire_dates) - expected["retirements"].cumsum()
+
+        result = stat.get_monthly_retirements(standard_seniority_df).make_frame(
+            start, end, rolling_periods
+        )
+
+        pd.testing.assert_frame_equal(
+            result, expected, check_dtype=False, check_names=False, check_freq=False
+        )
+
+    def test_make_frame_ignores_time_of_start(self):
+        dates = pd.Series(pd.to_datetime(["2020-02-01", "2020-03-01", "2020-03-31"]))
+
+        frame = stat.calculate_retirements_by_month(dates).make_frame(
+            pd.Timestamp("2020-02-01 13:45"), pd.Timestamp("2020-05-01"), 1
+        )
+
+        assert frame.index.tolist() == list(
+            pd.date_range("2020-02-01", "2020-04-01", freq="MS")
+        )
+        assert frame["retirements"].tolist() == [1, 2, 0]
+        assert frame["remaining"].tolist() == [2, 0, 0]
+
+    def test_cached_per_seniority_frame(self, standard_seniority_df):
+        monthly = stat.get_monthly_retirements(standard_seniority_df)
+
+        assert stat.get_monthly_retirements(standard_seniority_df) is monthly
+
+    def test_plain_dataframe_rebuilt(self, standard_seniority_df):
+        df = standard_seniority_df.copy()
+
+        before = stat.get_monthly_retirements(df)
+
+        df[fields.RETIRE_DATE] = pd.Timestamp("2019-01-01")
+
+        after = stat.get_monthly_retirements(df)
+
+        assert after is not before
+        assert after.counts.tolist() == [len(df)]
+
+
+class TestDateReachingSeniority:
+    @pytest.fixture
+    def trajectory(self, standard_seniority_df):
+        dates = stat.make_date_grid(
+            pd.Timestamp("2020-02-01"), standard_seniority_df[fields.RETIRE_DATE].max()
+        )
+        return build_seniority_trajectory(standard_seniority_df, dates)
+
+    @staticmethod
+    def scan(trajectory, employee_id, number=None, percentile=None, pinned=False):
+        """First date meeting the target, checking every date"""
+        numbers = trajectory.seniority_series(employee_id)
+        active = len(trajectory) if pinned else trajectory.active_counts
+        pct = (1 - (numbers - 1) / active) * 100
+
+        if number is not None:
+            meets = numbers <= number
+        else:
+            meets = pct >= percentile
+
+        return meets.idxmax() if meets.any() else None
+
+    @pytest.mark.parametrize(
+        "target",
+        [
+            dict(number=1),
+            dict(number=500),
+            dict(number=2000),
+            dict(percentile=75),
+            dict(percentile=75, pinned=True),
+            dict(percentile=99, pinned=True),
+            dict(percentile=50),
+        ],
+    )
+    def test_matches_scan(self, trajectory, target):
+        employee_ids = trajectory.employee_ids[::157]
+
+        batch = stat.calculate_dates_reaching_seniority(
+            trajectory, employee_ids=employee_ids, **target
+        )
+
+        for employee_id in employee_ids:
+            expected = self.scan(trajectory, employee_id, **target)
+
+            assert (
+                stat.calculate_date_reaching_seniority(trajectory, employee_id, **target)
+                == expected
+            )
+            if expected is None:
+                assert pd.isna(batch[employee_id])
+            else:
+                assert batch[employee_id] == expected
+
+    def test_batch_defaults_to_all_pilots(self, trajectory):
+        batch = stat.calculate_dates_reaching_seniority(trajectory, percentile=90)
+
+        assert batch.index.tolist() == trajectory.employee_ids.tolist()
+        assert batch.iloc[0] == trajectory.dates[0]
+
+    @pytest.mark.parametrize(
+        "target", [dict(), dict(number=1, percentile=1), dict(percentile=101)]
+    )
+    def test_invalid_target(self, trajectory, target):
+        with pytest.raises(ValueError):
+            stat.calculate_date_reaching_seniority(
+                trajectory, trajectory.employee_ids[0], **target
+            )
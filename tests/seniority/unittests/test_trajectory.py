@@ -0,0 +1,110 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from seniority_visualizer_app.seniority import statistics as stat
+from seniority_visualizer_app.seniority.dataframe import STANDARD_FIELDS as fields
+from seniority_visualizer_app.seniority.trajectory import (
+    RETIRED,
+    SeniorityTrajectory,
+    build_seniority_trajectory,
+    get_seniority_trajectory,
+)
+
+
+@pytest.fixture
+def monthly_dates(standard_seniority_df) -> pd.DatetimeIndex:
+    return stat.make_date_grid(
+        pd.Timestamp("2020-02-01"), standard_seniority_df[fields.RETIRE_DATE].max()
+    )
+
+
+def test_matches_active_senior_pilots(standard_seniority_df, monthly_dates):
+    df = standard_seniority_df
+    trajectory = build_seniority_trajectory(df, monthly_dates)
+
+    assert trajectory.matrix.shape == (len(df), len(monthly_dates))
+    assert trajectory.matrix.dtype == np.int32
+
+    for position in range(0, len(df), 241):
+        employee_id = df[fields.EMPLOYEE_ID].iloc[position]
+
+        expected = stat.calculate_number_of_active_senior_pilots_for_dates(
+            df, monthly_dates, employee_id
+        )
+
+        pd.testing.assert_series_equal(
+            trajectory.seniority_series(employee_id) - 1,
+            pd.Series(expected, index=monthly_dates),
+            check_names=False,
+        )
+
+
+def test_rows_in_seniority_order(standard_seniority_df, monthly_dates):
+    df = standard_seniority_df.sample(frac=1, random_state=0)
+    trajectory = build_seniority_trajectory(df, monthly_dates)
+
+    expected = df.sort_values(fields.SENIORITY_NUMBER)[fields.EMPLOYEE_ID]
+
+    assert trajectory.employee_ids.tolist() == expected.tolist()
+    np.testing.assert_array_equal(
+        trajectory.matrix,
+        build_seniority_trajectory(standard_seniority_df, monthly_dates).matrix,
+    )
+
+
+def test_ranks_only_improve(standard_seniority_df, monthly_dates):
+    matrix = build_seniority_trajectory(standard_seniority_df, monthly_dates).matrix
+
+    held = matrix != RETIRED
+    still_held = held[:, 1:] & held[:, :-1]
+
+    assert (np.diff(matrix, axis=1)[still_held] <= 0).all()
+    # a pilot never regains a number once retired
+    assert (held[:, 1:] <= held[:, :-1]).all()
+
+
+def test_active_counts(standard_seniority_df, monthly_dates):
+    trajectory = build_seniority_trajectory(standard_seniority_df, monthly_dates)
+
+    expected = stat.make_pilots_remaining_series(standard_seniority_df, monthly_dates)
+
+    assert trajectory.active_counts.tolist() == expected.tolist()
+
+
+def test_retire_date_on_grid():
+    dates = pd.date_range("2020-01-01", periods=4, freq="MS")
+    retire = ["2020-02-01", "2020-12-01", "2020-03-15"]
+
+    trajectory = SeniorityTrajectory(["a", "b", "c"], [1, 2, 3], retire, dates)
+
+    assert trajectory.numbers_for("a").tolist() == [1, 1, RETIRED, RETIRED]
+    assert trajectory.numbers_for("b").tolist() == [2, 1, 1, 1]
+    assert trajectory.numbers_for("c").tolist() == [3, 2, 2, RETIRED]
+    assert trajectory.percentile_series("b").tolist() == [
+        pytest.approx(100 * (1 - 1 / 3)),
+        100.0,
+        100.0,
+        100.0,
+    ]
+
+
+def test_unknown_employee_id(standard_seniority_df, monthly_dates):
+    trajectory = build_seniority_trajectory(standard_seniority_df, monthly_dates)
+
+    with pytest.raises(ValueError):
+        trajectory.row_for("not an id")
+
+
+def test_cached_per_dataframe_and_dates(standard_seniority_df, monthly_dates):
+    trajectory = get_seniority_trajectory(standard_seniority_df, monthly_dates)
+
+    assert get_seniority_trajectory(standard_seniority_df, monthly_dates) is trajectory
+    assert (
+        get_seniority_trajectory(standard_seniority_df, list(monthly_dates))
+        is trajectory
+    )
+    assert (
+        get_seniority_trajectory(standard_seniority_df, monthly_dates[1:])
+        is not trajectory
+    )
@@ -7,7 +7,7 @@ import pandas as pd
 
 from seniority_visualizer_app.seniority import use_cases as uc
 from seniority_visualizer_app.seniority.repo import CsvRepoInMemory
-from seniority_visualizer_app.seniority import entities
+from tests import factories
 
 
 class TestGetCurrentSeniorityCsv:
@@ -26,34 +26,44 @@ class TestGetCurrentSeniorityCsv:
         assert res.value == []
 
     def test_returns_most_recent(self):
-        mock_repo = mock.Mock(autospec=CsvRepoInMemory)
-
-        mocked_objs = []
+        records = []
 
         fake_dates = [dt.datetime(2000 + i, 1, 1) for i in range(10)]
 
         for d in fake_dates:
-            obj = mock.Mock(autospec=entities.CsvRecord)
-            obj.published = d
-            mocked_objs.append(obj)
+            records.append(factories.CsvRecordFactory.build(published=d))
 
-        random.shuffle(mocked_objs)
+        random.shuffle(records)
 
-        mock_repo.get_all.return_value = mocked_objs
+        repo = CsvRepoInMemory(records)
 
         req = uc.requests.SeniortyFilterRequest(most_recent=True)
 
-        use_case = uc.GetCurrentSeniorityCsv(mock_repo)
+        use_case = uc.GetCurrentSeniorityCsv(repo)
 
         response = use_case.execute(req)
 
         assert response.value.published == max(fake_dates)
 
+        req = uc.requests.SeniortyFilterRequest(most_recent=False, all=True)
+
+        response = use_case.execute(req)
+
+        assert [r.published for r in response.value] == fake_dates
+
+    def test_most_recent_of_empty_repo_fails(self):
+        req = uc.requests.SeniortyFilterRequest(most_recent=True)
+
+        response = uc.GetCurrentSeniorityCsv(CsvRepoInMemory()).execute(req)
+
+        assert response.type == uc.ResponseFailure.RESOURCE_ERROR
+
 
 class TestGetCurrentSeniorityListReport:
     def test_execute(self, standard_seniority_df, csv_record_from_sample_csv):
         mock_repo = mock.MagicMock()
         mock_repo.get_all.return_value = [csv_record_from_sample_csv]
+        mock_repo.most_recent.return_value = csv_record_from_sample_csv
 
         def df_factory(_):
             return standard_seniority_df
@@ -0,0 +1,136 @@
+import io
+from pathlib import Path
+
+import pandas as pd
+import pytest
+
+from tests.utils import SAMPLE_CSV
+
+from seniority_visualizer_app.seniority.exceptions import (
+    DatasourceSchemaError,
+    DatasourceValidationError,
+)
+from seniority_visualizer_app.seniority.loader import SeniorityListLoader
+from seniority_visualizer_app.seniority.validation import (
+    LISTED_ROWS,
+    validate_pilot_table,
+)
+
+HEADERS = {"seniority_number": "literal_seniority_number", "cmid": "employee_id"}
+
+CSV = """employee_id,hire_date,retire_date,literal_seniority_number
+100,2000-01-01,2030-01-01,1
+101,2000-01-01,2030-01-01,2
+101,2000-13-01,2030-01-01,3
+102,2001-01-01,1999-01-01,
+103,2001-01-01,not a date,5
+,2001-01-01,2031-01-01,4
+104,2001-01-01,2031-01-01,six
+105,2001-01-01,2031-01-01,7.5
+106,2001-01-01,2031-01-01,8
+"""
+
+
+def read_table(text: str) -> pd.DataFrame:
+    return pd.read_csv(io.StringIO(text), dtype=str, keep_default_na=False)
+
+
+def test_reports_every_issue_with_rows():
+    report = validate_pilot_table(read_table(CSV))
+
+    assert not report.ok
+    assert report.total_rows == 9
+    assert [(issue.check, issue.column, issue.rows) for issue in report.issues] == [
+        ("missing_employee_id", "employee_id", (7,)),
+        ("duplicate_employee_id", "employee_id", (3, 4)),
+        ("invalid_date", "hire_date", (4,)),
+        ("invalid_date", "retire_date", (6,)),
+        ("retire_before_hire", "retire_date", (5,)),
+        ("invalid_seniority_number", "literal_seniority_number", (8, 9)),
+        ("non_monotone_seniority_number", "literal_seniority_number", (7,)),
+    ]
+
+    with pytest.raises(DatasourceValidationError, match="rows 3, 4"):
+        report.raise_for_issues()
+
+
+def test_missing_columns():
+    report = validate_pilot_table(read_table("employee_id,hire_date\n1,2000-01-01\n"))
+
+    assert [issue.check for issue in report.issues] == ["missing_column"]
+
+    with pytest.raises(DatasourceSchemaError, match="retire_date"):
+        report.raise_for_issues()
+
+
+def test_lists_first_rows():
+    rows = "\n".join(f"1,2000-01-01,2030-01-01,{n}" for n in range(1, 30))
+    report = validate_pilot_table(
+        read_table("employee_id,hire_date,retire_date,literal_seniority_number\n" + rows)
+    )
+
+    assert f"and {29 - LISTED_ROWS} more" in str(report)
+
+
+def test_sample_csv_is_valid():
+    report = SeniorityListLoader(HEADERS).validate_stream(Path(SAMPLE_CSV).open())
+
+    assert report.ok
+    assert report.total_rows == 3925
+
+
+def test_flags_numbers_below_a_blank_row():
+    rows = [
+        "1,2000-01-01,2030-01-01,1",
+        "2,2000-01-01,2030-01-01,5",
+        "3,2000-01-01,2030-01-01,",
+        "4,2000-01-01,2030-01-01,3",
+        "5,2000-01-01,2030-01-01,seven",
+        "6,2000-01-01,2030-01-01,4",
+    ]
+    report = validate_pilot_table(
+        read_table(
+            "employee_id,hire_date,retire_date,literal_seniority_number\n"
+            + "\n".join(rows)
+        )
+    )
+
+    assert [(issue.check, issue.rows) for issue in report.issues] == [
+        ("invalid_seniority_number", (6,)),
+        ("non_monotone_seniority_number", (5, 7)),
+    ]
+
+
+def test_flags_numbers_out_of_int32_range():
+    rows = [
+        "1,2000-01-01,2030-01-01,1",
+        "2,2000-01-01,2030-01-01,2147483648",
+        "3,2000-01-01,2030-01-01,1e10",
+    ]
+    report = validate_pilot_table(
+        read_table(
+            "employee_id,hire_date,retire_date,literal_seniority_number\n"
+            + "\n".join(rows)
+        )
+    )
+
+    assert [(issue.check, issue.rows) for issue in report.issues] == [
+        ("invalid_seniority_number", (3, 4)),
+    ]
+
+
+def test_validated_file_loads():
+    text = (
+        "employee_id,hire_date,retire_date,literal_seniority_number\n"
+        "1,2000-01-01,2030-01-01,3.0\n"
+        "2,2000-01-01,2030-01-01,1e3\n"
+        "3,2000-01-01,2030-01-01,\n"
+    )
+    loader = SeniorityListLoader({})
+
+    assert loader.validate_stream(io.StringIO(text)).ok
+
+    sen_list = loader.load_fast_from_stream(io.StringIO(text))
+
+    assert sen_list.columns.literal_numbers.tolist() == [3, 1000, 0]
+    assert sen_list.columns.has_literal.tolist() == [True, True, False]
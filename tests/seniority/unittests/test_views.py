@@ -77,9 +77,77 @@ class TestViews:
         ("seniority.current_status", {}),
         ("seniority.plot_retirements", {}),
         ("seniority.pilot_plot", {"emp_id": 78629}),
+        ("seniority.pilot_plot", {"emp_id": 78629, "pin": "true"}),
+        ("seniority.pilot_plot", {"emp_id": 78629, "scenario": "growth:3%"}),
+        ("seniority.pilot_plot_data", {"emp_id": 78629, "scenario": "fixed"}),
     ])
     def test_status(self, endpoint, args, testapp):
         """Test endpoints return 200 status"""
         res: TestResponse = testapp.get(url_for(endpoint, **args))
 
-        assert res.status_code == 200
\ No newline at end of file
+        assert res.status_code == 200
+
+    @pytest.mark.parametrize("scenario,selected", [
+        ("growth:0.05", "growth:0.05"),
+        ("none", "none"),
+        ("growth:3%", "fixed"),
+    ])
+    def test_pilot_plot_scenario_choice(self, scenario, selected, testapp):
+        """The form selects the requested scenario, or its default if not a choice"""
+        res: TestResponse = testapp.get(
+            url_for("seniority.pilot_plot", emp_id=78629, scenario=scenario)
+        )
+
+        assert res.form["scenario"].value == selected
+
+    def test_pilot_plot_data(self, testapp):
+        """JSON data follows the requested hiring scenario"""
+        res: TestResponse = testapp.get(
+            url_for("seniority.pilot_plot_data", emp_id=78629, scenario="fixed")
+        )
+
+        data = res.json
+
+        assert data["scenario"] == "fixed"
+        assert len(data["dates"]) == len(data["seniority"]) == len(data["pct"])
+        assert set(data["active"]) == {3925}
+
+    def test_pilot_plot_data_category(self, testapp):
+        """Category seniority is added when a category is requested"""
+        res: TestResponse = testapp.get(
+            url_for("seniority.pilot_plot_data", emp_id=42054, category="base,seat")
+        )
+
+        data = res.json
+
+        assert set(data["category"]) == {"base", "seat"}
+        assert len(data["category_seniority"]) == len(data["dates"])
+        assert data["category_seniority"][0] <= data["seniority"][0]
+        assert data["category_active"][0] <= data["active"][0]
+
+    def test_junior_most_holders(self, testapp):
+        """Junior-most holders of the filtered categories"""
+        res: TestResponse = testapp.get(
+            url_for("seniority.junior_most_holders", base="JFK", seat="CA")
+        )
+
+        data = res.json
+
+        assert data["categories"]
+        for category in data["categories"]:
+            assert (category["base"], category["seat"]) == ("JFK", "CA")
+            assert len(category["junior_most"]) == len(data["dates"])
+
+    @pytest.mark.parametrize("args,status", [
+        ({"emp_id": 78629, "scenario": "bogus"}, 400),
+        ({"emp_id": 78629, "category": "last_name"}, 400),
+        ({"emp_id": 1}, 404),
+    ])
+    def test_pilot_plot_data_errors(self, args, status, testapp):
+        """Bad scenarios and unknown pilots are reported as JSON errors"""
+        res: TestResponse = testapp.get(
+            url_for("seniority.pilot_plot_data", **args), expect_errors=True
+        )
+
+        assert res.status_code == status
+        assert "error" in res.json
@@ -1,4 +1,12 @@
+from concurrent.futures import Future
+from datetime import datetime
+from pathlib import Path
+from unittest import mock
+
+import pytest
+
 from seniority_visualizer_app.commands import add
+from seniority_visualizer_app.seniority import commands
 from seniority_visualizer_app.seniority.models import SeniorityListRecord, PilotRecord
 
 from .utils import SAMPLE_CSV
@@ -27,3 +35,136 @@ class TestSeniorityCommand:
         result = runner.invoke(add, args=args)
 
         assert result.exit_code == 0
+
+    @pytest.mark.parametrize("jobs", ["1", "2"])
+    def test_add_directory(self, clean_db, app, tmp_path, jobs):
+        for month in ["2000-01", "2000-02", "2000-03"]:
+            tmp_path.joinpath(f"{month}.csv").write_text(SAMPLE_CSV.read_text())
+        tmp_path.joinpath("2000-04.csv").write_text("cmid,unrelated\n1,2\n")
+
+        runner = app.test_cli_runner()
+
+        result = runner.invoke(
+            add,
+            args=[
+                str(tmp_path),
+                "-h",
+                "cmid",
+                "employee_id",
+                "-h",
+                "seniority_number",
+                "literal_seniority_number",
+                "-j",
+                jobs,
+            ],
+        )
+
+        assert result.exit_code == 1
+        assert "2000-04.csv" in result.output
+        assert "Saved 3 of 4 files" in result.output
+        assert "rows/s" in result.output
+
+        records = SeniorityListRecord.query.order_by(SeniorityListRecord.id).all()
+        assert len(records) == 3
+        assert [r.published_date for r in records] == [
+            datetime(2000, month, 1) for month in [1, 2, 3]
+        ]
+        assert PilotRecord.query.count() == 3 * 3925
+
+        pilot = PilotRecord.query.filter_by(seniority_list=records[0]).first()
+        assert pilot.literal_seniority_number is not None
+        assert pilot.to_entity() in records[0].to_entity()
+
+    def test_add_glob(self, clean_db, app, tmp_path):
+        for name in ["2000-01.csv", "2000-02.csv", "notes.csv"]:
+            tmp_path.joinpath(name).write_text(SAMPLE_CSV.read_text())
+
+        runner = app.test_cli_runner()
+
+        result = runner.invoke(
+            add,
+            args=[
+                str(tmp_path.joinpath("2000-*.csv")),
+                "-h",
+                "cmid",
+                "employee_id",
+                "-h",
+                "seniority_number",
+                "literal_seniority_number",
+            ],
+        )
+
+        assert result.exit_code == 0
+        assert len(SeniorityListRecord.query.all()) == 2
+
+    def test_add_rejects_one_published_date_for_many_files(
+        self, clean_db, app, tmp_path
+    ):
+        for name in ["2000-01.csv", "2000-02.csv"]:
+            tmp_path.joinpath(name).write_text(SAMPLE_CSV.read_text())
+
+        runner = app.test_cli_runner()
+
+        result = runner.invoke(add, args=[str(tmp_path), "-p", "2000-01-01"])
+
+        assert result.exit_code == 2
+        assert "--published-date takes a single file" in result.output
+        assert SeniorityListRecord.query.all() == []
+
+    def test_add_rejects_undated_files(self, clean_db, app, tmp_path):
+        for name in ["2000-01.csv", "notes.csv"]:
+            tmp_path.joinpath(name).write_text(SAMPLE_CSV.read_text())
+
+        runner = app.test_cli_runner()
+
+        result = runner.invoke(add, args=[str(tmp_path)])
+
+        assert result.exit_code == 2
+        assert "notes.csv" in result.output
+        assert SeniorityListRecord.query.all() == []
+
+
+@pytest.mark.parametrize(
+    "name, expected",
+    [
+        ("2020-06.csv", datetime(2020, 6, 1)),
+        ("list_2020-06-15.csv", datetime(2020, 6, 15)),
+        ("2020-13.csv", None),
+        ("notes.csv", None),
+    ],
+)
+def test_published_date_from_path(name, expected):
+    assert commands.published_date_from_path(Path(name)) == expected
+
+
+class FakePool:
+    """Runs each submitted call at once, counting calls submitted"""
+
+    def __init__(self, max_workers=None):
+        self.submitted = 0
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def submit(self, fn, *args):
+        self.submitted += 1
+        future = Future()
+        future.set_result(fn(*args))
+        return future
+
+
+def test_iter_parsed_files_bounds_files_parsed_ahead():
+    pool = FakePool()
+    paths = [Path(f"{i}.csv") for i in range(20)]
+
+    with mock.patch.object(
+        commands, "ProcessPoolExecutor", return_value=pool
+    ), mock.patch.object(
+        commands, "_parse_file", side_effect=lambda path, headers: path
+    ):
+        for i, parsed in enumerate(commands.iter_parsed_files(paths, {}, jobs=2)):
+            assert parsed == paths[i]
+            assert pool.submitted - i <= 2 * commands.PARSE_AHEAD_PER_JOB
@@ -1,8 +1,17 @@
+from unittest import mock
 import pytest
 
 from datetime import date, datetime
 
-from seniority_visualizer_app.utils import cast_date, to_iso
+import numpy as np
+import pandas as pd
+
+from seniority_visualizer_app.utils import (
+    _parse_date_string,
+    cast_date,
+    cast_dates,
+    to_iso,
+)
 
 
 class TestToIso:
@@ -43,3 +52,79 @@ class TestCastDate:
         result = cast_date(inp)
 
         assert result == exp
+
+    @pytest.mark.parametrize("inp", ["2020-01", "2020-13-01", ""])
+    def test_bad_input(self, inp):
+        with pytest.raises(ValueError):
+            cast_date(inp)
+
+        with pytest.raises(TypeError):
+            cast_date(None)
+
+
+class TestCastDates:
+    def test_mixed_input(self):
+        inp = ["2020-6-15", date(2020, 6, 16), "2020/06/15", datetime(2020, 6, 17, 10)]
+
+        result = cast_dates(inp)
+
+        assert result.dtype == np.dtype("datetime64[D]")
+        assert result.tolist() == [
+            date(2020, 6, 15),
+            date(2020, 6, 16),
+            date(2020, 6, 15),
+            date(2020, 6, 17),
+        ]
+        assert cast_dates(inp, as_date=True).tolist() == result.tolist()
+        assert cast_dates([]).shape == (0,)
+
+    def test_datetime64_input(self):
+        inp = pd.Series(pd.to_datetime(["2020-06-15 10:20", "2020-06-16"]))
+
+        result = cast_dates(inp)
+
+        np.testing.assert_array_equal(
+            result, np.array(["2020-06-15", "2020-06-16"], dtype="datetime64[D]")
+        )
+
+    def test_datetime64_nat_raises_type_error(self):
+        inp = pd.Series(pd.to_datetime(["2020-06-15 10:20", None]))
+
+        with pytest.raises(TypeError):
+            cast_dates(inp)
+
+        np.testing.assert_array_equal(
+            cast_dates(inp, errors="coerce"),
+            np.array(["2020-06-15", "NaT"], dtype="datetime64[D]"),
+        )
+
+    def test_coerce_errors(self):
+        result = cast_dates(["2020-6-15", "2020-01", None, 20200101], errors="coerce")
+
+        np.testing.assert_array_equal(
+            result, np.array(["2020-06-15", "NaT", "NaT", "NaT"], dtype="datetime64[D]")
+        )
+
+        with pytest.raises(ValueError):
+            cast_dates(["2020-6-15"], errors="ignore")
+
+    def test_parses_each_distinct_value_once(self):
+        _parse_date_string.cache_clear()
+
+        with mock.patch(
+            "seniority_visualizer_app.utils.to_iso", wraps=to_iso
+        ) as wrapped:
+            cast_dates(["1999-01-01", "1999-1-2"] * 50)
+
+        assert wrapped.call_count == 2
+
+    @pytest.mark.parametrize("inp", ["2020-01", "20-12-12", "2020-1-1T"])
+    def test_raises_value_error(self, inp):
+        with pytest.raises(ValueError, match=rf"Invalid isoformat string: {inp}"):
+            cast_dates(["2020-01-01", inp])
+
+    def test_raises_type_error(self):
+        with pytest.raises(TypeError):
+            cast_dates(["2020-01-01", None])
+        with pytest.raises(TypeError):
+            cast_dates([20200101])